@@ -1,16 +1,74 @@
-from fastapi import FastAPI, Query
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List, Dict
+from dataclasses import replace
+from typing import Awaitable, Callable, Optional, List, Dict, Tuple, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.providers.remoteok_jobs import fetch_remoteok_jobs
 from app.providers.wwr_jobs import fetch_wwr_jobs
-from app.core.scoring import score_gig
+from app.core.admission import AdmissionController, Overloaded
+from app.core.caching import cache_control, etag_matches, make_etag
+from app.core.corpus import CorpusSnapshot, CorpusStore, UpstreamUnavailable
+from app.core.dates import stamp_posted
+from app.core.dedupe import dedupe_near
+from app.core.logs import configure_logging, get_logger, log_event
+from app.core.metrics import CONTENT_TYPE, FETCH_SECONDS, METRICS, UPSTREAM_ERRORS
+from app.core.parallel import ParallelScorer
+from app.core.percolator import AlertHub, Percolator, SavedSearch
+from app.core.plan import ScoringPlan, compile_profile_dict, explain as explain_score
+from app.core.profiles import ProfileRegistry, get_registry, profile_view
+from app.core.ranking import (
+    Ranking,
+    RankingCache,
+    decode_cursor,
+    encode_cursor,
+    ranking_fingerprint,
+)
+from app.core.serialization import FRAGMENTS, dumps, json_array, json_object
+from app.core.shared import SharedCorpus, SharedResultCache
+from app.core.streaming import SSE_KEEPALIVE, ndjson_response, sse_event, sse_response, wants_ndjson
+from app.core.timing import request_timer, span
+from app.settings import Settings, get_settings
+
+log = get_logger(__name__)
+
+# 🔹 Metrics for GET /metrics
+SEARCHES = METRICS.counter(
+    "ga_search_responses_total",
+    "Search pages by where they came from (not_modified, shared_results, ranking_cache, scored, degraded, shed, unavailable)",
+    ["served_from"],
+)
+CORPUS_GIGS = METRICS.gauge("ga_corpus_gigs", "Gigs in the current corpus snapshot")
+
+
+# 🔹 Startup / shutdown: read the settings, load and check the profiles,
+#    preload their plans in the scoring pool, hot-reload them while serving
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    configure_logging(settings.log_level, settings.log_format, settings.log_sample)
+    _configure(settings)
+    registry = await asyncio.to_thread(get_registry)
+    _require_default_profile(registry)
+    SCORER.install(profile_plans())
+    background: List[asyncio.Task] = []
+    if settings.profile_poll_seconds > 0:
+        background.append(asyncio.create_task(registry.watch(settings.profile_poll_seconds)))
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        SCORER.close()
 
-print("🚀 Loaded API from C:\\dev\\gig_agent\\app\\api.py")
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,67 +88,70 @@ async def health():
     }
 
 
-# 🔹 Basic profile model
-class Profile(BaseModel):
-    name: str
-    label: str
-    skills: List[str]
-    keywords: List[str]
-    min_pay: Optional[int] = 0
-    remote_only: bool = True
-
-
-# 🔹 Built-in demo profiles
-PROFILES: Dict[str, Profile] = {
-    "cindy": Profile(
-        name="cindy",
-        label="Cindy – Email & Content",
-        skills=["email marketing", "copywriting", "campaign strategy"],
-        keywords=["email", "newsletter", "campaign", "copywriter", "content"],
-        min_pay=20,
-        remote_only=True,
-    ),
-    "creative": Profile(
-        name="creative",
-        label="Creative – Design & Art",
-        skills=["design", "illustration", "branding"],
-        keywords=["designer", "illustrator", "graphics", "branding"],
-        min_pay=0,
-        remote_only=True,
-    ),
-    "developer": Profile(
-        name="developer",
-        label="Developer – Web & Software",
-        skills=["javascript", "python", "react", "next.js", "frontend", "backend"],
-        keywords=["developer", "engineer", "software", "frontend", "full stack"],
-        min_pay=30,
-        remote_only=True,
-    ),
-    "musician": Profile(
-        name="musician",
-        label="Musician – Audio & Creative",
-        skills=["music", "production", "audio editing"],
-        keywords=["music", "audio", "sound", "podcast", "composer"],
-        min_pay=0,
-        remote_only=True,
-    ),
-    "fastgigs": Profile(
-        name="fastgigs",
-        label="Fast Gigs – Quick Wins",
-        skills=["data entry", "typing", "admin"],
-        keywords=["data entry", "assistant", "transcription", "quick"],
-        min_pay=0,
-        remote_only=True,
-    ),
-    "gentle": Profile(
-        name="gentle",
-        label="Gentle Mode – Low-Energy Day",
-        skills=["writing", "light admin"],
-        keywords=["easy", "simple", "entry", "light"],
-        min_pay=0,
-        remote_only=True,
-    ),
-}
+# 🔹 Prometheus scrape endpoint (per process)
+@app.get("/metrics")
+async def metrics():
+    return Response(METRICS.render(), media_type=CONTENT_TYPE)
+
+
+# 🔹 Built-in profiles: configs/profiles/<key>.json, parsed and compiled once
+#    by the registry (loaded at startup, not import) and hot-reloaded when
+#    the files change
+PROFILES = profile_view("search")
+DEFAULT_PROFILE = "cindy"
+
+
+def _require_default_profile(registry: ProfileRegistry) -> None:
+    # Unknown profile keys fall back to the default, so without it every
+    # GET /gigs would fail; refuse to start instead
+    if registry.get(DEFAULT_PROFILE, "search") is not None:
+        return
+    path = registry.directory / "profiles" / f"{DEFAULT_PROFILE}.json"
+    error = registry.errors.get(str(path))
+    reason = f"is invalid: {error}" if error else "is missing"
+    raise RuntimeError(f"Default profile {path} {reason}")
+
+
+def profile_entry(profile: str) -> Tuple[dict, ScoringPlan]:
+    """
+    (run_gig_search user_config, compiled plan) for a built-in profile key
+    (unknown keys fall back to 'cindy'). No file I/O: both come from the
+    registry's current generation.
+    """
+    profile_key = profile.lower().strip()
+    entry = PROFILES.get(profile_key) or PROFILES.get(DEFAULT_PROFILE)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile '{profile_key}'.")
+    plan = entry.plan if entry.key == profile_key else replace(entry.plan, name=profile_key)
+    return {**entry.config, "preferred_roles": [profile_key]}, plan
+
+
+def profile_user_config(profile: str) -> dict:
+    """
+    Build the run_gig_search user_config for a built-in profile key
+    (unknown keys fall back to 'cindy').
+    """
+    return profile_entry(profile)[0]
+
+
+def profile_plans(profile_keys: Optional[List[str]] = None):
+    keys = profile_keys or list(PROFILES)
+    return [profile_entry(k)[1] for k in keys]
+
+
+# 🔹 Process pool for large corpora; built-in profile plans are installed
+#    in every worker at startup, the pool itself starts on first use.
+#    Built with the GA_SCORING_* settings at startup (_configure).
+SCORER = ParallelScorer()
+
+
+def score_profiles(raw_gigs: List[dict], profile_keys: Optional[List[str]] = None) -> Dict[str, List[float]]:
+    """
+    Score several built-in profiles against the same gigs in one pass over
+    a shared inverted index (or the worker pool for large corpora).
+    Returns profile key -> score per gig.
+    """
+    return SCORER.score(raw_gigs, profile_plans(profile_keys))
 
 
 # 🔹 Profile model for arbitrary users (used by POST /gigs/search)
@@ -101,129 +162,682 @@ class UserProfile(BaseModel):
     disqualifiers: Optional[List[str]] = []
 
 
-# 🔹 Core search logic shared by both endpoints
-async def run_gig_search(user_config: dict, limit: int = 10):
+# 🔹 Body of POST /gigs/search/batch: profile keys and/or full profiles
+class BatchSearch(BaseModel):
+    profiles: List[Union[str, UserProfile]] = Field(..., min_length=1, max_length=50)
+    limit: int = Field(10, ge=1, le=50)
+
+
+# 🔹 Recent rankings, so later pages don't rescore the corpus
+RANKINGS = RankingCache(max_entries=64)
+
+# 🔹 Bounded concurrency for searches that have to score; the limit adapts
+#    to pipeline latency and overflow is shed with 503 + Retry-After.
+#    Built with the GA_ADMISSION_* settings at startup (_configure).
+ADMISSION = AdmissionController()
+
+
+def _overloaded(e: Overloaded) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Search is overloaded ({e.reason}); retry later.",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+METRICS.callback(
+    "ga_admission_in_flight", "Searches currently scoring", "gauge",
+    lambda: [({}, ADMISSION.in_flight)],
+)
+METRICS.callback(
+    "ga_admission_limit", "Current adaptive concurrency limit", "gauge",
+    lambda: [({}, ADMISSION.capacity)],
+)
+METRICS.callback(
+    "ga_admission_queued", "Searches waiting for a scoring slot", "gauge",
+    lambda: [({}, ADMISSION.queued)],
+)
+METRICS.callback(
+    "ga_admission_total", "Admission decisions (admitted, rejected: queue full, timed_out: queue deadline)", "counter",
+    lambda: [
+        ({"result": "admitted"}, ADMISSION.admitted),
+        ({"result": "rejected"}, ADMISSION.rejected),
+        ({"result": "timed_out"}, ADMISSION.timed_out),
+    ],
+)
+METRICS.callback(
+    "ga_fragment_cache_total", "JSON fragment cache lookups", "counter",
+    lambda: [({"result": "hit"}, FRAGMENTS.hits), ({"result": "miss"}, FRAGMENTS.misses)],
+)
+
+
+def _served(source: str, response: Response) -> Response:
+    SEARCHES.inc(served_from=source)
+    return response
+
+
+async def _timed(search: Awaitable[Response], debug: bool = False) -> Response:
     """
-    Core search routine:
-    - fetches raw gigs
-    - filters based on user_config
-    - scores and sorts
-    - returns a shaped payload
+    Run a search under a request timer and report its stage spans in a
+    Server-Timing header. With `debug`, a JSON body also gets a "timings"
+    object (milliseconds per span) and the response is not cacheable.
+    NDJSON bodies are written after the headers, so their serialization
+    is not included.
     """
-    print("USER CONFIG:", user_config)
-    print("LIMIT:", limit)
+    with request_timer() as timer:
+        try:
+            response = await search
+        except HTTPException as e:
+            e.headers = {**(e.headers or {}), "Server-Timing": timer.header()}
+            raise
+    headers = dict(response.headers)
+    headers["Server-Timing"] = timer.header()
+    if not (debug and response.status_code == 200 and response.media_type == "application/json"):
+        response.headers["Server-Timing"] = headers["Server-Timing"]
+        return response
+    # Splice the timings into the finished body as its last member
+    body = bytes(response.body)[:-1] + b',"timings":' + dumps(timer.timings()) + b"}"
+    headers.pop("content-length", None)
+    headers.pop("etag", None)
+    headers["cache-control"] = "no-store"
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _page_items(ranking: Ranking, offset: int, limit: int, explain_plan: Optional[ScoringPlan]):
+    for gig in ranking.iter_page(offset, limit):
+        if explain_plan is not None:
+            # Only the returned page is re-evaluated; scoring itself never explains.
+            gig["explain"] = explain_score(explain_plan, gig)
+        yield gig
+
+
+def _next_cursor(ranking: Ranking, version: str, fingerprint: str, offset: int, limit: int) -> Optional[str]:
+    next_offset = min(offset + limit, len(ranking))
+    if next_offset < len(ranking):
+        return encode_cursor(version, fingerprint, next_offset)
+    return None
+
+
+def _page_fragments(ranking: Ranking, offset: int, limit: int, explain_plan: Optional[ScoringPlan]):
+    # Gigs go out as cached JSON fragments, so an unchanged gig is only
+    # ever encoded once per process
+    return (FRAGMENTS.fragment(g) for g in _page_items(ranking, offset, limit, explain_plan))
+
+
+def _page_body(
+    user_config: dict,
+    ranking: Ranking,
+    version: str,
+    fingerprint: str,
+    offset: int,
+    limit: int,
+    explain_plan: Optional[ScoringPlan] = None,
+) -> bytes:
+    return json_object([
+        ("profile_used", user_config),
+        ("gigs", json_array(_page_fragments(ranking, offset, limit, explain_plan))),
+        ("next_cursor", _next_cursor(ranking, version, fingerprint, offset, limit)),
+    ])
+
+
+def _page_payload(
+    user_config: dict,
+    ranking: Ranking,
+    version: str,
+    fingerprint: str,
+    offset: int,
+    limit: int,
+    explain_plan: Optional[ScoringPlan] = None,
+    stream: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+):
+    if stream:
+        # Header line first, then one gig per line as the ranking yields it
+        header = {
+            "profile_used": user_config,
+            "next_cursor": _next_cursor(ranking, version, fingerprint, offset, limit),
+        }
+        with span("sort"):
+            ranking.prepare(offset + limit)
+        return ndjson_response(header, _page_fragments(ranking, offset, limit, explain_plan), headers=headers)
+    with span("sort"):
+        ranking.prepare(offset + limit)
+    with span("serialize"):
+        body = _page_body(user_config, ranking, version, fingerprint, offset, limit, explain_plan)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _build_ranking(snapshot: CorpusSnapshot, disqualifiers: List[str], scores: List[float]) -> Ranking:
+    raw_gigs, index, ids = snapshot.gigs, snapshot.index, snapshot.ids
+
+    # Filter based on disqualifiers (hard filter only)
+    with span("filter"):
+        blocked = index.docs_any("haystack", disqualifiers) if disqualifiers else set()
+        filtered_ids = [i for i in snapshot.positions if i not in blocked] if blocked else snapshot.positions
+
+    if not filtered_ids:
+        log_event(log, "search.fallback", reason="no gigs after filtering")
+        filtered_ids = snapshot.positions
+
+    log_event(log, "search.ranked", gigs=len(filtered_ids), blocked=len(blocked))
+
+    # Rank lazily (score desc, id asc); only the gigs on the returned page
+    # are copied into output dicts
+    return Ranking(
+        filtered_ids,
+        key=lambda i: (-scores[i], ids[i]),
+        view=lambda i: {**raw_gigs[i], "score": scores[i]},
+    )
 
-    # 1) Fetch raw gigs from RemoteOK
-    raw_remoteok: List[dict] = []
-    raw_wwr: List[dict] = []
 
+# 🔹 Fetched corpus, shared by all requests until the refresh interval passes
+async def _fetch_source(source: str, fetch: Callable[..., Awaitable[List[dict]]]) -> Optional[List[dict]]:
+    # A failing board contributes no gigs (None) rather than failing the refresh
     try:
-        raw_remoteok = await fetch_remoteok_jobs(limit=50)
+        with span(f"fetch_{source}", FETCH_SECONDS, source=source):
+            return await fetch(limit=50)
     except Exception as e:
-        print("RemoteOK fetch failed:", e)
+        UPSTREAM_ERRORS.inc(source=source)
+        log_event(log, "fetch.failed", logging.WARNING, source=source, error=repr(e))
+        return None
 
-    try:
-        raw_wwr = await fetch_wwr_jobs(limit=50)
-    except Exception as e:
-        print("WWR fetch failed:", e)
-
-    raw_gigs = raw_remoteok + raw_wwr
-    print(
-        "RAW GIGS FETCHED:",
-        len(raw_gigs),
-        "(remoteok:",
-        len(raw_remoteok),
-        "wwr:",
-        len(raw_wwr),
-        ")",
-    )
 
+async def fetch_corpus() -> List[dict]:
+    """
+    Fetch both sources, stamp posting dates and drop near-duplicates.
 
-    # 2) Filter based on disqualifiers (hard filter only)
-    filtered_gigs: List[dict] = []
-    disqualifiers = [d.lower() for d in user_config.get("disqualifiers", []) or []]
+    Raises UpstreamUnavailable when every source failed, so an outage is
+    not mistaken for an empty job market (the corpus store then keeps its
+    previous snapshot).
+    """
+    fetched_remoteok = await _fetch_source("remoteok", fetch_remoteok_jobs)
+    fetched_wwr = await _fetch_source("wwr", fetch_wwr_jobs)
+    if fetched_remoteok is None and fetched_wwr is None:
+        raise UpstreamUnavailable("every job board failed to respond", retry_after=int(CORPUS.retry_seconds))
+    raw_remoteok, raw_wwr = fetched_remoteok or [], fetched_wwr or []
+
+    raw_gigs = stamp_posted(raw_remoteok + raw_wwr)
+    fetched = len(raw_gigs)
+
+    # Same job cross-posted or reposted: keep one canonical copy
+    settings = get_settings()
+    if settings.dedupe:
+        with span("dedupe"):
+            raw_gigs = dedupe_near(raw_gigs, settings.dedupe_config())
+    log_event(
+        log, "corpus.fetched",
+        gigs=len(raw_gigs), fetched=fetched, remoteok=len(raw_remoteok), wwr=len(raw_wwr),
+    )
+    return raw_gigs
 
-    for gig in raw_gigs:
-        title = (gig.get("title") or gig.get("position") or "").lower()
-        desc = (gig.get("description") or "").lower()
-        haystack = f"{title} {desc}"
 
-        if disqualifiers and any(bad in haystack for bad in disqualifiers):
-            continue
+# 🔹 Multi-worker mode (GA_SHARED_DIR): app.refresher is the only process that
+#    fetches; workers attach to its published snapshot and share result pages.
+#    Both are set at startup (_configure) when GA_SHARED_DIR is.
+SHARED: Optional[SharedCorpus] = None
+RESULTS: Optional[SharedResultCache] = None
 
-        filtered_gigs.append(gig)
 
-    if not filtered_gigs:
-        print("No gigs after filtering, falling back to raw gigs.")
-        filtered_gigs = raw_gigs
+async def load_corpus() -> List[dict]:
+    if SHARED is not None:
+        if SHARED.published:
+            return await asyncio.to_thread(SHARED.load)
+        log_event(log, "corpus.unpublished", logging.WARNING, dir=SHARED.directory)
+    return await fetch_corpus()
 
-    print("FILTERED GIGS:", len(filtered_gigs))
 
-    # 3) Score + sort using your existing scoring logic + profile keywords
-    profile_keywords = [kw.lower() for kw in (user_config.get("keywords") or [])]
+CORPUS = CorpusStore(load_corpus)
 
-    scored_gigs: List[dict] = []
-    for gig in filtered_gigs:
-        base_score = score_gig(gig, user_config)
 
-        title = (gig.get("title") or gig.get("position") or "").lower()
-        desc = (gig.get("description") or "").lower()
-        haystack = f"{title} {desc}"
+def _configure(settings: Settings) -> None:
+    """Build the process-wide scorer, admission control and corpus from the settings."""
+    global SCORER, ADMISSION, SHARED, RESULTS
+    SCORER = ParallelScorer(
+        workers=settings.scoring_workers,
+        min_parallel=settings.parallel_min_gigs,
+        engine=settings.scoring_engine,
+    )
+    ADMISSION = AdmissionController(
+        initial_limit=settings.admission_limit,
+        max_limit=settings.admission_max,
+        max_queue=settings.admission_queue,
+        queue_timeout=settings.admission_queue_timeout,
+    )
+    if settings.shared_dir:
+        SHARED = SharedCorpus(settings.shared_dir)
+        RESULTS = SharedResultCache(settings.shared_dir, max_entries=settings.shared_results_max)
+        CORPUS.refresh_seconds = settings.shared_poll_seconds
+    else:
+        SHARED = RESULTS = None
+        CORPUS.refresh_seconds = settings.refresh_seconds
+
+# 🔹 Saved searches: new gigs are matched against them on every refresh
+PERCOLATOR = Percolator()
+ALERTS = AlertHub()
+
+
+@CORPUS.on_refresh
+def _percolate_new_gigs(previous: Optional[CorpusSnapshot], snapshot: CorpusSnapshot) -> None:
+    CORPUS_GIGS.set(len(snapshot.gigs))
+    if previous is None or not previous.gigs:
+        # First non-empty fetch is the baseline: learn which trigrams are
+        # common, alert nothing (an empty one would make every gig "new")
+        if snapshot.gigs:
+            PERCOLATOR.observe(snapshot.gigs)
+            PERCOLATOR.reindex()
+        return
+    fresh = snapshot.new_since(previous)
+    if fresh and len(PERCOLATOR):
+        matches = PERCOLATOR.percolate(fresh)
+        delivered = ALERTS.publish(matches)
+        log_event(log, "alerts.percolated", new_gigs=len(fresh), matches=len(matches), delivered=delivered)
+
+
+async def _snapshot() -> CorpusSnapshot:
+    try:
+        return await CORPUS.snapshot()
+    except UpstreamUnavailable as e:
+        SEARCHES.inc(served_from="unavailable")
+        raise HTTPException(
+            status_code=503,
+            detail="Job boards are unavailable and no corpus is cached yet; retry later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+def _validators(
+    version: str, fingerprint: str, profile: object, offset: int, limit: int, explain: bool, stream: bool
+) -> Dict[str, str]:
+    # Everything that shapes the body goes into the tag, so equal tags mean
+    # identical bodies; max-age runs out when the corpus is next refreshed.
+    # The fingerprint only covers what orders the ranking, and the body
+    # also echoes the profile (profile_used), so the serialized profile is
+    # part of the tag too: shared result pages are keyed by it.
+    snapshot = CORPUS.current
+    max_age = snapshot.max_age() if snapshot is not None and snapshot.version == version else 0
+    return {
+        "ETag": make_etag(version, fingerprint, profile, offset, limit, explain, stream),
+        "Cache-Control": cache_control(max_age),
+    }
 
-        keyword_hits = sum(1 for kw in profile_keywords if kw and kw in haystack)
-        boost = keyword_hits * 10  # adjust if you want stronger/weaker effect
 
-        total_score = base_score + boost
+# 🔹 Core search logic shared by both endpoints
+async def run_gig_search(
+    user_config: dict,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    explain: bool = False,
+    stream: bool = False,
+    if_none_match: Optional[str] = None,
+    plan: Optional[ScoringPlan] = None,
+):
+    """
+    Core search routine:
+    - takes the current corpus snapshot (fetched at most once per refresh interval)
+    - filters based on user_config
+    - scores and ranks (top-k, not a full sort)
+    - returns a shaped payload with a `next_cursor` for the following page
 
-        scored_gigs.append({**gig, "score": total_score})
+    A cursor from a previous response resumes from the cached ranking
+    without refetching or rescoring. With `explain`, each returned gig gets
+    an "explain" breakdown of the rules that produced its score. With
+    `stream`, the page is sent as NDJSON (header line, then one gig per line).
 
-    # 4) Sort and limit
-    scored_gigs.sort(key=lambda g: g.get("score", 0), reverse=True)
-    top_gigs = scored_gigs[:limit]
+    Responses carry an ETag built from the corpus version and the query
+    fingerprint; when it matches `if_none_match` a bare 304 is returned
+    before anything is filtered or scored.
 
-    return {
-        "profile_used": user_config,
-        "gigs": top_gigs,
-    }
+    Scoring is admission-controlled. When it is saturated the request gets
+    503 + Retry-After, or, if this profile was ranked on an earlier corpus
+    version, that ranking with an `X-Degraded: stale-cache` header.
+    """
+    disqualifiers = [d.lower() for d in user_config.get("disqualifiers", []) or []]
+    if plan is None:  # registry profiles come precompiled
+        plan = compile_profile_dict(user_config)
+    fingerprint = ranking_fingerprint(plan.fingerprint, disqualifiers)
+    log_event(log, "search.request", profile=fingerprint, limit=limit, cursor=bool(cursor), stream=stream)
+    explain_plan = plan if explain else None
+
+    offset = 0
+    cursor_version: Optional[str] = None
+    if cursor:
+        try:
+            cursor_version, cursor_fingerprint, offset = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if cursor_fingerprint != fingerprint:
+            raise HTTPException(status_code=400, detail="Cursor does not belong to this query.")
+
+    def payload(ranking: Ranking, version: str, headers: Dict[str, str]):
+        response = _page_payload(
+            user_config, ranking, version, fingerprint, offset, limit, explain_plan, stream, headers
+        )
+        if RESULTS is not None and not stream:
+            RESULTS.put(version, headers["ETag"], response.body)
+        return response
+
+    def shared_page(version: str, headers: Dict[str, str]) -> Optional[Response]:
+        # A page another worker already built for this corpus version
+        if RESULTS is None or stream:
+            return None
+        body = RESULTS.get(version, headers["ETag"])
+        return Response(body, media_type="application/json", headers=headers) if body is not None else None
+
+    if cursor_version is not None:
+        cached = RANKINGS.get(cursor_version, fingerprint)
+        if cached is not None:
+            headers = _validators(cursor_version, fingerprint, user_config, offset, limit, explain, stream)
+            if etag_matches(if_none_match, headers["ETag"]):
+                return _served("not_modified", Response(status_code=304, headers=headers))
+            shared = shared_page(cursor_version, headers)
+            if shared is not None:
+                return _served("shared_results", shared)
+            return _served("ranking_cache", payload(cached, cursor_version, headers))
+
+    # 1) Current corpus snapshot (refetched only once the refresh interval
+    #    has passed); its version is all a conditional request needs
+    with span("snapshot"):
+        snapshot = await _snapshot()
+    raw_gigs, index, version = snapshot.gigs, snapshot.index, snapshot.version
+    if cursor_version is not None and cursor_version != version:
+        raise HTTPException(status_code=410, detail="Cursor expired: the gig list has changed.")
+
+    headers = _validators(version, fingerprint, user_config, offset, limit, explain, stream)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return _served("not_modified", Response(status_code=304, headers=headers))
+    shared = shared_page(version, headers)
+    if shared is not None:
+        return _served("shared_results", shared)
+
+    cached = RANKINGS.get(version, fingerprint)
+    if cached is not None:
+        return _served("ranking_cache", payload(cached, version, headers))
+
+    # 2) Everything above is cheap; scoring waits for an admission slot and
+    #    is shed when the pipeline is saturated
+    try:
+        async with ADMISSION.slot():
+            # Score with the compiled profile: base heuristics + keyword boost
+            # (off the event loop: a thread, or the worker pool for large corpora)
+            with span("score"):
+                scores = (await SCORER.score_async(raw_gigs, [plan], index=index))[plan.name]
+
+            # 3) Filter and rank, and cache the ranking for the next pages
+            ranking = _build_ranking(snapshot, disqualifiers, scores)
+            RANKINGS.put(version, fingerprint, ranking)
+    except Overloaded as e:
+        stale = RANKINGS.latest(fingerprint) if get_settings().admission_degrade else None
+        if stale is None:
+            SEARCHES.inc(served_from="shed")
+            raise _overloaded(e)
+        # Degrade: this profile's ranking from an earlier corpus version
+        stale_version, stale_ranking = stale
+        log_event(log, "search.degraded", logging.WARNING, reason=e.reason, version=stale_version)
+        degraded = {
+            "Retry-After": str(e.retry_after),
+            "X-Degraded": "stale-cache",
+            "Cache-Control": "no-store",
+        }
+        return _served("degraded", _page_payload(
+            user_config, stale_ranking, stale_version, fingerprint, offset, limit, explain_plan, stream, degraded
+        ))
+
+    return _served("scored", payload(ranking, version, headers))
 
 
 # 🔹 POST /gigs/search — rich JSON profile, used by your form (if/when needed)
 @app.post("/gigs/search")
 async def search_gigs_with_profile(
     profile: UserProfile,
+    request: Request,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    explain: bool = False,
+    stream: bool = False,
+    debug: bool = False,
 ):
     """
     Multi-user endpoint:
     Accepts a JSON profile body and uses it to curate gigs.
+    Pass the previous response's `next_cursor` to get the next page,
+    and `explain=true` to see why each gig scored what it did.
+    `stream=1` (or Accept: application/x-ndjson) streams NDJSON.
+    `debug=1` adds per-stage "timings" (ms) to the body.
     """
     user_config = profile.dict()
-    return await run_gig_search(user_config, limit)
+    return await _timed(run_gig_search(
+        user_config,
+        limit,
+        cursor=cursor,
+        explain=explain,
+        stream=wants_ndjson(request.headers.get("accept"), stream),
+        if_none_match=request.headers.get("if-none-match"),
+    ), debug)
 
 
 # 🔹 GET /gigs — simple profile-key endpoint used by your UI (/api/gigs?profile=cindy)
 @app.get("/gigs")
 async def get_gigs(
+    request: Request,
     profile: str = Query("cindy", description="Profile key, e.g. 'cindy' or 'creative'"),
     limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    explain: bool = Query(False, description="Attach a per-gig score breakdown"),
+    stream: bool = Query(False, description="Stream NDJSON: header line, then one gig per line"),
+    debug: bool = Query(False, description="Add per-stage timings (ms) to the body"),
 ):
     """
     Simple endpoint compatible with the older Next.js route:
     GET /gigs?profile=cindy&limit=10
+    GET /gigs?profile=cindy&limit=10&cursor=<next_cursor>
+    GET /gigs?profile=cindy&explain=true
+    GET /gigs?profile=cindy&stream=1          (or Accept: application/x-ndjson)
 
-    Uses the lightweight Profile system, but still goes through
-    the main run_gig_search() pipeline.
+    Polling clients should send the last ETag back as If-None-Match; an
+    unchanged result is answered with 304 and no body.
+
+    Every response has a Server-Timing header with the time spent per
+    stage (snapshot, fetch_<source>, filter, score, sort, serialize).
+
+    Uses the built-in profiles (configs/profiles/, precompiled by the
+    registry), but still goes through the main run_gig_search() pipeline.
     """
-    profile_key = profile.lower().strip()
-    profile_obj = PROFILES.get(profile_key, PROFILES["cindy"])
-
-    user_config = {
-        "preferred_roles": [profile_key],
-        "skills": profile_obj.skills,
-        "keywords": profile_obj.keywords,
-        "disqualifiers": [],
-        "min_pay": profile_obj.min_pay,
-        "remote_only": profile_obj.remote_only,
-    }
+    user_config, plan = profile_entry(profile)
+    return await _timed(run_gig_search(
+        user_config,
+        limit,
+        cursor=cursor,
+        explain=explain,
+        stream=wants_ndjson(request.headers.get("accept"), stream),
+        if_none_match=request.headers.get("if-none-match"),
+        plan=plan,
+    ), debug)
+
+
+# 🔹 Several profiles against one corpus read
+async def run_batch_search(
+    user_configs: List[dict],
+    limit: int = 10,
+    explain: bool = False,
+    if_none_match: Optional[str] = None,
+):
+    """
+    One corpus snapshot, one scoring pass for every profile: all plans are
+    scored together over the snapshot's index, so terms the profiles have in
+    common (the base heuristics, shared keywords) are matched once. Profiles
+    with identical rules, or whose ranking is already cached, are not scored
+    again. Each result pages like POST /gigs/search, and its `next_cursor`
+    works there.
+    """
+    plans: List[ScoringPlan] = []
+    disqualifiers: List[List[str]] = []
+    fingerprints: List[str] = []
+    for i, user_config in enumerate(user_configs):
+        disq = [d.lower() for d in user_config.get("disqualifiers", []) or []]
+        plan = compile_profile_dict(user_config, name=f"profile-{i}")
+        plans.append(plan)
+        disqualifiers.append(disq)
+        fingerprints.append(ranking_fingerprint(plan.fingerprint, disq))
+
+    with span("snapshot"):
+        snapshot = await _snapshot()
+    version = snapshot.version
+    headers = _validators(version, ranking_fingerprint(*fingerprints), user_configs, 0, limit, explain, False)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return _served("not_modified", Response(status_code=304, headers=headers))
+    if RESULTS is not None:
+        body = RESULTS.get(version, headers["ETag"])
+        if body is not None:
+            return _served("shared_results", Response(body, media_type="application/json", headers=headers))
+
+    rankings: Dict[str, Ranking] = {}
+    todo: Dict[str, int] = {}  # fingerprint -> first profile that needs it
+    for i, fingerprint in enumerate(fingerprints):
+        cached = RANKINGS.get(version, fingerprint)
+        if cached is not None:
+            rankings[fingerprint] = cached
+        else:
+            todo.setdefault(fingerprint, i)
+
+    if todo:
+        try:
+            async with ADMISSION.slot():
+                todo_plans = [plans[i] for i in todo.values()]
+                with span("score"):
+                    scores = await SCORER.score_async(snapshot.gigs, todo_plans, index=snapshot.index)
+                for fingerprint, i in todo.items():
+                    ranking = _build_ranking(snapshot, disqualifiers[i], scores[plans[i].name])
+                    RANKINGS.put(version, fingerprint, ranking)
+                    rankings[fingerprint] = ranking
+        except Overloaded as e:
+            SEARCHES.inc(served_from="shed")
+            raise _overloaded(e)
+
+    log_event(log, "search.batch", profiles=len(user_configs), scored=len(todo))
+
+    with span("serialize"):
+        results = json_array(
+            _page_body(
+                user_config,
+                rankings[fingerprints[i]],
+                version,
+                fingerprints[i],
+                0,
+                limit,
+                plans[i] if explain else None,
+            )
+            for i, user_config in enumerate(user_configs)
+        )
+        body = json_object([("results", results)])
+    if RESULTS is not None:
+        RESULTS.put(version, headers["ETag"], body)
+    return _served("scored" if todo else "ranking_cache", Response(body, media_type="application/json", headers=headers))
+
+
+# 🔹 POST /gigs/search/batch — side-by-side results for several profiles
+@app.post("/gigs/search/batch")
+async def search_gigs_batch(
+    batch: BatchSearch,
+    request: Request,
+    explain: bool = False,
+    debug: bool = False,
+):
+    """
+    Body: {"profiles": ["cindy", "developer", {"keywords": [...], ...}], "limit": 10}
+
+    Strings are built-in profile keys, objects are UserProfile bodies.
+    Returns {"results": [...]} with one search payload per profile, in
+    request order, from a single corpus read and scoring pass.
+    """
+    user_configs = [
+        profile_user_config(p) if isinstance(p, str) else p.dict()
+        for p in batch.profiles
+    ]
+    return await _timed(run_batch_search(
+        user_configs,
+        batch.limit,
+        explain=explain,
+        if_none_match=request.headers.get("if-none-match"),
+    ), debug)
+
+
+# 🔹 Saved-search alerts: new matching gigs are pushed over Server-Sent Events
+class SavedSearchBody(BaseModel):
+    profile: Union[str, UserProfile]
+    min_score: float = 0.0
+
+
+@app.post("/alerts", status_code=201)
+async def create_alert(body: SavedSearchBody):
+    """
+    Save a search (a profile key or a UserProfile body). Gigs that show up
+    in later fetches and match it are pushed to GET /alerts/{id}/events.
+
+    Saved searches live in this process, so alerts need a single worker:
+    with GA_SHARED_DIR set they are rejected with 501.
+    """
+    if SHARED is not None:
+        raise HTTPException(
+            status_code=501,
+            detail="Alerts are per process and need a single worker; unset GA_SHARED_DIR to use them.",
+        )
+    user_config = profile_user_config(body.profile) if isinstance(body.profile, str) else body.profile.dict()
+    alert_id = uuid.uuid4().hex
+    search = SavedSearch(
+        id=alert_id,
+        plan=compile_profile_dict(user_config, name=alert_id),
+        disqualifiers=tuple(d.lower() for d in user_config.get("disqualifiers", []) or []),
+        min_score=body.min_score,
+    )
+    try:
+        PERCOLATOR.add(search)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"id": alert_id, "profile_used": user_config, "min_score": body.min_score}
+
+
+@app.delete("/alerts/{alert_id}")
+async def delete_alert(alert_id: str):
+    if not PERCOLATOR.remove(alert_id):
+        raise HTTPException(status_code=404, detail="Unknown alert.")
+    return {"id": alert_id, "deleted": True}
+
+
+ALERT_KEEPALIVE_SECONDS = 15.0
 
-    return await run_gig_search(user_config, limit)
+
+async def alert_events(alert_id: str, is_disconnected: Callable[[], Awaitable[bool]]):
+    """
+    SSE stream of matches for one saved search. While idle it sends a
+    keep-alive comment and lets the corpus refresh once it is stale, which
+    is what percolates newly fetched gigs.
+    """
+    queue = ALERTS.subscribe(alert_id)
+    wait = min(ALERT_KEEPALIVE_SECONDS, CORPUS.refresh_seconds)
+    seq = 0
+    try:
+        while not await is_disconnected():
+            try:
+                match = await asyncio.wait_for(queue.get(), timeout=wait)
+            except asyncio.TimeoutError:
+                try:
+                    await CORPUS.snapshot()
+                except UpstreamUnavailable:
+                    pass  # nothing to percolate yet; keep the stream open
+                yield SSE_KEEPALIVE
+                continue
+            seq += 1
+            data = FRAGMENTS.fragment({**match.gig, "score": match.score})
+            yield sse_event(data, event="match", event_id=str(seq))
+    finally:
+        ALERTS.unsubscribe(alert_id, queue)
+
+
+@app.get("/alerts/{alert_id}/events")
+async def stream_alert(alert_id: str, request: Request):
+    """
+    text/event-stream of `match` events, one new matching gig per event.
+    """
+    if alert_id not in PERCOLATOR:
+        raise HTTPException(status_code=404, detail="Unknown alert.")
+    return sse_response(alert_events(alert_id, request.is_disconnected))
@@ -2,24 +2,59 @@
 
 import argparse
 import asyncio
-import json
+import logging
+import sys
+import time
 from pathlib import Path
-from typing import List, Dict
-
-from rich.console import Console
-from rich.table import Table
-from app.providers.remoteok import fetch_remoteok_jobs
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from app.providers.remoteok_jobs import RemoteOKFeed, fetch_remoteok_jobs
+from app.core.dates import stamp_posted
+from app.core.dedupe import dedupe_near
+from app.core.logs import configure_logging, get_logger, log_event
+from app.core.parallel import ParallelScorer
+from app.core.plan import compile_plan, explain as explain_score
+from app.core.profiles import get_registry
+from app.core.ranking import rank_key, top_k
 from app.core.scoring import score_gig, DEFAULT_PREFERENCES
+from app.core.seen import SeenSet
 from app.core.summaries import summarize_gig
-from app.sources.remoteok import score_remote
+from app.core.timing import request_timer, span
+from app.exporters import GIG_FIELDS, export, format_for
+from app.settings import get_settings
+from app.sources.remoteok import classify_many
 from app.user_config import load_user_config, UserConfig
 
-console = Console()
+log = get_logger(__name__)
+
+
+def _console():
+    # rich is only imported for --table output
+    from rich.console import Console
+
+    return Console()
+
 
 # -----------------------------
 # Argument parsing
 # -----------------------------
-def parse_args() -> argparse.Namespace:
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(raw: str) -> float:
+    """ "90", "30s", "10m", "2h" -> seconds """
+    text = raw.strip().lower()
+    scale = _DURATION_UNITS.get(text[-1:])
+    try:
+        seconds = float(text[:-1] if scale else text) * (scale or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration: {raw!r}") from None
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"duration must be positive: {raw!r}")
+    return seconds
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="gig-agent CLI")
 
     parser.add_argument(
@@ -30,8 +65,9 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--out",
-        type=str,
-        help="Optional path to write raw gigs JSON (e.g., gigs.json)",
+        action="append",
+        help="Write gigs to this file; the suffix picks the format (.json, .jsonl, .csv, .md, "
+        "plus .gz to compress; anything else is JSON). Repeat to write several formats in one pass",
     )
     parser.add_argument(
         "--recommend",
@@ -49,6 +85,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Render recommendations as a Rich table UI",
     )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Show which scoring rules fired for each recommended gig",
+    )
     parser.add_argument(
         "--remote-only",
         action="store_true",
@@ -60,7 +101,63 @@ def parse_args() -> argparse.Namespace:
         type=str,
         help="User profile name (e.g. 'cindy') to load preferences from configs/<profile>.json",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--profiles",
+        type=str,
+        help="Comma-separated profiles to score in one run (e.g. 'cindy,creative,developer')",
+    )
+    parser.add_argument(
+        "--all-profiles",
+        action="store_true",
+        help="Score every profile in configs/ in one run",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=str,
+        help="Directory for the per-profile results of --profiles / --all-profiles (<profile>.json), "
+        "or for each --watch poll's new gigs (new-<time>.json)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay resident and report only gigs not seen before, every --interval",
+    )
+    parser.add_argument(
+        "--interval",
+        type=parse_duration,
+        help="Time between --watch polls, e.g. 90s, 10m, 1h (default: GA_REFRESH_SECONDS)",
+    )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        help="Only report new gigs scoring at least this much (default: GA_WATCH_MIN_SCORE)",
+    )
+    parser.add_argument(
+        "--seen-file",
+        type=str,
+        help="Where --watch remembers the gigs it has seen (default: GA_SEEN_FILE)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        if args.profiles is not None or args.all_profiles:
+            parser.error("--watch scores one --profile")
+        if args.recommend or args.out:
+            parser.error("--watch prints new gigs itself; use --out-dir to also export them")
+    elif args.interval is not None or args.min_score is not None or args.seen_file:
+        parser.error("--interval, --min-score and --seen-file are --watch options")
+    elif args.profiles is not None or args.all_profiles:
+        if args.profile:
+            parser.error("--profile cannot be combined with --profiles / --all-profiles")
+        if args.profiles is not None and args.all_profiles:
+            parser.error("use either --profiles or --all-profiles, not both")
+        if not args.out_dir:
+            parser.error("--profiles / --all-profiles need --out-dir")
+        if args.recommend or args.out:
+            parser.error("--recommend and --out are single-profile options")
+    elif args.out_dir:
+        parser.error("--out-dir is only used with --profiles / --all-profiles / --watch")
+    return args
 
 
 # -----------------------------
@@ -71,26 +168,39 @@ async def fetch_gigs(limit: int, remote_only: bool = False) -> List[Dict]:
     Fetch gigs from all sources (for now just RemoteOK, later we add others).
 
     If remote_only=True, filter to gigs that look remote/hybrid friendly
-    using app.sources.remoteok.score_remote.
+    using app.sources.remoteok.classify_many.
     """
-    remoteok_gigs = await fetch_remoteok_jobs(limit=limit)
+    # later: add other sources and concatenate
+    return normalize_gigs(await fetch_remoteok_jobs(limit=limit), remote_only)
+
+
+def normalize_gigs(remoteok_gigs: List[Dict], remote_only: bool = False) -> List[Dict]:
+    """Stamp posting dates, drop near-duplicates and, optionally, onsite gigs."""
+    remoteok_gigs = stamp_posted(remoteok_gigs)
+    settings = get_settings()
+    if settings.dedupe:
+        remoteok_gigs = dedupe_near(remoteok_gigs, settings.dedupe_config())
 
     if not remote_only:
-        # later: add other sources and concatenate
         return remoteok_gigs
 
-    filtered: List[Dict] = []
+    texts = [
+        " ".join(
+            p
+            for p in (
+                gig.get("title", ""),
+                gig.get("company", ""),
+                gig.get("description", ""),
+                gig.get("location", ""),
+            )
+            if p
+        )
+        for gig in remoteok_gigs
+    ]
 
-    for gig in remoteok_gigs:
-        text_parts = [
-            gig.get("title", ""),
-            gig.get("company", ""),
-            gig.get("description", ""),
-            gig.get("location", ""),
-        ]
-        text = " ".join(p for p in text_parts if p)
+    filtered: List[Dict] = []
 
-        remote = score_remote(text)
+    for gig, remote in zip(remoteok_gigs, classify_many(texts)):
         if not remote.is_remote_ok:
             # Skip non-remote / onsite-only gigs
             continue
@@ -105,24 +215,42 @@ async def fetch_gigs(limit: int, remote_only: bool = False) -> List[Dict]:
 # -----------------------------
 # Output helpers
 # -----------------------------
-def write_out(path_str: str, gigs: List[Dict]) -> None:
-    path = Path(path_str)
-    path.write_text(json.dumps(gigs, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"[ OK  ] Wrote {len(gigs)} gigs to {path}")
+def write_out(paths: Union[str, Sequence[str]], gigs: Iterable[Dict]) -> None:
+    """
+    Stream gigs to one or more files in one pass (app.exporters). Files
+    without a known suffix get JSON, as --out always wrote; CSV gets a
+    column for every gig field, whichever gig first has it.
+    """
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    rows = export(gigs, [(p, format_for(p, default="json")) for p in paths], fieldnames=GIG_FIELDS)
+    print(f"[ OK  ] Wrote {rows} gigs to {', '.join(str(Path(p)) for p in paths)}")
+
+
+def _top_recommendations(gigs: List[Dict], top_n: int, explain: bool) -> List[Dict]:
+    scored = ({**gig, "score": score_gig(gig, DEFAULT_PREFERENCES)} for gig in gigs)
+    top = top_k(scored, top_n)
+    if explain:
+        # Explain only what we show, with the rules that produced the score.
+        plan = compile_plan(None)
+        for gig in top:
+            gig["explain"] = explain_score(plan, gig)
+    return top
 
 
-def print_recommendations(gigs: List[Dict], top_n: int = 10) -> None:
+def format_explanation(breakdown: Dict) -> List[str]:
+    lines = []
+    for rule in breakdown["rules"]:
+        label = "missing" if rule["kind"] == "must_have" else "matched"
+        terms = ", ".join(rule["terms"])
+        lines.append(f"{rule['weight']:+g} {rule['kind']} ({label}: {terms})")
+    return lines or ["no rules fired"]
+
+
+def print_recommendations(gigs: List[Dict], top_n: int = 10, explain: bool = False) -> None:
     """
-    Score gigs, sort, and print pretty summaries.
+    Score gigs, pick the top N, and print pretty summaries.
     """
-    scored: List[Dict] = []
-    for gig in gigs:
-        s = score_gig(gig, DEFAULT_PREFERENCES)
-        gig_with_score = {**gig, "score": s}
-        scored.append(gig_with_score)
-
-    scored.sort(key=lambda g: g["score"], reverse=True)
-    top = scored[:top_n]
+    top = _top_recommendations(gigs, top_n, explain)
 
     print(f"\nTop {len(top)} gig recommendations:\n" + "-" * 60)
     for i, gig in enumerate(top, start=1):
@@ -130,23 +258,18 @@ def print_recommendations(gigs: List[Dict], top_n: int = 10) -> None:
         print("-" * 60)
 
 
-def print_recommendations_table(gigs: List[Dict], top_n: int = 10) -> None:
+def print_recommendations_table(gigs: List[Dict], top_n: int = 10, explain: bool = False) -> None:
     """
     Pretty terminal UI using Rich to display top gigs in a table.
     """
-    scored: List[Dict] = []
-    for gig in gigs:
-        s = score_gig(gig, DEFAULT_PREFERENCES)
-        gig_with_score = {**gig, "score": s}
-        scored.append(gig_with_score)
-
-    scored.sort(key=lambda g: g["score"], reverse=True)
-    top = scored[:top_n]
+    top = _top_recommendations(gigs, top_n, explain)
 
     if not top:
-        console.print("[bold yellow]No gigs to display.[/bold yellow]")
+        _console().print("[bold yellow]No gigs to display.[/bold yellow]")
         return
 
+    from rich.table import Table
+
     table = Table(title=f"Top {len(top)} gig recommendations")
 
     table.add_column("#", style="bold cyan", justify="right")
@@ -157,6 +280,8 @@ def print_recommendations_table(gigs: List[Dict], top_n: int = 10) -> None:
     table.add_column("Salary")
     table.add_column("Summary", overflow="fold")
     table.add_column("Link", overflow="fold")
+    if explain:
+        table.add_column("Why", overflow="fold")
 
     for idx, gig in enumerate(top, start=1):
         title = gig.get("position") or gig.get("title") or "Untitled role"
@@ -168,7 +293,7 @@ def print_recommendations_table(gigs: List[Dict], top_n: int = 10) -> None:
 
         summary = summarize_gig(gig, max_length=140)
 
-        table.add_row(
+        row = [
             str(idx),
             title,
             company,
@@ -177,9 +302,12 @@ def print_recommendations_table(gigs: List[Dict], top_n: int = 10) -> None:
             str(salary),
             summary,
             link,
-        )
+        ]
+        if explain:
+            row.append("\n".join(format_explanation(gig["explain"])))
+        table.add_row(*row)
 
-    console.print(table)
+    _console().print(table)
 
 
 def format_gig_summary(idx: int, gig: Dict) -> str:
@@ -204,14 +332,164 @@ def format_gig_summary(idx: int, gig: Dict) -> str:
         f"   Summary: {summary}",
         f"   Link: {url}",
     ]
+    if "explain" in gig:
+        lines.append("   Why:")
+        lines.extend(f"     {line}" for line in format_explanation(gig["explain"]))
     return "\n".join(lines)
 
 
+# -----------------------------
+# Multi-profile batch
+# -----------------------------
+def batch_profiles(args: argparse.Namespace) -> List[str]:
+    """The profile keys a --profiles / --all-profiles run scores, validated."""
+    registry = get_registry()
+    available = registry.keys("user")
+    if args.all_profiles:
+        if not available:
+            raise ValueError(f"No valid profiles in {registry.directory}")
+        return list(available)
+    keys = list(dict.fromkeys(k.strip().lower() for k in args.profiles.split(",") if k.strip()))
+    unknown = [k for k in keys if registry.get(k, "user") is None]
+    if not keys or unknown:
+        raise ValueError(
+            f"Unknown profile(s) {', '.join(unknown) or '(none given)'}. "
+            f"Valid options: {', '.join(available)}"
+        )
+    return keys
+
+
+async def run_batch(args: argparse.Namespace, keys: List[str]) -> Dict[str, float]:
+    """
+    Fetch and normalize once, score every profile in one ParallelScorer
+    pass, and write <out-dir>/<profile>.json per profile. Returns the
+    per-stage timings (ms, plus "total").
+    """
+    settings = get_settings()
+    registry = get_registry()
+    plans = [registry.get(key, "user").plan for key in keys]
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with request_timer() as timer:
+        with span("fetch"):
+            raw = await fetch_remoteok_jobs(limit=args.limit)
+        with span("normalize"):
+            gigs = normalize_gigs(raw, remote_only=args.remote_only)
+        with span("score"):
+            # The work is gigs x profiles, so split across workers sooner.
+            with ParallelScorer(
+                plans,
+                workers=settings.scoring_workers,
+                min_parallel=max(1, settings.parallel_min_gigs // len(plans)),
+                engine=settings.scoring_engine,
+            ) as scorer:
+                scores = scorer.score(gigs)
+        with span("write"):
+            for key, plan in zip(keys, plans):
+                ranked = [{**gig, "score": score} for gig, score in zip(gigs, scores[plan.name])]
+                ranked.sort(key=rank_key)
+                write_out(str(out_dir / f"{key}.json"), ranked)
+        timings = timer.timings()
+
+    stages = " | ".join(f"{name} {ms:.1f} ms" for name, ms in timings.items())
+    print(f"[TIME] {len(keys)} profiles x {len(gigs)} gigs: {stages}")
+    return timings
+
+
+# -----------------------------
+# Watch mode
+# -----------------------------
+async def watch_once(
+    feed: RemoteOKFeed,
+    scorer: ParallelScorer,
+    seen: SeenSet,
+    args: argparse.Namespace,
+    min_score: float,
+) -> List[Dict]:
+    """
+    One poll: fetch (conditionally), score only the gigs not seen before,
+    report the ones scoring at least `min_score`, then remember every new
+    gig so it is neither scored nor reported again. Returns what was reported.
+    """
+    started = time.perf_counter()
+    raw = await feed.fetch(limit=args.limit)
+    fresh: List[Dict] = []
+    hits: List[Dict] = []
+    if not feed.not_modified:
+        fresh = [gig for gig in normalize_gigs(raw, remote_only=args.remote_only) if not seen.seen(gig)]
+    if fresh:
+        plan = scorer.plans[0]
+        scores = (await scorer.score_async(fresh))[plan.name]
+        hits = [{**gig, "score": score} for gig, score in zip(fresh, scores) if score >= min_score]
+        hits.sort(key=rank_key)
+
+    if hits:
+        print(f"\n{len(hits)} new gig(s):\n" + "-" * 60)
+        for i, gig in enumerate(hits, start=1):
+            print(format_gig_summary(i, gig))
+            print("-" * 60)
+        if args.out_dir:
+            out_dir = Path(args.out_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            write_out(str(out_dir / f"new-{time.strftime('%Y%m%d-%H%M%S')}.json"), hits)
+    if fresh:
+        # only after reporting: a crash before this point re-reports, never loses
+        seen.add_many(fresh)
+        seen.save()
+
+    log_event(
+        log,
+        "watch.poll",
+        fetched=len(raw),
+        not_modified=feed.not_modified,
+        new=len(fresh),
+        reported=len(hits),
+        ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    return hits
+
+
+async def watch(args: argparse.Namespace, user_config: Optional[UserConfig]) -> None:
+    """Poll until interrupted. Memory is bounded: one feed, one scorer, a fixed-size seen-set."""
+    settings = get_settings()
+    interval = args.interval or settings.refresh_seconds
+    min_score = settings.watch_min_score if args.min_score is None else args.min_score
+    seen = SeenSet.load(args.seen_file or settings.seen_file, capacity=settings.seen_capacity)
+    print(f"[INFO] Watching every {interval:g}s; seen-set {seen.path}. Ctrl-C to stop.")
+
+    with ParallelScorer(
+        [compile_plan(user_config)],
+        workers=settings.scoring_workers,
+        min_parallel=settings.parallel_min_gigs,
+        engine=settings.scoring_engine,
+    ) as scorer:
+        async with RemoteOKFeed() as feed:
+            while True:
+                started = time.monotonic()
+                try:
+                    await watch_once(feed, scorer, seen, args, min_score)
+                except Exception as e:  # keep watching; the next poll retries
+                    log_event(log, "watch.failed", logging.ERROR, error=repr(e))
+                await asyncio.sleep(max(1.0, interval - (time.monotonic() - started)))
+
+
 # -----------------------------
 # Main entrypoint
 # -----------------------------
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # progress lines (exports etc.) as plain text on stdout
+    settings = get_settings()
+    configure_logging(settings.log_level, "text", stream=sys.stdout)
+
+    if args.profiles is not None or args.all_profiles:
+        try:
+            keys = batch_profiles(args)
+        except ValueError as e:
+            sys.exit(f"[error] {e}")
+        asyncio.run(run_batch(args, keys))
+        return
 
     # 🔹 Try to load a user profile (e.g. configs/cindy.json)
     try:
@@ -220,23 +498,38 @@ def main() -> None:
         print(f"[warning] {e}")
         user_config = None
 
+    if args.watch:
+        try:
+            asyncio.run(watch(args, user_config))
+        except KeyboardInterrupt:
+            print("[INFO] Stopped watching.")
+        return
+
     async def _go():
         gigs = await fetch_gigs(limit=args.limit, remote_only=args.remote_only)
 
         # 🔹 Apply profile-based scoring if we have a config
         if user_config is not None:
-            for gig in gigs:
-                gig["score"] = score_gig(gig, user_config=user_config)
-            gigs.sort(key=lambda g: g.get("score", 0), reverse=True)
+            plan = compile_plan(user_config)
+            with ParallelScorer(
+                [plan],
+                workers=settings.scoring_workers,
+                min_parallel=settings.parallel_min_gigs,
+                engine=settings.scoring_engine,
+            ) as scorer:
+                scores = scorer.score(gigs)[plan.name]
+            for gig, score in zip(gigs, scores):
+                gig["score"] = score
+            gigs.sort(key=rank_key)
 
         if args.out:
             write_out(args.out, gigs)
 
         if args.recommend:
             if args.table:
-                print_recommendations_table(gigs, top_n=args.top)
+                print_recommendations_table(gigs, top_n=args.top, explain=args.explain)
             else:
-                print_recommendations(gigs, top_n=args.top)
+                print_recommendations(gigs, top_n=args.top, explain=args.explain)
         elif not args.out:
             print(
                 f"[INFO] Fetched {len(gigs)} gigs. "
@@ -245,5 +538,6 @@ def main() -> None:
 
     asyncio.run(_go())
 
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,171 @@
+# app/core/admission.py
+
+"""
+Admission control for the search pipeline.
+
+At most `limit` searches run at once; up to `max_queue` more wait in FIFO
+order for at most `queue_timeout` seconds. A request that finds the queue
+full, or whose wait runs out, is refused at once with Overloaded so the
+endpoint can answer 503 + Retry-After (or serve something cached) instead
+of making every request slow.
+
+The limit adapts to measured pipeline latency, in the style of a gradient
+concurrency limiter: a fast-moving average of latency is compared with a
+slow-moving baseline. While latency stays within `tolerance` times the
+baseline and the limit is actually in use, it grows by about sqrt(limit)
+per adjustment; when latency climbs it shrinks in proportion, by at most
+half. Changes are smoothed and clamped to [min_limit, max_limit].
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Optional
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+        admission = AdmissionController(initial_limit=8)
+        async with admission.slot():
+            ...   # raises Overloaded instead of entering when saturated
+
+    `max_limit <= 0` disables admission control.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        max_queue: int = 32,
+        queue_timeout: float = 1.0,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+    ):
+        self.enabled = max_limit > 0
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._short: Optional[float] = None  # recent latency (fast EWMA)
+        self._long: Optional[float] = None  # baseline latency (slow EWMA)
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Whole seconds until a slot is likely to be free (at least 1)."""
+        per_request = self._short if self._short is not None else 1.0
+        return max(1, math.ceil((self.queued + 1) * per_request / self.capacity))
+
+    # --- slots ---------------------------------------------------------------
+
+    async def acquire(self) -> None:
+        if not self.enabled:
+            return
+        if self.in_flight < self.capacity and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("queue full", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forget(waiter)
+            self.timed_out += 1
+            raise Overloaded("queue timeout", self.retry_after())
+        except BaseException:
+            # cancelled while waiting: hand back a slot we may have been given
+            self._forget(waiter)
+            if waiter.done() and not waiter.cancelled():
+                self._hand_over()
+            raise
+        self.admitted += 1  # the releasing request passed its slot on
+
+    def _forget(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _hand_over(self) -> None:
+        # Give a finished request's slot to the next waiter, or free it
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _wake(self) -> None:
+        # The limit grew: admit waiters into the new room
+        while self._waiters and self.in_flight < self.capacity:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def release(self, latency: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        if latency is not None:
+            self._observe(latency)
+        if self.in_flight > self.capacity:
+            self.in_flight -= 1  # the limit shrank: retire this slot
+        else:
+            self._hand_over()
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    # --- adaptation ----------------------------------------------------------
+
+    def _observe(self, latency: float) -> None:
+        if self._short is None or self._long is None:
+            self._short = self._long = latency
+            return
+        self._short += self.smoothing * (latency - self._short)
+        self._long += 0.05 * (latency - self._long)
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long / max(self._short, 1e-9)))
+        target = self.limit * gradient
+        if gradient >= 1.0 and self.in_flight >= self.limit / 2:
+            target += math.sqrt(self.limit)  # in use and healthy: probe upwards
+        limit = self.limit * (1 - self.smoothing) + target * self.smoothing
+        self.limit = min(float(self.max_limit), max(float(self.min_limit), limit))
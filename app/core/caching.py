@@ -0,0 +1,42 @@
+# app/core/caching.py
+
+"""
+HTTP validators for search responses.
+
+The ETag of a search response is a hash of the corpus version plus
+everything that shapes the response (ranking fingerprint, page, output
+options). It is strong: equal tags mean byte-identical bodies, because
+the ranking is deterministic for a given corpus and query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Optional
+
+
+def make_etag(version: str, *parts: Any) -> str:
+    raw = json.dumps([version, *parts], sort_keys=True, default=str)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match evaluation (weak comparison, as RFC 9110 requires for it).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def cache_control(max_age: int) -> str:
+    return f"private, max-age={max(0, int(max_age))}"
@@ -0,0 +1,157 @@
+# app/core/corpus.py
+
+"""
+Shared corpus snapshots.
+
+Fetching, date stamping, dedupe and indexing happen once per refresh
+interval instead of once per request. A CorpusSnapshot is immutable once
+built; requests that arrive while it is fresh all share it, and a single
+refresh runs when it goes stale (concurrent requests wait for it rather
+than fetching in parallel).
+
+Because the snapshot carries the corpus version, callers can answer
+conditional requests (ETag / If-None-Match) without touching the gigs.
+Listeners registered with `on_refresh` see every (previous, new) pair, e.g.
+to act on the gigs that are new since the last fetch.
+
+A fetcher may return the very sequence it returned last time to say nothing
+changed (app.core.shared does, between publishes); the current snapshot
+and its index are then kept and only their expiry moves.
+
+A fetcher that raises (e.g. UpstreamUnavailable when every job board
+failed) does not replace a good snapshot with an empty one: the previous
+snapshot stays and is retried after `retry_seconds`. Only the very first
+fetch has nothing to fall back on, and its error reaches the caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.core.index import CorpusIndex
+from app.core.logs import get_logger, log_event
+from app.core.ranking import gig_id
+
+log = get_logger(__name__)
+
+Fetcher = Callable[[], Awaitable[Sequence[Dict[str, Any]]]]
+RefreshListener = Callable[[Optional["CorpusSnapshot"], "CorpusSnapshot"], None]
+
+
+class UpstreamUnavailable(RuntimeError):
+    """No source could be fetched; there is nothing to build a corpus from."""
+
+    def __init__(self, message: str, retry_after: int = 30):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class CorpusSnapshot:
+    gigs: Sequence[Dict[str, Any]]
+    index: CorpusIndex
+    version: str
+    fetched_at: float
+    expires_at: float
+    # shared by every ranking built on this snapshot
+    ids: List[str]
+    positions: Sequence[int]
+
+    def max_age(self, now: Optional[float] = None) -> int:
+        """Seconds until the next refresh (for Cache-Control)."""
+        now = time.time() if now is None else now
+        return max(0, int(self.expires_at - now))
+
+    def new_since(self, previous: Optional["CorpusSnapshot"]) -> List[Dict[str, Any]]:
+        """Gigs whose id was not in `previous` (all of them if there was none)."""
+        if previous is None:
+            return list(self.gigs)
+        seen = set(previous.ids)
+        return [g for g, gid in zip(self.gigs, self.ids) if gid not in seen]
+
+
+class CorpusStore:
+    """
+    Holds the current snapshot and refreshes it every `refresh_seconds`.
+    """
+
+    def __init__(self, fetch: Fetcher, refresh_seconds: float = 300.0, retry_seconds: float = 30.0):
+        self._fetch = fetch
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self._snapshot: Optional[CorpusSnapshot] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._listeners: List[RefreshListener] = []
+        self._fetched: Optional[Sequence[Dict[str, Any]]] = None
+
+    @property
+    def current(self) -> Optional[CorpusSnapshot]:
+        return self._snapshot
+
+    def on_refresh(self, listener: RefreshListener) -> RefreshListener:
+        self._listeners.append(listener)
+        return listener
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+        self._fetched = None
+
+    def _fresh(self) -> Optional[CorpusSnapshot]:
+        snap = self._snapshot
+        if snap is not None and time.time() < snap.expires_at:
+            return snap
+        return None
+
+    async def snapshot(self) -> CorpusSnapshot:
+        snap = self._fresh()
+        if snap is not None:
+            return snap
+        return await self.refresh(only_if_stale=True)
+
+    async def refresh(self, only_if_stale: bool = False) -> CorpusSnapshot:
+        """Fetch and rebuild now (listeners see the previous snapshot)."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            snap = self._fresh() if only_if_stale else None
+            if snap is None:  # nobody else refreshed while we waited
+                previous = self._snapshot
+                try:
+                    gigs = await self._fetch()
+                except Exception as e:
+                    if previous is None:
+                        raise
+                    # keep serving the last good snapshot and try again soon
+                    retry = min(self.retry_seconds, self.refresh_seconds)
+                    log_event(
+                        log, "corpus.refresh_failed", logging.WARNING,
+                        error=repr(e), version=previous.version, retry_in=retry,
+                    )
+                    snap = self._snapshot = replace(previous, expires_at=time.time() + retry)
+                    return snap
+                if previous is not None and gigs is self._fetched:
+                    snap = self._snapshot = replace(previous, expires_at=time.time() + self.refresh_seconds)
+                    return snap
+                self._fetched = gigs
+                snap = self.build(gigs)
+                self._snapshot = snap
+                for listener in self._listeners:
+                    listener(previous, snap)
+        return snap
+
+    def build(self, gigs: Sequence[Dict[str, Any]]) -> CorpusSnapshot:
+        index = CorpusIndex(gigs)
+        now = time.time()
+        return CorpusSnapshot(
+            gigs=index.gigs,
+            index=index,
+            version=index.version,
+            fetched_at=now,
+            expires_at=now + self.refresh_seconds,
+            ids=[gig_id(g) for g in index.gigs],
+            positions=range(index.size),
+        )
@@ -0,0 +1,131 @@
+# app/core/dates.py
+
+"""
+Shared date normalization.
+
+Every posting date we see is turned into integer epoch seconds (UTC) once,
+at ingest, and stored as `posted_epoch`; filters and scorers then only
+compare integers.
+
+Supported inputs:
+- epoch seconds or milliseconds (int, float or digit string)
+- ISO-8601 ("2025-10-19", "2025-10-19T08:00:00Z", "...+02:00", fractions)
+- RFC-822 / RSS ("Fri, 17 Oct 2025 14:05:11 +0000", "... GMT")
+- US "10/19/2025"
+- datetime and time.struct_time objects
+
+The format is sniffed from the shape of the string instead of trying every
+strptime pattern, and parsed strings are memoized since feeds repeat them.
+Naive values are treated as UTC. Anything unrecognized becomes None.
+"""
+
+from __future__ import annotations
+
+import calendar
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+# Fields that may carry a posting time, in order of preference
+DATE_FIELDS = (
+    "posted_epoch",
+    "epoch",
+    "posted_at",
+    "published",
+    "date",
+    "created_at",
+    "published_at",
+)
+
+_EPOCH_RE = re.compile(r"^\d{9,13}(?:\.\d+)?$")
+_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+_US_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+
+# Anything above this is taken to be milliseconds (year 5138 in seconds)
+_MS_THRESHOLD = 10**11
+
+
+def _from_number(value: float) -> int:
+    if value > _MS_THRESHOLD:
+        value /= 1000.0
+    return int(value)
+
+
+def _from_datetime(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+@lru_cache(maxsize=8192)
+def _parse_string(text: str) -> Optional[int]:
+    if not text:
+        return None
+    try:
+        if text[0].isdigit():
+            if _EPOCH_RE.match(text):
+                return _from_number(float(text))
+            if _ISO_RE.match(text):
+                return _from_datetime(datetime.fromisoformat(text))
+            m = _US_RE.match(text)
+            if m:
+                month, day, year = (int(g) for g in m.groups())
+                return _from_datetime(datetime(year, month, day))
+        # RFC-822, with or without the weekday
+        return _from_datetime(parsedate_to_datetime(text))
+    except (TypeError, ValueError, OverflowError, IndexError):
+        return None
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """
+    Normalize one date value to epoch seconds (UTC), or None.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return _from_number(float(value)) if value > 0 else None
+    if isinstance(value, datetime):
+        return _from_datetime(value)
+    if isinstance(value, time.struct_time):
+        return calendar.timegm(value)
+    if isinstance(value, str):
+        return _parse_string(value.strip())
+    return None
+
+
+def posted_epoch(gig: Dict[str, Any]) -> Optional[int]:
+    """
+    The gig's posting time in epoch seconds, from the first date field
+    that parses.
+    """
+    for field in DATE_FIELDS:
+        raw = gig.get(field)
+        if raw is None or raw == "":
+            continue
+        epoch = to_epoch(raw)
+        if epoch is not None:
+            return epoch
+    return None
+
+
+def stamp_posted(gigs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Ingest step: set `posted_epoch` (int or None) on every gig, in place.
+    Gigs that already carry an integer epoch are left alone.
+    """
+    out: List[Dict[str, Any]] = []
+    for gig in gigs:
+        if not isinstance(gig.get("posted_epoch"), int):
+            gig["posted_epoch"] = posted_epoch(gig)
+        out.append(gig)
+    return out
+
+
+def cutoff_epoch(days: int, now: Optional[float] = None) -> int:
+    """Epoch seconds `days` days before now."""
+    now = time.time() if now is None else now
+    return int(now) - int(days) * 86400
@@ -0,0 +1,232 @@
+# app/core/dedupe.py
+
+"""
+Near-duplicate detection across sources.
+
+The same job is often posted on RemoteOK and WWR, or reposted under a new
+id with a tweaked description. Exact-key dedupe (app.filters.dedupe_listings)
+misses those, so at ingest every gig gets a MinHash signature of its
+normalized title + company + description, and near-duplicates are found
+without comparing all pairs:
+
+1. shingle the token stream into overlapping word n-grams
+2. one-permutation MinHash: each shingle is hashed once and only lowers the
+   minimum of the bin its hash falls in; empty bins borrow from the next
+   filled bin (densification), so a signature costs O(shingles), not
+   O(shingles x permutations)
+3. LSH banding: the signature is cut into `bands` bands and gigs sharing
+   any band land in the same bucket; only those candidates are compared
+4. candidates whose estimated Jaccard similarity reaches `threshold` are
+   joined with union-find, and each cluster keeps one canonical gig
+
+With b bands of r rows, pairs are likely to become candidates above a
+similarity of roughly (1/b) ** (1/r). The defaults (24 bands x 5 rows) put
+that near 0.53, under the 0.6 verification threshold: pairs at 0.7 become
+candidates ~99% of the time, while unrelated posts sharing boilerplate
+(similarity ~0.15) almost never do. Job posts are
+short, so shingles are word pairs: the cross-posted RemoteOK/WWR copies in
+the fixtures sit around 0.9, unrelated posts below 0.1.
+
+Tokens are hashed with blake2b (memoized per token), not Python's string
+hash, so signatures and clusters are the same in every process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import operator
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_TAG_RE = re.compile(r"<[^>]*>")
+_MASK = (1 << 64) - 1
+_EMPTY = _MASK
+
+Signature = Tuple[int, ...]
+
+_TOKEN_HASHES: Dict[str, int] = {}
+_TOKEN_HASHES_MAX = 1 << 20
+
+
+@dataclass(frozen=True)
+class DedupeConfig:
+    num_perm: int = 120
+    bands: int = 24
+    threshold: float = 0.6
+    shingle_size: int = 2
+    # A bucket this crowded is mostly boilerplate; each member is compared
+    # with at most this many earlier members of it.
+    max_bucket_compare: int = 16
+
+    def __post_init__(self) -> None:
+        # more bands than permutations leaves zero rows per band: every gig
+        # shares every (empty) band and all pairs get compared
+        if not 1 <= self.bands <= self.num_perm:
+            raise ValueError(f"bands must be between 1 and num_perm ({self.num_perm}), got {self.bands}")
+
+    @property
+    def rows(self) -> int:
+        return self.num_perm // self.bands
+
+
+def gig_text(gig: Dict[str, Any]) -> str:
+    """Title, company and description, lowercased with HTML tags removed."""
+    title = gig.get("position") or gig.get("title") or ""
+    description = _TAG_RE.sub(" ", str(gig.get("description") or ""))
+    return f"{title} {gig.get('company') or ''} {description}".lower()
+
+
+def _token_hash(token: str) -> int:
+    h = _TOKEN_HASHES.get(token)
+    if h is None:
+        if len(_TOKEN_HASHES) >= _TOKEN_HASHES_MAX:
+            _TOKEN_HASHES.clear()
+        h = _TOKEN_HASHES[token] = int.from_bytes(
+            hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+    return h
+
+
+def shingles(tokens: Sequence[str], size: int) -> List[int]:
+    # tuples of ints hash the same in every process, unlike strings
+    ids = [_token_hash(t) for t in tokens]
+    if len(ids) < size:
+        return ids
+    return [hash(tuple(ids[i:i + size])) for i in range(len(ids) - size + 1)]
+
+
+def minhash(features: Sequence[int], num_perm: int = 128) -> Signature:
+    """
+    One-permutation MinHash with rotation densification.
+    """
+    mins = [_EMPTY] * num_perm
+    for h in features:
+        h &= _MASK
+        b = h % num_perm
+        v = h // num_perm
+        if v < mins[b]:
+            mins[b] = v
+    if _EMPTY in mins and len(set(mins)) > 1:
+        # Fill each empty bin from the next non-empty bin (circularly); the
+        # offset keeps borrowed values distinct from real ones.
+        filled = [i for i, v in enumerate(mins) if v != _EMPTY]
+        out = list(mins)
+        j = 0
+        for i in range(num_perm):
+            if mins[i] != _EMPTY:
+                continue
+            while j < len(filled) and filled[j] < i:
+                j += 1
+            src = filled[j] if j < len(filled) else filled[0]
+            out[i] = mins[src] + ((src - i) % num_perm) * (_MASK // num_perm + 1)
+        mins = out
+    return tuple(mins)
+
+
+def gig_signature(gig: Dict[str, Any], config: DedupeConfig) -> Optional[Signature]:
+    """None for gigs without any text; those are never treated as duplicates."""
+    tokens = _TOKEN_RE.findall(gig_text(gig))
+    if not tokens:
+        return None
+    return minhash(shingles(tokens, config.shingle_size), config.num_perm)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(map(operator.eq, a, b)) / len(a)
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_clusters(gigs: Sequence[Dict[str, Any]], config: Optional[DedupeConfig] = None) -> List[List[int]]:
+    """
+    Groups of positions in `gigs` that are near-duplicates of each other
+    (singletons included), in order of first appearance.
+    """
+    config = config or DedupeConfig()
+    rows = config.rows
+    signatures = [gig_signature(g, config) for g in gigs]
+    n = len(gigs)
+    uf = _UnionFind(n)
+    cap = config.max_bucket_compare
+    checked: Set[int] = set()  # pairs that share several bands are compared once
+
+    for band in range(config.bands):
+        lo, hi = band * rows, (band + 1) * rows
+        buckets: Dict[Signature, List[int]] = {}
+        for i, sig in enumerate(signatures):
+            if sig is None:
+                continue
+            members = buckets.setdefault(sig[lo:hi], [])
+            for j in members[-cap:]:
+                pair = j * n + i
+                if pair in checked or uf.find(i) == uf.find(j):
+                    continue
+                checked.add(pair)
+                if similarity(sig, signatures[j]) >= config.threshold:
+                    uf.union(i, j)
+            members.append(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(gigs)):
+        clusters.setdefault(uf.find(i), []).append(i)
+    return list(clusters.values())
+
+
+def _canonical_key(gig: Dict[str, Any]) -> Tuple[int, int, str]:
+    # Prefer the newest posting, then the most complete description.
+    epoch = gig.get("posted_epoch")
+    return (
+        -(epoch if isinstance(epoch, int) else 0),
+        -len(gig.get("description") or ""),
+        str(gig.get("id") or gig.get("url") or ""),
+    )
+
+
+def dedupe_near(
+    gigs: Sequence[Dict[str, Any]],
+    config: Optional[DedupeConfig] = None,
+    annotate: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Keep one canonical gig per near-duplicate cluster, at the position of
+    the cluster's first gig. With `annotate`, the kept gig lists the others
+    under "duplicates" (source/id/url).
+    """
+    out: List[Dict[str, Any]] = []
+    for cluster in find_clusters(gigs, config):
+        if len(cluster) == 1:
+            out.append(gigs[cluster[0]])
+            continue
+        members = [gigs[i] for i in cluster]
+        keep = min(members, key=_canonical_key)
+        if annotate:
+            others = [g for g in members if g is not keep]
+            keep = {
+                **keep,
+                "duplicates": [
+                    {"source": g.get("source"), "id": g.get("id"), "url": g.get("url")}
+                    for g in others
+                ],
+            }
+        out.append(keep)
+    return out
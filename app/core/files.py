@@ -0,0 +1,31 @@
+# app/core/files.py
+
+"""
+Small file helpers shared by the snapshot publisher and the CLI seen-set.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+
+def atomic_write(path: Path, chunks: Iterable[bytes]) -> None:
+    """
+    Write `chunks` to a temporary file next to `path`, fsync it and rename
+    it into place: readers see the old file or the new one, never a partial
+    write. If anything fails, the temporary file is removed and `path` is
+    left as it was.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
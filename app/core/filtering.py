@@ -0,0 +1,226 @@
+# app/core/filtering.py
+
+"""
+Single-pass filter chains.
+
+A FilterChain is a conjunction of predicates evaluated listing by listing
+over an iterator: a listing is dropped at the first predicate that rejects
+it, nothing is materialized between stages, and the only state kept is a
+few counters per predicate.
+
+Predicates are ordered by expected cost per rejection, cost / (1 - pass
+rate), so cheap and selective checks (an integer date compare) run before
+expensive ones (substring search over descriptions). The order starts from
+each predicate's prior and is re-derived from measured timings and pass
+rates after the first `calibrate` listings. Because the chain is a pure
+AND, the order never changes which listings pass.
+
+Predicates receive a ListingView, which normalizes each field once per
+listing no matter how many predicates read it.
+
+`query_predicate` is the query filter both filter modules use: each
+listing is matched on its own text, so a chain over a generator stays a
+single lazy pass. A caller that already has a CorpusIndex over the
+listings can pass it, and the query is then resolved once against the
+index instead. Listings are looked up there by (source, id), not by
+object, so an index built over copies of the listings works too; a
+listing the index cannot place is matched on its own text.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.ranking import gig_id
+
+if TYPE_CHECKING:
+    from app.core.index import CorpusIndex
+    from app.core.query import Query
+
+Listing = Dict[str, Any]
+Normalizer = Callable[[Any], str]
+
+
+def lower_or_empty(value: Any) -> str:
+    return (value or "").lower()
+
+
+class ListingView:
+    """
+    A listing plus a per-field cache of normalized text.
+    """
+
+    __slots__ = ("listing", "_normalize", "_fields")
+
+    def __init__(self, listing: Listing, normalize: Normalizer = lower_or_empty):
+        self.listing = listing
+        self._normalize = normalize
+        self._fields: Dict[str, str] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.listing.get(key, default)
+
+    def field(self, key: str) -> str:
+        value = self._fields.get(key)
+        if value is None:
+            value = self._fields[key] = self._normalize(self.listing.get(key, ""))
+        return value
+
+
+@dataclass
+class Predicate:
+    """
+    One filter: `test(view)` returns True to keep the listing.
+
+    `cost` (relative time per call) and `pass_rate` are priors used until
+    the chain has measured them.
+    """
+
+    name: str
+    test: Callable[[ListingView], bool]
+    cost: float = 1.0
+    pass_rate: float = 0.5
+
+    @property
+    def rank(self) -> float:
+        return self.cost / max(1e-6, 1.0 - self.pass_rate)
+
+
+class _Stats:
+    __slots__ = ("calls", "passed", "seconds")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.passed = 0
+        self.seconds = 0.0
+
+
+class FilterChain:
+    """
+    Ordered conjunction of predicates.
+
+        chain = FilterChain([Predicate("remote", is_remote, cost=2)])
+        for listing in chain.stream(listings):
+            ...
+    """
+
+    def __init__(
+        self,
+        predicates: Sequence[Predicate] = (),
+        normalize: Normalizer = lower_or_empty,
+        calibrate: int = 64,
+    ):
+        self.normalize = normalize
+        self.calibrate = calibrate
+        self.predicates: List[Predicate] = sorted(predicates, key=lambda p: p.rank)
+
+    def __len__(self) -> int:
+        return len(self.predicates)
+
+    def accepts(self, listing: Listing) -> bool:
+        view = ListingView(listing, self.normalize)
+        for predicate in self.predicates:
+            if not predicate.test(view):
+                return False
+        return True
+
+    def _reorder(self, stats: Dict[str, _Stats]) -> None:
+        for p in self.predicates:
+            s = stats[p.name]
+            if s.calls:
+                p.cost = s.seconds / s.calls
+                p.pass_rate = s.passed / s.calls
+        self.predicates.sort(key=lambda p: p.rank)
+
+    def stream(self, listings: Iterable[Listing]) -> Iterator[Listing]:
+        """
+        Lazily yield the listings that pass every predicate.
+        """
+        if not self.predicates:
+            yield from listings
+            return
+
+        it = iter(listings)
+        normalize = self.normalize
+
+        # Measure the first few listings, then settle on an order.
+        if self.calibrate > 0:
+            stats = {p.name: _Stats() for p in self.predicates}
+            clock = time.perf_counter
+            seen = 0
+            for listing in it:
+                view = ListingView(listing, normalize)
+                keep = True
+                for predicate in self.predicates:
+                    s = stats[predicate.name]
+                    start = clock()
+                    ok = predicate.test(view)
+                    s.seconds += clock() - start
+                    s.calls += 1
+                    if not ok:
+                        keep = False
+                        break
+                    s.passed += 1
+                if keep:
+                    yield listing
+                seen += 1
+                if seen >= self.calibrate:
+                    break
+            self._reorder(stats)
+
+        tests = [p.test for p in self.predicates]
+        for listing in it:
+            view = ListingView(listing, normalize)
+            for test in tests:
+                if not test(view):
+                    break
+            else:
+                yield listing
+
+    def apply(self, listings: Iterable[Listing]) -> List[Listing]:
+        return list(self.stream(listings))
+
+
+def query_predicate(query: "Query", index: Optional["CorpusIndex"] = None) -> Optional[Predicate]:
+    """
+    Filter for a parsed query (app.core.query); None when it is empty.
+    `index`, if given, must cover the listings the chain will see.
+    """
+    if query.empty:
+        return None
+    if index is None:
+        def test(view: ListingView) -> bool:
+            return query.matches(view.listing)
+
+        return Predicate("query", test, cost=4.0, pass_rate=0.3)
+
+    # Resolved once against the index; per listing it is a dict lookup.
+    hits = query.search(index)
+    positions: Dict[Tuple[Any, str], Optional[int]] = {}
+    for i, gig in enumerate(index.gigs):
+        key = _listing_key(gig)
+        if key[1]:
+            positions[key] = None if key in positions else i  # None: ambiguous
+
+    def indexed(view: ListingView) -> bool:
+        pos = positions.get(_listing_key(view.listing))
+        if pos is None:
+            return query.matches(view.listing)
+        return pos in hits
+
+    return Predicate("query", indexed, cost=0.5, pass_rate=len(hits) / max(1, index.size))
+
+
+def _listing_key(listing: Listing) -> Tuple[Any, str]:
+    return (listing.get("source"), gig_id(listing))
+
+
+def compile_chain(
+    predicates: Iterable[Optional[Predicate]],
+    normalize: Normalizer = lower_or_empty,
+    calibrate: int = 64,
+) -> FilterChain:
+    """Build a chain, skipping filters that were not requested (None)."""
+    return FilterChain([p for p in predicates if p is not None], normalize=normalize, calibrate=calibrate)
@@ -0,0 +1,263 @@
+# app/core/index.py
+
+"""
+Inverted index over a gig corpus.
+
+Every text component of a gig (title, description, ...) is tokenized once
+into a token -> posting list map; the field views from `gig_fields` are
+unions of those components. A scoring term is then resolved to the gigs that contain it by
+looking at the (much smaller) vocabulary instead of re-scanning every gig's
+text, and the result is cached so many profiles can share it.
+
+Terms keep the substring semantics of `score_gig`: "email" still matches
+"emails", and multi-word terms are verified against the candidate gigs only.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, MutableSequence, Sequence, Set, Tuple
+
+from app.core.plan import FIELD_VIEWS, Clause, ScoringPlan, gig_components
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class CorpusIndex:
+    """
+    Token -> posting list index for a fixed list of gigs.
+
+    Posting lists are sorted lists of positions in `gigs`. A read-only
+    sequence (such as app.core.shared.MappedGigs) is used as is; lists and
+    other iterables are copied.
+    """
+
+    def __init__(self, gigs: Iterable[Dict[str, Any]]):
+        self.gigs: Sequence[Dict[str, Any]] = (
+            gigs if isinstance(gigs, Sequence) and not isinstance(gigs, MutableSequence) else list(gigs)
+        )
+        self.size = len(self.gigs)
+        self._parts: Dict[str, List[str]] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+
+        for i, gig in enumerate(self.gigs):
+            for component, value in gig_components(gig).items():
+                self._parts.setdefault(component, []).append(value)
+                postings = self._postings.setdefault(component, {})
+                for tok in set(_TOKEN_RE.findall(value)):
+                    plist = postings.get(tok)
+                    if plist is None:
+                        postings[tok] = [i]
+                    else:
+                        plist.append(i)
+
+        self._vocab_cache: Dict[Tuple[str, str], List[str]] = {}
+        self._term_cache: Dict[Tuple[str, str], Set[int]] = {}
+        self._clause_cache: Dict[Tuple[Any, ...], Set[int]] = {}
+        self._token_cache: Dict[Tuple[str, str, bool, bool], Set[int]] = {}
+        self._sorted_vocab: Dict[str, List[str]] = {}
+        # Vectorized view of the same corpus (app.core.matrix), built on demand.
+        self.matrix: Any = None
+        self._version: str | None = None
+
+    @property
+    def version(self) -> str:
+        """Content hash of the corpus; changes whenever any gig changes."""
+        if self._version is None:
+            digest = hashlib.sha1()
+            for gig in self.gigs:
+                digest.update(json.dumps(gig, sort_keys=True, default=str).encode("utf-8"))
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+    # -----------------------------
+    # Term resolution
+    # -----------------------------
+    def _vocab_containing(self, component: str, fragment: str) -> List[str]:
+        key = (component, fragment)
+        hit = self._vocab_cache.get(key)
+        if hit is None:
+            hit = [tok for tok in self._postings.get(component, {}) if fragment in tok]
+            self._vocab_cache[key] = hit
+        return hit
+
+    def _docs_with_fragment(self, field: str, fragment: str) -> Set[int]:
+        docs: Set[int] = set()
+        for component in FIELD_VIEWS[field][0]:
+            postings = self._postings.get(component, {})
+            for tok in self._vocab_containing(component, fragment):
+                docs.update(postings[tok])
+        return docs
+
+    def text(self, field: str, i: int) -> str:
+        """The `field` view of gig `i`, as produced by gig_fields."""
+        components, sep = FIELD_VIEWS[field]
+        return sep.join(self._parts[c][i] for c in components)
+
+    def docs(self, field: str, term: str) -> Set[int]:
+        """
+        Positions of the gigs whose `field` contains `term` as a substring.
+        """
+        key = (field, term)
+        hit = self._term_cache.get(key)
+        if hit is not None:
+            return hit
+
+        fragments = _TOKEN_RE.findall(term)
+        if fragments == [term]:
+            # A bare token can only occur inside a single token of one
+            # component, so the vocabulary lookup is exact.
+            hit = self._docs_with_fragment(field, term)
+        else:
+            if fragments:
+                candidates = self._docs_with_fragment(field, fragments[0])
+                for fragment in fragments[1:]:
+                    if not candidates:
+                        break
+                    candidates &= self._docs_with_fragment(field, fragment)
+            else:
+                candidates = set(range(self.size))
+            hit = {i for i in candidates if term in self.text(field, i)}
+
+        self._term_cache[key] = hit
+        return hit
+
+    # -----------------------------
+    # Whole-token lookups (query language)
+    # -----------------------------
+    def component_text(self, component: str, i: int) -> str:
+        return self._parts[component][i]
+
+    def token_docs(self, component: str, token: str, prefix: bool = False, substring: bool = False) -> Set[int]:
+        """
+        Gigs whose `component` contains `token` as a whole token, or any
+        token starting with it when `prefix` is set, or containing it when
+        `substring` is set.
+        """
+        key = (component, token, prefix, substring)
+        hit = self._token_cache.get(key)
+        if hit is not None:
+            return hit
+
+        postings = self._postings.get(component, {})
+        if substring:
+            hit = set()
+            for tok in self._vocab_containing(component, token):
+                hit.update(postings[tok])
+        elif not prefix:
+            hit = set(postings.get(token, ()))
+        else:
+            vocab = self._sorted_vocab.get(component)
+            if vocab is None:
+                vocab = self._sorted_vocab[component] = sorted(postings)
+            hit = set()
+            for k in range(bisect.bisect_left(vocab, token), len(vocab)):
+                if not vocab[k].startswith(token):
+                    break
+                hit.update(postings[vocab[k]])
+
+        self._token_cache[key] = hit
+        return hit
+
+    def docs_any(self, field: str, terms: Iterable[str]) -> Set[int]:
+        docs: Set[int] = set()
+        for term in terms:
+            docs |= self.docs(field, term)
+        return docs
+
+    def docs_all(self, field: str, terms: Iterable[str]) -> Set[int]:
+        docs: Set[int] | None = None
+        for term in terms:
+            docs = set(self.docs(field, term)) if docs is None else docs & self.docs(field, term)
+            if not docs:
+                break
+        return docs if docs is not None else set(range(self.size))
+
+    # -----------------------------
+    # Scoring
+    # -----------------------------
+    def _clause_hits(self, clause: Clause) -> Set[int]:
+        """
+        Gigs a clause touches. For "missing" clauses this is the complement:
+        the gigs that have every term (or an `unless` term) and therefore do
+        NOT get the weight.
+        """
+        key = clause.key
+        hit = self._clause_cache.get(key)
+        if hit is not None:
+            return hit
+
+        unless = self.docs_any(clause.field, clause.unless) if clause.unless else set()
+        if clause.mode == "missing":
+            hit = self.docs_all(clause.field, clause.terms) | unless
+        else:
+            hit = self.docs_any(clause.field, clause.terms) - unless
+
+        self._clause_cache[key] = hit
+        return hit
+
+    def _add_clauses(self, scores: List[float], clauses: Iterable[Clause]) -> None:
+        for clause in clauses:
+            weight = -clause.weight if clause.mode == "missing" else clause.weight
+            for i in self._clause_hits(clause):
+                scores[i] += weight
+
+    def score(self, plan: ScoringPlan) -> List[float]:
+        """
+        Scores for every gig in the corpus, identical to evaluating `plan`
+        gig by gig. Work is proportional to the number of rule hits.
+        """
+        offset = sum(c.weight for c in plan.clauses if c.mode == "missing")
+        scores = [0.0 + offset] * self.size
+        self._add_clauses(scores, plan.clauses)
+        return scores
+
+    def score_many(self, plans: Iterable[ScoringPlan]) -> Dict[str, List[float]]:
+        """
+        Score several profiles against the same corpus. Term and rule hits
+        are shared, and the rules every plan has (e.g. the base heuristics)
+        are added up once into a base vector that each plan starts from, so
+        a plan only costs the hits of its own rules.
+        """
+        plans = list(plans)
+        if len(plans) < 2:
+            return {plan.name: self.score(plan) for plan in plans}
+
+        def rule(c: Clause) -> Tuple[Any, ...]:
+            return (c.weight,) + c.key
+
+        common = Counter(rule(c) for c in plans[0].clauses)
+        for plan in plans[1:]:
+            common &= Counter(rule(c) for c in plan.clauses)
+
+        shared: List[Clause] = []
+        pending = Counter(common)
+        for c in plans[0].clauses:
+            if pending[rule(c)] > 0:
+                pending[rule(c)] -= 1
+                shared.append(c)
+        base = [0.0] * self.size
+        self._add_clauses(base, shared)
+
+        out: Dict[str, List[float]] = {}
+        for plan in plans:
+            pending = Counter(common)
+            own: List[Clause] = []
+            for c in plan.clauses:
+                if pending[rule(c)] > 0:
+                    pending[rule(c)] -= 1
+                else:
+                    own.append(c)
+            offset = sum(c.weight for c in plan.clauses if c.mode == "missing")
+            scores = [s + offset for s in base] if offset else list(base)
+            self._add_clauses(scores, own)
+            out[plan.name] = scores
+        return out
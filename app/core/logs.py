@@ -0,0 +1,151 @@
+# app/core/logs.py
+
+"""
+Structured, sampled, non-blocking logging.
+
+    log = get_logger(__name__)
+    log_event(log, "search.request", profile=fp, limit=10)
+
+Records are plain stdlib logging records with their structured fields in
+`record.fields`. `configure_logging()` puts a QueueHandler on the
+"gig_agent" logger, so a request only appends the record to an in-memory
+queue; a QueueListener thread formats it (one JSON object per line, or
+plain text for the CLI) and does the actual write.
+
+Hot-path messages can be sampled per message name: with
+GA_LOG_SAMPLE="search.request=0.01", one in a hundred "search.request"
+records is kept (a rate of 0 drops the message). Sampling is a counter,
+not a coin flip, so the first record of a sampled message gets through;
+warnings and errors are never sampled.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any, Dict, Mapping, Optional
+
+ROOT = "gig_agent"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """A logger under the "gig_agent" hierarchy (module names are fine)."""
+    return logging.getLogger(name if name.startswith(ROOT) else f"{ROOT}.{name}")
+
+
+def log_event(logger: logging.Logger, message: str, level: int = logging.INFO, **fields: Any) -> None:
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields})
+
+
+def parse_sample_rates(raw: str) -> Dict[str, float]:
+    """ "search.request=0.01,corpus.filtered=0.1" -> {message: keep rate} """
+    rates: Dict[str, float] = {}
+    for part in raw.split(","):
+        name, sep, rate = part.partition("=")
+        if sep and name.strip():
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps every Nth record of each sampled message (N = 1 / rate)."""
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        # rate 0 drops the message entirely
+        self.every = {name: (0 if rate <= 0 else round(1 / rate)) for name, rate in rates.items()}
+        self._seen: Dict[str, int] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        every = self.every.get(record.msg) if isinstance(record.msg, str) else None
+        if every is None or every == 1:
+            return True
+        seen = self._seen.get(record.msg, 0)
+        self._seen[record.msg] = seen + 1
+        if every and seen % every == 0:
+            return True
+        self.dropped += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = record.getMessage()
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.levelno >= logging.WARNING:
+            line = f"[{record.levelname.lower()}] {line}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str = "json",
+    sample: str = "",
+    stream=None,
+) -> logging.Logger:
+    """
+    Route "gig_agent" records through a queue to a background writer.
+    Calling it again replaces the previous configuration.
+    """
+    global _listener
+    shutdown_logging()
+
+    root = logging.getLogger(ROOT)
+    root.setLevel(level.upper())
+    root.propagate = False
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for f in list(root.filters):
+        root.removeFilter(f)
+
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = logging.handlers.QueueHandler(records)
+    rates = parse_sample_rates(sample)
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+    root.addHandler(handler)
+
+    _listener = logging.handlers.QueueListener(records, writer)
+    _listener.start()
+    return root
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
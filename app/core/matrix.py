@@ -0,0 +1,225 @@
+# app/core/matrix.py
+
+"""
+Optional vectorized scoring engine.
+
+Keeps a sparse gig x term occurrence matrix in CSR form (plain NumPy arrays)
+built from a CorpusIndex. A compiled plan becomes a weight vector for its
+single-term rules (nice-to-have +3, avoid -10, title +8, ...) plus a few
+masks for the rules that are not linear (must-have, "any of" groups,
+`unless` suppressions), and every score is computed with matrix-vector
+products instead of a Python loop over gigs.
+
+NumPy is optional and only imported once the numpy engine is asked for;
+use `numpy_available()` before constructing a TermMatrix.
+
+A TermMatrix is shared by every search on its corpus snapshot, and those
+score in threads. Adding columns is copy-on-write: new arrays are built
+under a lock and published in one assignment, and a scoring call works on
+the state it read once, so it never sees arrays from two builds.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from app.core.index import CorpusIndex
+from app.core.plan import Clause, ScoringPlan
+
+np = None  # numpy, once _load_numpy() has run
+_numpy_missing = False
+
+Column = Tuple[str, str]  # (field, term)
+
+
+def _load_numpy():
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+        except ImportError:  # optional dependency
+            _numpy_missing = True
+        else:
+            np = numpy
+    return np
+
+
+def numpy_available() -> bool:
+    return _load_numpy() is not None
+
+
+def _plan_columns(plans: Iterable[ScoringPlan]) -> List[Column]:
+    cols: List[Column] = []
+    for plan in plans:
+        for clause in plan.clauses:
+            for term in clause.terms + clause.unless:
+                cols.append((clause.field, term))
+    return cols
+
+
+class _CSR(NamedTuple):
+    """One published generation of the matrix; never mutated."""
+
+    columns: Dict[Column, int]
+    col_rows: Tuple["np.ndarray", ...]
+    rows: "np.ndarray"
+    indices: "np.ndarray"
+    indptr: "np.ndarray"
+
+
+class TermMatrix:
+    """
+    CSR occurrence matrix: row = gig, column = (field, term), value = 1.
+    """
+
+    def __init__(self, index: CorpusIndex, columns: Iterable[Column] = ()):
+        if _load_numpy() is None:
+            raise RuntimeError("TermMatrix requires numpy (pip install numpy)")
+        self.index = index
+        self._lock = threading.Lock()
+        self._csr = _CSR(
+            {},
+            (),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(index.size + 1, dtype=np.int64),
+        )
+        self.add_columns(columns)
+
+    @classmethod
+    def for_plans(cls, index: CorpusIndex, plans: Sequence[ScoringPlan]) -> "TermMatrix":
+        return cls(index, _plan_columns(plans))
+
+    @property
+    def columns(self) -> Dict[Column, int]:
+        return self._csr.columns
+
+    @property
+    def indices(self) -> "np.ndarray":
+        return self._csr.indices
+
+    @property
+    def indptr(self) -> "np.ndarray":
+        return self._csr.indptr
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.index.size, len(self.columns))
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.shape[0])
+
+    def add_columns(self, columns: Iterable[Column]) -> _CSR:
+        """
+        Register new (field, term) columns and rebuild the CSR arrays.
+        Columns that already exist are ignored. Returns the generation that
+        has all of them.
+        """
+        columns = list(columns)
+        csr = self._csr
+        if all(col in csr.columns for col in columns):
+            return csr
+        with self._lock:
+            csr = self._csr  # another thread may have added them meanwhile
+            mapping = dict(csr.columns)
+            col_rows = list(csr.col_rows)
+            for col in columns:
+                if col in mapping:
+                    continue
+                mapping[col] = len(mapping)
+                docs = self.index.docs(*col)
+                col_rows.append(np.fromiter(docs, dtype=np.int32, count=len(docs)))
+            if len(mapping) > len(csr.columns):
+                csr = self._csr = self._build(mapping, tuple(col_rows))
+        return csr
+
+    def _build(self, mapping: Dict[Column, int], col_rows: Tuple["np.ndarray", ...]) -> _CSR:
+        lengths = [len(r) for r in col_rows]
+        rows = np.concatenate(col_rows)
+        cols = np.repeat(np.arange(len(col_rows), dtype=np.int32), lengths)
+        order = np.lexsort((cols, rows))
+        rows = rows[order]
+        counts = np.bincount(rows, minlength=self.index.size)
+        indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        return _CSR(mapping, col_rows, rows, cols[order], indptr)
+
+    # -----------------------------
+    # Linear algebra
+    # -----------------------------
+    def matvec(self, vector: "np.ndarray", csr: "_CSR | None" = None) -> "np.ndarray":
+        """M @ vector for a dense vector over the columns of `csr` (default: current)."""
+        csr = self._csr if csr is None else csr
+        if not csr.indices.shape[0]:
+            return np.zeros(self.index.size, dtype=np.float64)
+        return np.bincount(csr.rows, weights=vector[csr.indices], minlength=self.index.size)
+
+    @staticmethod
+    def _indicator(csr: _CSR, field: str, terms: Iterable[str]) -> "np.ndarray":
+        vec = np.zeros(len(csr.columns), dtype=np.float64)
+        for term in terms:
+            vec[csr.columns[(field, term)]] = 1.0
+        return vec
+
+    @staticmethod
+    def _weights(csr: _CSR, clauses: Sequence[Clause]) -> "np.ndarray":
+        vec = np.zeros(len(csr.columns), dtype=np.float64)
+        for clause in clauses:
+            vec[csr.columns[(clause.field, clause.terms[0])]] += clause.weight
+        return vec
+
+    # -----------------------------
+    # Scoring
+    # -----------------------------
+    def score(self, plan: ScoringPlan) -> "np.ndarray":
+        """
+        Scores for every gig; identical to CorpusIndex.score / score_gig.
+        """
+        csr = self.add_columns(_plan_columns([plan]))
+
+        linear: List[Clause] = []
+        masked: List[Clause] = []
+        for c in plan.clauses:
+            if c.mode == "any" and not c.unless and len(c.terms) == 1:
+                linear.append(c)
+            else:
+                masked.append(c)
+
+        scores = self.matvec(self._weights(csr, linear), csr) if linear else np.zeros(self.index.size)
+
+        for clause in masked:
+            unique = set(clause.terms)
+            present = self.matvec(self._indicator(csr, clause.field, unique), csr)
+            if clause.mode == "missing":
+                fires = present < len(unique)
+            else:
+                fires = present > 0
+            if clause.unless:
+                fires &= self.matvec(self._indicator(csr, clause.field, set(clause.unless)), csr) == 0
+            scores += clause.weight * fires
+
+        return scores
+
+    def score_many(self, plans: Sequence[ScoringPlan]) -> Dict[str, "np.ndarray"]:
+        self.add_columns(_plan_columns(plans))
+        return {plan.name: self.score(plan) for plan in plans}
+
+
+_MATRIX_LOCK = threading.Lock()
+
+
+def score_plans(index: CorpusIndex, plans: Sequence[ScoringPlan], engine: str = "index") -> Dict[str, List[float]]:
+    """
+    Score plans with the requested engine ("index" or "numpy"). Falls back
+    to the inverted index when NumPy is not installed.
+    """
+    if engine == "numpy" and numpy_available():
+        matrix = index.matrix
+        if matrix is None:
+            with _MATRIX_LOCK:  # one matrix per index, however many threads ask
+                if index.matrix is None:
+                    index.matrix = TermMatrix.for_plans(index, plans)
+                matrix = index.matrix
+        return {name: scores.tolist() for name, scores in matrix.score_many(plans).items()}
+    return index.score_many(plans)
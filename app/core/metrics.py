@@ -0,0 +1,222 @@
+# app/core/metrics.py
+
+"""
+In-process metrics in the Prometheus text exposition format (0.0.4).
+
+    SEARCHES = METRICS.counter("ga_searches_total", "Searches served", ["served_from"])
+    SEARCHES.inc(served_from="ranking_cache")
+
+    with STAGE_SECONDS.time(stage="score"):
+        ...
+
+    METRICS.render()  # body for GET /metrics
+
+Counters, gauges and histograms are kept per label set in plain dicts;
+updates happen on the event loop, so there is no locking. Values that
+other components already count (cache hit counters, admission state) are
+read at render time through `METRICS.callback(...)` instead of being
+mirrored on every request.
+
+Each process keeps its own numbers; with several workers, scrape each one
+or aggregate in Prometheus.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds; request stages run from well under a millisecond to upstream fetches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def lines(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def lines(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(self.label_names, key)} {_number(v)}"
+            for key, v in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket..., count above the last, sum, count]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def lines(self) -> List[str]:
+        out: List[str] = []
+        for key, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (math.inf,), series[:-2]):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                out.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {_number(cumulative)}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(series[-2])}")
+            out.append(f"{self.name}_count{_labels(self.label_names, key)} {_number(series[-1])}")
+        return out
+
+
+class _Callback(_Metric):
+    def __init__(self, name: str, help: str, kind: str, fn: Callable[[], Iterable[Sample]]):
+        super().__init__(name, help)
+        self.kind = kind
+        self.fn = fn
+
+    def lines(self) -> List[str]:
+        out = []
+        for labels, value in self.fn():
+            out.append(f"{self.name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+        return out
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"{metric.name} is already registered as a {existing.kind}")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))  # type: ignore[return-value]
+
+    def callback(self, name: str, help: str, kind: str, fn: Callable[[], Iterable[Sample]]) -> None:
+        """A metric whose samples, ({label: value}, number) pairs, are read at render time."""
+        self._metrics[name] = _Callback(name, help, kind, fn)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Registry()
+
+# -----------------------------
+# Shared request-path metrics
+# -----------------------------
+STAGE_SECONDS = METRICS.histogram(
+    "ga_stage_duration_seconds",
+    "Time spent per search pipeline stage (filter, score, sort, serialize, dedupe)",
+    ["stage"],
+)
+FETCH_SECONDS = METRICS.histogram(
+    "ga_fetch_duration_seconds",
+    "Upstream fetch time per source",
+    ["source"],
+)
+UPSTREAM_ERRORS = METRICS.counter(
+    "ga_upstream_errors_total",
+    "Failed upstream fetches per source",
+    ["source"],
+)
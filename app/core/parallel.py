@@ -0,0 +1,267 @@
+# app/core/parallel.py
+
+"""
+Parallel scoring over a process pool.
+
+Scoring is pure Python, so one process only ever uses one core. The
+ParallelScorer splits a corpus into contiguous shards and scores them in a
+pool of worker processes:
+
+- compiled plans are installed once per worker by the pool initializer and
+  referenced by fingerprint afterwards; a plan the pool was not started with
+  (e.g. a one-off search profile) travels with each task instead
+- only the fields the rules read are sent to the workers, not whole gigs
+- `top_k` has every shard return its own k best, and the sorted shard lists
+  are merged k-way in the parent
+
+Corpora smaller than `min_parallel` are scored in-process, where the pool
+overhead would dominate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.index import CorpusIndex
+from app.core.matrix import score_plans
+from app.core.plan import ScoringPlan, evaluate
+from app.core.ranking import gig_id
+
+# Everything a scoring rule can read from a gig (see plan.gig_components),
+# plus what ties are broken on.
+SCORING_KEYS: Tuple[str, ...] = ("id", "url", "position", "title", "description", "location")
+
+PARALLEL_MIN_GIGS = 5000
+
+# (negated score, gig id, position) - ascending order is rank order
+ShardHit = Tuple[float, str, int]
+PlanRef = Tuple[str, str, Optional[ScoringPlan]]  # (name, fingerprint, plan if not installed)
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def slim_gig(gig: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: gig[k] for k in SCORING_KEYS if k in gig}
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+_WORKER_PLANS: Dict[str, ScoringPlan] = {}
+_WORKER_ENGINE = "index"
+
+
+def _init_worker(plans: Sequence[ScoringPlan], engine: str) -> None:
+    global _WORKER_ENGINE
+    _WORKER_PLANS.clear()
+    _WORKER_PLANS.update((p.fingerprint, p) for p in plans)
+    _WORKER_ENGINE = engine
+
+
+def _resolve(refs: Sequence[PlanRef]) -> List[ScoringPlan]:
+    plans: List[ScoringPlan] = []
+    for name, fingerprint, plan in refs:
+        plan = plan or _WORKER_PLANS[fingerprint]
+        if plan.name != name:
+            plan = ScoringPlan(name=name, clauses=plan.clauses)
+        plans.append(plan)
+    return plans
+
+
+def _score_local(gigs: Sequence[Dict[str, Any]], plans: Sequence[ScoringPlan], engine: str) -> Dict[str, List[float]]:
+    # One plan: a straight loop beats building an index for the shard.
+    if len(plans) == 1:
+        plan = plans[0]
+        return {plan.name: [evaluate(plan, g) for g in gigs]}
+    return score_plans(CorpusIndex(gigs), plans, engine=engine)
+
+
+def _score_shard(gigs: Sequence[Dict[str, Any]], refs: Sequence[PlanRef]) -> Dict[str, List[float]]:
+    return _score_local(gigs, _resolve(refs), _WORKER_ENGINE)
+
+
+def _shard_top_k(hits: Dict[str, List[float]], gigs: Sequence[Dict[str, Any]], start: int, k: int) -> Dict[str, List[ShardHit]]:
+    ids = [gig_id(g) for g in gigs]
+    return {
+        name: heapq.nsmallest(k, ((-s, ids[i], start + i) for i, s in enumerate(scores)))
+        for name, scores in hits.items()
+    }
+
+
+def _top_k_shard(gigs: Sequence[Dict[str, Any]], start: int, refs: Sequence[PlanRef], k: int) -> Dict[str, List[ShardHit]]:
+    return _shard_top_k(_score_shard(gigs, refs), gigs, start, k)
+
+
+# -----------------------------
+# Parent side
+# -----------------------------
+class ParallelScorer:
+    """
+    Shards scoring work across a lazily started process pool.
+
+        scorer = ParallelScorer(plans, workers=4)
+        scores = scorer.score(gigs)           # {plan name: [score per gig]}
+        best = scorer.top_k(gigs, k=10)       # {plan name: [(position, score)]}
+        scorer.close()
+    """
+
+    def __init__(
+        self,
+        plans: Sequence[ScoringPlan] = (),
+        workers: Optional[int] = None,
+        min_parallel: int = PARALLEL_MIN_GIGS,
+        engine: str = "index",
+    ):
+        self.plans: List[ScoringPlan] = list(plans)
+        self.workers = max(1, workers or default_workers())
+        self.min_parallel = min_parallel
+        self.engine = engine
+        self._installed = {p.fingerprint for p in self.plans}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelScorer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def install(self, plans: Sequence[ScoringPlan]) -> None:
+        """Set the plans every worker preloads; only before the pool starts."""
+        if self._pool is not None:
+            raise RuntimeError("plans must be installed before the worker pool starts")
+        self.plans = list(plans)
+        self._installed = {p.fingerprint for p in self.plans}
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _parallel(self, n: int) -> bool:
+        return self.workers > 1 and n >= self.min_parallel
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.plans, self.engine),
+            )
+        return self._pool
+
+    def _refs(self, plans: Sequence[ScoringPlan]) -> List[PlanRef]:
+        return [
+            (p.name, p.fingerprint, None if p.fingerprint in self._installed else p)
+            for p in plans
+        ]
+
+    def _shards(self, gigs: Sequence[Dict[str, Any]]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        # A few shards per worker evens out uneven description lengths.
+        n = len(gigs)
+        count = min(n, self.workers * 4)
+        size = -(-n // count)
+        return [(start, [slim_gig(g) for g in gigs[start:start + size]]) for start in range(0, n, size)]
+
+    # --- full score vectors --------------------------------------------------
+
+    def _submit_score(self, gigs: Sequence[Dict[str, Any]], plans: Sequence[ScoringPlan]) -> List[Future]:
+        refs = self._refs(plans)
+        pool = self._executor()
+        return [pool.submit(_score_shard, shard, refs) for _, shard in self._shards(gigs)]
+
+    @staticmethod
+    def _concat(parts: Sequence[Dict[str, List[float]]], plans: Sequence[ScoringPlan]) -> Dict[str, List[float]]:
+        out: Dict[str, List[float]] = {p.name: [] for p in plans}
+        for part in parts:
+            for name, scores in part.items():
+                out[name].extend(scores)
+        return out
+
+    def score(
+        self,
+        gigs: Sequence[Dict[str, Any]],
+        plans: Optional[Sequence[ScoringPlan]] = None,
+        index: Optional[CorpusIndex] = None,
+    ) -> Dict[str, List[float]]:
+        """
+        Score every gig with every plan; same result as app.core.matrix.score_plans.
+        `index` is used for the in-process path when the caller already has one.
+        """
+        plans = self.plans if plans is None else plans
+        if not self._parallel(len(gigs)):
+            if index is not None:
+                return score_plans(index, plans, engine=self.engine)
+            return _score_local(gigs, plans, self.engine)
+        futures = self._submit_score(gigs, plans)
+        return self._concat([f.result() for f in futures], plans)
+
+    async def score_async(
+        self,
+        gigs: Sequence[Dict[str, Any]],
+        plans: Optional[Sequence[ScoringPlan]] = None,
+        index: Optional[CorpusIndex] = None,
+    ) -> Dict[str, List[float]]:
+        """
+        score() that leaves the event loop free: the worker pool for large
+        corpora, a thread for the in-process path (so concurrent requests
+        really overlap, and admission control sees them in flight).
+        """
+        plans = self.plans if plans is None else plans
+        if not self._parallel(len(gigs)):
+            return await asyncio.to_thread(self.score, gigs, plans, index=index)
+        futures = self._submit_score(gigs, plans)
+        parts = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+        return self._concat(parts, plans)
+
+    # --- top-k ---------------------------------------------------------------
+
+    def _submit_top_k(self, gigs: Sequence[Dict[str, Any]], k: int, plans: Sequence[ScoringPlan]) -> List[Future]:
+        refs = self._refs(plans)
+        pool = self._executor()
+        return [pool.submit(_top_k_shard, shard, start, refs, k) for start, shard in self._shards(gigs)]
+
+    @staticmethod
+    def _merge(parts: Sequence[Dict[str, List[ShardHit]]], k: int, plans: Sequence[ScoringPlan]) -> Dict[str, List[Tuple[int, float]]]:
+        return {
+            p.name: [(pos, -neg) for neg, _, pos in islice(heapq.merge(*(part[p.name] for part in parts)), k)]
+            for p in plans
+        }
+
+    def top_k(
+        self,
+        gigs: Sequence[Dict[str, Any]],
+        k: int,
+        plans: Optional[Sequence[ScoringPlan]] = None,
+    ) -> Dict[str, List[Tuple[int, float]]]:
+        """
+        The k best gigs per plan as (position in `gigs`, score), in rank
+        order (score desc, id asc).
+        """
+        plans = self.plans if plans is None else plans
+        if k <= 0 or not gigs:
+            return {p.name: [] for p in plans}
+        if not self._parallel(len(gigs)):
+            hits = _shard_top_k(_score_local(gigs, plans, self.engine), gigs, 0, k)
+            return self._merge([hits], k, plans)
+        futures = self._submit_top_k(gigs, k, plans)
+        return self._merge([f.result() for f in futures], k, plans)
+
+    async def top_k_async(
+        self,
+        gigs: Sequence[Dict[str, Any]],
+        k: int,
+        plans: Optional[Sequence[ScoringPlan]] = None,
+    ) -> Dict[str, List[Tuple[int, float]]]:
+        plans = self.plans if plans is None else plans
+        if k <= 0 or not gigs or not self._parallel(len(gigs)):
+            return self.top_k(gigs, k, plans)
+        futures = self._submit_top_k(gigs, k, plans)
+        parts = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+        return self._merge(parts, k, plans)
@@ -0,0 +1,247 @@
+# app/core/percolator.py
+
+"""
+Saved-search percolation.
+
+Instead of running every saved search against the corpus on every poll,
+the searches themselves are indexed and each newly ingested gig is run
+against the searches it can possibly match:
+
+1. every saved search contributes its trigger terms: the terms of its
+   positive, profile-specific rules (keywords, nice-to-haves, titles,
+   locations, seniority) and its must-have terms; the generic heuristics
+   every plan shares are never triggers
+2. each trigger term is filed under one of its character trigrams, the
+   rarest one seen in the gigs observed so far (terms shorter than three
+   characters are checked for every gig)
+3. a gig's trigrams select the candidate searches; a candidate matches when
+   one of its trigger rules really fires, no disqualifier occurs, and the
+   full plan scores at least its `min_score`
+
+Matching is substring based, like scoring, so a trigram of the term always
+occurs in a gig that contains the term. Cost per gig is its own trigram
+set plus the candidate searches, independent of how many searches exist.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.plan import BASE_CLAUSES, Clause, ScoringPlan, evaluate, gig_fields
+
+_BASE_KINDS = {c.kind for c in BASE_CLAUSES}
+
+
+@dataclass(frozen=True)
+class SavedSearch:
+    id: str
+    plan: ScoringPlan
+    disqualifiers: Tuple[str, ...] = ()
+    min_score: float = 0.0
+
+
+@dataclass(frozen=True)
+class PercolatorMatch:
+    search_id: str
+    gig: Dict[str, Any]
+    score: float
+
+
+def trigger_clauses(plan: ScoringPlan) -> List[Clause]:
+    """Rules whose terms must occur for the plan to care about a gig."""
+    return [
+        c for c in plan.clauses
+        if c.kind not in _BASE_KINDS
+        and ((c.mode == "any" and c.weight > 0) or (c.mode == "missing" and c.weight < 0))
+    ]
+
+
+def _trigger_fires(clause: Clause, fields: Dict[str, str]) -> bool:
+    value = fields[clause.field]
+    if clause.mode == "missing":  # must-have: triggered once all terms are there
+        return all(t in value for t in clause.terms)
+    if clause.unless and any(t in value for t in clause.unless):
+        return False
+    return any(t in value for t in clause.terms)
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _gig_trigrams(fields: Dict[str, str]) -> Set[str]:
+    grams: Set[str] = set()
+    for value in set(fields.values()):
+        grams |= trigrams(value)
+    return grams
+
+
+@dataclass
+class _Entry:
+    search: SavedSearch
+    triggers: List[Clause]
+    keys: List[Tuple[str, Optional[str]]] = field(default_factory=list)  # (term, trigram or None)
+
+
+class Percolator:
+    """
+    Saved searches indexed by the trigrams of their trigger terms.
+
+        perc = Percolator()
+        perc.add(SavedSearch("s1", plan))
+        for match in perc.percolate(new_gigs):
+            ...
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._by_gram: Dict[str, Counter] = {}  # trigram -> search id -> terms filed there
+        self._short: Counter = Counter()  # search id -> terms too short for a trigram
+        self._gram_df: Counter = Counter()  # gigs observed per trigram
+        self.candidates_checked = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, search_id: str) -> bool:
+        return search_id in self._entries
+
+    def get(self, search_id: str) -> Optional[SavedSearch]:
+        entry = self._entries.get(search_id)
+        return entry.search if entry is not None else None
+
+    # --- registration --------------------------------------------------------
+
+    def _key_gram(self, term: str) -> Optional[str]:
+        grams = trigrams(term)
+        if not grams:
+            return None
+        # rarest in observed gigs, then least crowded bucket, then stable
+        return min(grams, key=lambda g: (self._gram_df[g], len(self._by_gram.get(g, ())), g))
+
+    def _file(self, entry: _Entry) -> None:
+        sid = entry.search.id
+        terms = {t for c in entry.triggers for t in c.terms}
+        for term in sorted(terms):
+            gram = self._key_gram(term)
+            entry.keys.append((term, gram))
+            if gram is None:
+                self._short[sid] += 1
+            else:
+                self._by_gram.setdefault(gram, Counter())[sid] += 1
+
+    def _unfile(self, entry: _Entry) -> None:
+        sid = entry.search.id
+        for _, gram in entry.keys:
+            bucket = self._short if gram is None else self._by_gram[gram]
+            bucket[sid] -= 1
+            if bucket[sid] <= 0:
+                del bucket[sid]
+            if gram is not None and not bucket:
+                del self._by_gram[gram]
+        entry.keys.clear()
+
+    def add(self, search: SavedSearch) -> SavedSearch:
+        """
+        Register (or replace) a saved search. Raises ValueError for plans with
+        no trigger terms, which would match every gig.
+        """
+        triggers = trigger_clauses(search.plan)
+        if not triggers:
+            raise ValueError("Saved search has no terms to match new gigs on.")
+        self.remove(search.id)
+        entry = _Entry(search, triggers)
+        self._file(entry)
+        self._entries[search.id] = entry
+        return search
+
+    def remove(self, search_id: str) -> bool:
+        entry = self._entries.pop(search_id, None)
+        if entry is None:
+            return False
+        self._unfile(entry)
+        return True
+
+    def observe(self, gigs: Iterable[Dict[str, Any]]) -> None:
+        """Learn trigram frequencies from a corpus, so terms are filed under rare ones."""
+        for gig in gigs:
+            self._gram_df.update(_gig_trigrams(gig_fields(gig)))
+
+    def reindex(self) -> None:
+        """Re-file every search with the current trigram frequencies."""
+        for entry in self._entries.values():
+            self._unfile(entry)
+        for entry in self._entries.values():
+            self._file(entry)
+
+    # --- matching ------------------------------------------------------------
+
+    def candidates(self, grams: Set[str]) -> Set[str]:
+        out: Set[str] = set(self._short)
+        by_gram = self._by_gram
+        for gram in grams:
+            bucket = by_gram.get(gram)
+            if bucket:
+                out.update(bucket)
+        return out
+
+    def match(self, gig: Dict[str, Any]) -> List[PercolatorMatch]:
+        fields = gig_fields(gig)
+        matches: List[PercolatorMatch] = []
+        for sid in sorted(self.candidates(_gig_trigrams(fields))):
+            self.candidates_checked += 1
+            entry = self._entries[sid]
+            if not any(_trigger_fires(c, fields) for c in entry.triggers):
+                continue
+            search = entry.search
+            if search.disqualifiers and any(d in fields["haystack"] for d in search.disqualifiers):
+                continue
+            score = evaluate(search.plan, gig)
+            if score >= search.min_score:
+                matches.append(PercolatorMatch(sid, gig, score))
+        return matches
+
+    def percolate(self, gigs: Iterable[Dict[str, Any]]) -> List[PercolatorMatch]:
+        out: List[PercolatorMatch] = []
+        for gig in gigs:
+            out.extend(self.match(gig))
+        return out
+
+
+class AlertHub:
+    """
+    Per-search subscriber queues for push delivery. A subscriber that falls
+    `max_pending` matches behind loses the oldest ones.
+    """
+
+    def __init__(self, max_pending: int = 100):
+        self.max_pending = max_pending
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    def subscribe(self, search_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending)
+        self._subscribers.setdefault(search_id, []).append(queue)
+        return queue
+
+    def unsubscribe(self, search_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(search_id, [])
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._subscribers.pop(search_id, None)
+
+    def subscribers(self, search_id: str) -> int:
+        return len(self._subscribers.get(search_id, ()))
+
+    def publish(self, matches: Iterable[PercolatorMatch]) -> int:
+        delivered = 0
+        for match in matches:
+            for queue in self._subscribers.get(match.search_id, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(match)
+                delivered += 1
+        return delivered
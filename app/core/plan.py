@@ -0,0 +1,259 @@
+# app/core/plan.py
+
+"""
+Compiled scoring plans.
+
+A plan is the flat list of rules that `score_gig` (plus the API keyword boost)
+applies to a gig. Compiling a profile once lets the same rules be evaluated
+per gig or against a CorpusIndex, where each rule only touches the gigs that
+actually contain its terms.
+
+Scoring only ever sums weights. `explain` re-evaluates a single gig and
+reports which rules fired and on which terms; callers run it on the page
+they return, never on the whole corpus.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.user_config import UserConfig
+
+ONSITE_TERMS: Tuple[str, ...] = ("onsite", "on-site")
+HOURS_TERMS: Tuple[str, ...] = ("full-time", "40 hours", "40hrs")
+
+MUST_HAVE_PENALTY = -50
+NICE_TO_HAVE_BONUS = 3
+AVOID_PENALTY = -10
+TITLE_BONUS = 8
+REMOTE_ONLY_PENALTY = -15
+LOCATION_BONUS = 5
+HOURS_PENALTY = -5
+SENIORITY_BONUS = 4
+KEYWORD_BOOST = 10
+
+
+@dataclass(frozen=True)
+class Clause:
+    """
+    One scoring rule.
+
+    - mode "any": fires when any of `terms` occurs in `field`
+    - mode "missing": fires when at least one of `terms` is absent
+    - `unless`: the rule is suppressed when any of these terms occurs
+    """
+
+    weight: float
+    terms: Tuple[str, ...]
+    field: str = "text"
+    mode: str = "any"
+    unless: Tuple[str, ...] = ()
+    kind: str = "base"
+
+    @property
+    def key(self) -> Tuple[str, Tuple[str, ...], str, Tuple[str, ...]]:
+        """Identity of the rule's hit set (independent of its weight)."""
+        return (self.field, self.terms, self.mode, self.unless)
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    name: str
+    clauses: Tuple[Clause, ...]
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable hash of the rules; two profiles that score alike share it."""
+        raw = repr([(c.weight,) + c.key for c in self.clauses])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+# Generic heuristics applied to every gig (mirrors the top of score_gig).
+BASE_CLAUSES: Tuple[Clause, ...] = (
+    Clause(5, ("remote", "work from home"), kind="remote"),
+    Clause(-5, ONSITE_TERMS, unless=("remote",), kind="onsite"),
+    Clause(1, ("senior",), kind="senior"),
+    Clause(-1, ("junior", "entry-level"), kind="junior"),
+)
+
+
+# -----------------------------
+# Field extraction
+# -----------------------------
+# Field views are built from components joined by a separator, so an index
+# can tokenize each component once and share it between views.
+FIELD_VIEWS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "text": (("title", "description"), "\n"),
+    "title": (("title",), ""),
+    "location": (("location",), ""),
+    "haystack": (("heading", "description"), " "),
+}
+
+
+def _tags_text(tags: Any) -> str:
+    # One tag per line, so phrases never match across two tags
+    if isinstance(tags, (list, tuple)):
+        return "\n".join(str(t) for t in tags)
+    return str(tags or "")
+
+
+def gig_components(gig: Dict[str, Any]) -> Dict[str, str]:
+    return {
+        "title": (gig.get("position") or gig.get("title") or "").lower(),
+        "heading": (gig.get("title") or gig.get("position") or "").lower(),
+        "description": (gig.get("description") or "").lower(),
+        "location": (gig.get("location") or "").lower(),
+        "company": (gig.get("company") or "").lower(),
+        "tags": _tags_text(gig.get("tags")).lower(),
+    }
+
+
+def gig_fields(gig: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Lowercased text views used by the scoring rules:
+
+    - text:     title + description (what score_gig matches against)
+    - title:    position/title
+    - location: location
+    - haystack: title + description as built by the API keyword boost
+    """
+    parts = gig_components(gig)
+    return {
+        field: sep.join(parts[c] for c in components)
+        for field, (components, sep) in FIELD_VIEWS.items()
+    }
+
+
+# -----------------------------
+# Compilation
+# -----------------------------
+def _lower(values: Optional[List[Any]]) -> List[str]:
+    return [str(v).lower() for v in (values or [])]
+
+
+def compile_user_config(user_config: UserConfig, name: Optional[str] = None) -> ScoringPlan:
+    """
+    Compile a UserConfig into the same rules score_gig applies.
+    """
+    clauses: List[Clause] = list(BASE_CLAUSES)
+
+    if user_config.keywords_must_have:
+        clauses.append(
+            Clause(
+                MUST_HAVE_PENALTY,
+                tuple(_lower(user_config.keywords_must_have)),
+                mode="missing",
+                kind="must_have",
+            )
+        )
+
+    for kw in _lower(user_config.keywords_nice_to_have):
+        clauses.append(Clause(NICE_TO_HAVE_BONUS, (kw,), kind="nice_to_have"))
+
+    for kw in _lower(user_config.keywords_avoid):
+        clauses.append(Clause(AVOID_PENALTY, (kw,), kind="avoid"))
+
+    for desired in _lower(user_config.titles_include):
+        clauses.append(Clause(TITLE_BONUS, (desired,), field="title", kind="title"))
+
+    if user_config.remote_only:
+        clauses.append(
+            Clause(REMOTE_ONLY_PENALTY, ONSITE_TERMS, unless=("remote",), kind="remote_only")
+        )
+
+    if user_config.locations_preferred:
+        clauses.append(
+            Clause(
+                LOCATION_BONUS,
+                tuple(_lower(user_config.locations_preferred)),
+                field="location",
+                kind="location",
+            )
+        )
+
+    if user_config.max_hours_per_week is not None:
+        clauses.append(Clause(HOURS_PENALTY, HOURS_TERMS, kind="hours"))
+
+    for level in _lower(user_config.preferred_seniority):
+        clauses.append(Clause(SENIORITY_BONUS, (level,), kind="seniority"))
+
+    return ScoringPlan(name=name or user_config.profile_name, clauses=tuple(clauses))
+
+
+def compile_profile_dict(user_config: Dict[str, Any], name: str = "custom") -> ScoringPlan:
+    """
+    Compile an API-style profile dict (keywords/skills/...) into the rules
+    run_gig_search applies: the generic heuristics plus a keyword boost.
+    """
+    clauses: List[Clause] = list(BASE_CLAUSES)
+    for kw in _lower(user_config.get("keywords")):
+        if kw:
+            clauses.append(Clause(KEYWORD_BOOST, (kw,), field="haystack", kind="keyword"))
+    return ScoringPlan(name=name, clauses=tuple(clauses))
+
+
+def compile_plan(
+    config: Union[UserConfig, Dict[str, Any], None],
+    name: Optional[str] = None,
+) -> ScoringPlan:
+    if isinstance(config, UserConfig):
+        return compile_user_config(config, name=name)
+    if isinstance(config, dict):
+        return compile_profile_dict(config, name=name or "custom")
+    return ScoringPlan(name=name or "default", clauses=BASE_CLAUSES)
+
+
+# -----------------------------
+# Per-gig evaluation
+# -----------------------------
+def clause_fires(clause: Clause, fields: Dict[str, str]) -> bool:
+    value = fields[clause.field]
+    if clause.unless and any(t in value for t in clause.unless):
+        return False
+    if clause.mode == "missing":
+        return any(t not in value for t in clause.terms)
+    return any(t in value for t in clause.terms)
+
+
+def evaluate(plan: ScoringPlan, gig: Dict[str, Any]) -> float:
+    """
+    Score a single gig with a compiled plan.
+    """
+    fields = gig_fields(gig)
+    score = 0.0
+    for clause in plan.clauses:
+        if clause_fires(clause, fields):
+            score += clause.weight
+    return score
+
+
+def explain(plan: ScoringPlan, gig: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Breakdown of a gig's score under `plan`:
+
+        {"score": 13.0, "rules": [
+            {"kind": "must_have", "weight": -50, "field": "text", "terms": ["python"]},
+            {"kind": "title", "weight": 8, "field": "title", "terms": ["developer"]},
+            ...]}
+
+    `terms` are the missing terms for must-have rules and the matched terms
+    for everything else. `score` always equals `evaluate(plan, gig)`.
+    """
+    fields = gig_fields(gig)
+    score = 0.0
+    rules: List[Dict[str, Any]] = []
+    for clause in plan.clauses:
+        if not clause_fires(clause, fields):
+            continue
+        value = fields[clause.field]
+        if clause.mode == "missing":
+            terms = [t for t in clause.terms if t not in value]
+        else:
+            terms = [t for t in clause.terms if t in value]
+        score += clause.weight
+        rules.append(
+            {"kind": clause.kind, "weight": clause.weight, "field": clause.field, "terms": terms}
+        )
+    return {"score": score, "rules": rules}
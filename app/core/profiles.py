@@ -0,0 +1,249 @@
+# app/core/profiles.py
+
+"""
+Profile registry: every profile in configs/, parsed and compiled once.
+
+Two kinds of profile live side by side:
+
+    configs/<key>.json            "user"    UserConfig (CLI --profile)
+    configs/profiles/<key>.json   "search"  API profile (GET /gigs?profile=)
+
+Each entry carries its parsed config and its compiled ScoringPlan, so a
+request is a dict lookup: no file I/O, no parsing, no compiling.
+
+`reload()` stats every file and only re-reads the ones whose (mtime, size)
+changed. The new entries are built into a fresh dict that replaces the
+old one in a single assignment, so a reader always sees one consistent
+generation of profiles and plans. A file that fails to parse keeps its
+previous entry (if any) and is reported in `errors`. `watch()` runs
+`reload()` off the event loop every few seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.logs import get_logger, log_event
+from app.core.plan import ScoringPlan, compile_profile_dict, compile_user_config
+from app.user_config import DEFAULT_CONFIG_DIR, UserConfig
+
+log = get_logger(__name__)
+
+Parser = Callable[[str, Dict[str, Any]], Tuple[Any, ScoringPlan]]
+Stamp = Tuple[int, int]  # (mtime_ns, size)
+
+
+@dataclass(frozen=True)
+class ProfileEntry:
+    kind: str
+    key: str
+    config: Any  # UserConfig for "user", run_gig_search dict for "search"
+    plan: ScoringPlan
+    data: Dict[str, Any]  # the file as parsed
+    path: str
+    stamp: Stamp
+
+    @property
+    def label(self) -> str:
+        return str(self.data.get("label") or self.key)
+
+
+# -----------------------------
+# Parsers
+# -----------------------------
+def _strings(data: Dict[str, Any], name: str) -> List[str]:
+    value = data.get(name) or []
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"'{name}' must be a list of strings")
+    return value
+
+
+_USER_LISTS = (
+    "titles_include",
+    "keywords_must_have",
+    "keywords_nice_to_have",
+    "keywords_avoid",
+    "locations_preferred",
+    "preferred_seniority",
+)
+
+
+def parse_user_config(key: str, data: Dict[str, Any]) -> Tuple[UserConfig, ScoringPlan]:
+    for name in _USER_LISTS:
+        _strings(data, name)  # a bare string would compile one rule per character
+    config = UserConfig.from_dict(data)
+    return config, compile_user_config(config, name=key)
+
+
+def parse_search_profile(key: str, data: Dict[str, Any]) -> Tuple[Dict[str, Any], ScoringPlan]:
+    """A built-in API profile as the user_config dict run_gig_search takes."""
+    config = {
+        "preferred_roles": [key],
+        "skills": _strings(data, "skills"),
+        "keywords": _strings(data, "keywords"),
+        "disqualifiers": _strings(data, "disqualifiers"),
+        "min_pay": data.get("min_pay", 0),
+        "remote_only": bool(data.get("remote_only", True)),
+    }
+    return config, compile_profile_dict(config, name=key)
+
+
+# kind -> (glob under the config directory, parser)
+DEFAULT_SOURCES: Dict[str, Tuple[str, Parser]] = {
+    "user": ("*.json", parse_user_config),
+    "search": ("profiles/*.json", parse_search_profile),
+}
+
+
+class ProfileView(Mapping):
+    """
+    Read-only key -> ProfileEntry mapping over one kind, always current.
+    Without a registry it reads the process-wide one (loaded on first use).
+    """
+
+    def __init__(self, registry: Optional["ProfileRegistry"], kind: str):
+        self._registry = registry
+        self.kind = kind
+
+    @property
+    def registry(self) -> "ProfileRegistry":
+        return self._registry if self._registry is not None else get_registry()
+
+    def __getitem__(self, key: str) -> ProfileEntry:
+        entry = self.registry.get(key, self.kind)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.registry.keys(self.kind))
+
+    def __len__(self) -> int:
+        return len(self.registry.keys(self.kind))
+
+
+class ProfileRegistry:
+    def __init__(self, directory: Path | str, sources: Optional[Dict[str, Tuple[str, Parser]]] = None):
+        self.directory = Path(directory)
+        self.sources = dict(sources or DEFAULT_SOURCES)
+        # one generation: (kind, key) -> entry, and kind -> sorted keys;
+        # replaced as a whole, never mutated
+        self._generation: Tuple[Dict[Tuple[str, str], ProfileEntry], Dict[str, List[str]]] = ({}, {})
+        self.errors: Dict[str, str] = {}
+        # path -> (stamp, error) of files that failed to load; not re-read
+        # (or logged again) until they change
+        self._failed: Dict[str, Tuple[Stamp, str]] = {}
+        self.version = 0
+
+    # --- lookups (no I/O) ----------------------------------------------------
+
+    def get(self, key: str, kind: str = "user") -> Optional[ProfileEntry]:
+        return self._generation[0].get((kind, key.lower().strip()))
+
+    def keys(self, kind: str) -> List[str]:
+        return self._generation[1].get(kind, [])
+
+    def view(self, kind: str) -> ProfileView:
+        return ProfileView(self, kind)
+
+    def __len__(self) -> int:
+        return len(self._generation[0])
+
+    # --- loading -------------------------------------------------------------
+
+    def _scan(self) -> Dict[str, Tuple[str, str, Parser, Stamp]]:
+        found: Dict[str, Tuple[str, str, Parser, Stamp]] = {}
+        for kind, (pattern, parser) in self.sources.items():
+            for path in self.directory.glob(pattern):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:  # removed mid-scan
+                    continue
+                found[str(path)] = (kind, path.stem.lower(), parser, (st.st_mtime_ns, st.st_size))
+        return found
+
+    def reload(self) -> int:
+        """
+        Pick up added, changed and removed files. Returns how many entries
+        changed; nothing is swapped when none did. A file that failed to
+        load keeps its error but is not read again until it changes.
+        """
+        current = {entry.path: entry for entry in self._generation[0].values()}
+        entries: Dict[Tuple[str, str], ProfileEntry] = {}
+        errors: Dict[str, str] = {}
+        failed: Dict[str, Tuple[Stamp, str]] = {}
+        changed = 0
+
+        for path, (kind, key, parser, stamp) in sorted(self._scan().items()):
+            old = current.pop(path, None)
+            if old is not None and old.stamp == stamp:
+                entries[(kind, key)] = old
+                continue
+            known = self._failed.get(path)
+            if known is not None and known[0] == stamp:
+                errors[path] = known[1]
+                failed[path] = known
+                if old is not None:
+                    entries[(kind, key)] = old
+                continue
+            try:
+                data = json.loads(Path(path).read_text(encoding="utf-8"))
+                if not isinstance(data, dict):
+                    raise ValueError("profile must be a JSON object")
+                config, plan = parser(key, data)
+            except (OSError, ValueError, TypeError) as e:
+                errors[path] = str(e)
+                failed[path] = (stamp, str(e))
+                log_event(log, "profiles.invalid", logging.WARNING, path=path, error=str(e))
+                if old is not None:
+                    entries[(kind, key)] = old
+                continue
+            entries[(kind, key)] = ProfileEntry(kind, key, config, plan, data, path, stamp)
+            changed += 1
+        changed += len(current)  # files that disappeared
+
+        self.errors = errors
+        self._failed = failed
+        if changed or not self.version:
+            keys: Dict[str, List[str]] = {}
+            for kind, key in sorted(entries):
+                keys.setdefault(kind, []).append(key)
+            self._generation = (entries, keys)
+            self.version += 1
+            log_event(log, "profiles.loaded", profiles=len(entries), changed=changed, version=self.version)
+        return changed
+
+    async def watch(self, interval: float) -> None:
+        """Reload every `interval` seconds, in a worker thread."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception as e:  # keep serving the last good generation
+                log_event(log, "profiles.reload_failed", logging.ERROR, error=repr(e))
+
+
+_registry: Optional[ProfileRegistry] = None
+
+
+def get_registry() -> ProfileRegistry:
+    """The process-wide registry over configs/, loaded on first use."""
+    global _registry
+    if _registry is None:
+        from app.settings import settings
+
+        registry = ProfileRegistry(settings.config_dir or DEFAULT_CONFIG_DIR)
+        registry.reload()
+        _registry = registry
+    return _registry
+
+
+def profile_view(kind: str) -> ProfileView:
+    """A view of the process-wide registry that loads nothing until read."""
+    return ProfileView(None, kind)
@@ -0,0 +1,283 @@
+# app/core/query.py
+
+"""
+Search query language.
+
+    email newsletter                 both words (implicit AND)
+    email OR newsletter              either word
+    copywriter AND NOT crypto        exclusion
+    "content strategy"               phrase
+    title:designer company:acme      field prefixes: title, company, tag
+    tag:"email marketing"            phrase in a field
+    market*                          prefix wildcard (marketing, marketer...)
+    (email OR seo) AND remote        grouping
+
+Operators are upper case; anything else is a search word. A bare word
+matches anywhere inside a token, as the old keyword filters did: "email"
+matches "emails" and "market" matches "marketing". Quoted phrases match
+whole tokens ("email" in quotes does not match "emails"), and "word*"
+matches tokens that start with the word. Words like "next.js" become the
+phrase "next js". Dangling operators and unbalanced parentheses are
+ignored rather than rejected, since queries come straight from users.
+
+A query is parsed once into a tree and evaluated against a CorpusIndex with
+posting-list unions and intersections: each word costs the size of its
+posting list (a bare word looks up every vocabulary token containing it),
+phrases are only verified on gigs that contain all of their words, and NOT is applied as a set difference inside AND. Parsed queries
+are memoized by text. `Query.matches` checks a single gig directly against
+its text, for callers without an index.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from app.core.index import CorpusIndex, tokenize
+from app.core.plan import gig_components
+
+# Query field prefix -> index components it searches
+FIELD_COMPONENTS: Dict[str, Tuple[str, ...]] = {
+    "title": ("title",),
+    "company": ("company",),
+    "tag": ("tags",),
+}
+DEFAULT_COMPONENTS: Tuple[str, ...] = ("title", "company", "description")
+
+OPERATORS = ("AND", "OR", "NOT")
+
+_LEX_RE = re.compile(
+    r'\s*(?:(?P<paren>[()])|(?:(?P<field>title|company|tag):)?(?:"(?P<phrase>[^"]*)"?|(?P<word>[^\s()"]+)))',
+    re.IGNORECASE,
+)
+
+
+# -----------------------------
+# Query tree
+# -----------------------------
+@dataclass(frozen=True)
+class Term:
+    """
+    A word (one token) or phrase (several); `prefix` widens the last one,
+    `substring` lets a bare word match inside a token.
+    """
+
+    field: Optional[str]
+    tokens: Tuple[str, ...]
+    prefix: bool = False
+    substring: bool = False
+
+
+@dataclass(frozen=True)
+class Not:
+    item: "Node"
+
+
+@dataclass(frozen=True)
+class And:
+    items: Tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    items: Tuple["Node", ...]
+
+
+Node = Union[Term, Not, And, Or]
+
+
+# -----------------------------
+# Parsing
+# -----------------------------
+def _lex(text: str) -> List[Tuple[str, Any]]:
+    tokens: List[Tuple[str, Any]] = []
+    depth = 0
+    for m in _LEX_RE.finditer(text):
+        if m.group("paren") == "(":
+            depth += 1
+            tokens.append(("(", None))
+        elif m.group("paren") == ")":
+            if depth:  # drop unbalanced closers
+                depth -= 1
+                tokens.append((")", None))
+        elif m.group("word") in OPERATORS and not m.group("field"):
+            tokens.append(("op", m.group("word")))
+        else:
+            field = (m.group("field") or "").lower() or None
+            raw = m.group("phrase") if m.group("phrase") is not None else m.group("word")
+            bare = m.group("word") is not None
+            prefix = bare and raw.endswith("*")
+            words = tokenize(raw)
+            if words:
+                substring = bare and not prefix and len(words) == 1
+                tokens.append(("term", Term(field, tuple(words), prefix, substring)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: List[Tuple[str, Any]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self) -> Tuple[str, Any]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ("end", None)
+
+    def parse_or(self) -> Optional[Node]:
+        items = [self.parse_and()]
+        while self._peek() == ("op", "OR"):
+            self.pos += 1
+            items.append(self.parse_and())
+        return _combine(Or, items)
+
+    def parse_and(self) -> Optional[Node]:
+        items: List[Optional[Node]] = []
+        while True:
+            kind, value = self._peek()
+            if kind in ("end", ")") or (kind, value) == ("op", "OR"):
+                break
+            if (kind, value) == ("op", "AND"):
+                self.pos += 1
+                continue
+            items.append(self.parse_not())
+        return _combine(And, items)
+
+    def parse_not(self) -> Optional[Node]:
+        if self._peek() == ("op", "NOT"):
+            self.pos += 1
+            item = self.parse_not()
+            return Not(item) if item is not None else None
+        return self.parse_atom()
+
+    def parse_atom(self) -> Optional[Node]:
+        kind, value = self._peek()
+        self.pos += 1
+        if kind == "(":
+            node = self.parse_or()
+            if self._peek()[0] == ")":
+                self.pos += 1
+            return node
+        if kind == "term":
+            return value
+        return None
+
+
+def _combine(cls, items: Sequence[Optional[Node]]) -> Optional[Node]:
+    kept = tuple(i for i in items if i is not None)
+    if not kept:
+        return None
+    return kept[0] if len(kept) == 1 else cls(kept)
+
+
+# -----------------------------
+# Evaluation
+# -----------------------------
+@lru_cache(maxsize=1024)
+def _phrase_re(term: Term) -> re.Pattern:
+    if term.substring:
+        return re.compile(re.escape(term.tokens[0]))
+    body = r"[^a-z0-9\n]+".join(re.escape(t) for t in term.tokens)
+    tail = r"[a-z0-9]*" if term.prefix else ""
+    return re.compile(rf"(?<![a-z0-9]){body}{tail}(?![a-z0-9])")
+
+
+@dataclass(frozen=True)
+class Query:
+    text: str
+    root: Optional[Node]
+    default_components: Tuple[str, ...] = DEFAULT_COMPONENTS
+
+    @property
+    def empty(self) -> bool:
+        return self.root is None
+
+    def _term_docs(self, index: CorpusIndex, term: Term) -> Set[int]:
+        components = FIELD_COMPONENTS[term.field] if term.field else self.default_components
+        last = len(term.tokens) - 1
+        out: Set[int] = set()
+        for component in components:
+            # rarest word first, so the intersection shrinks fastest
+            postings = sorted(
+                (
+                    index.token_docs(component, tok, term.prefix and j == last, term.substring)
+                    for j, tok in enumerate(term.tokens)
+                ),
+                key=len,
+            )
+            docs = set(postings[0])
+            for other in postings[1:]:
+                if not docs:
+                    break
+                docs &= other
+            if docs and last > 0:
+                pattern = _phrase_re(term)
+                docs = {i for i in docs if pattern.search(index.component_text(component, i))}
+            out |= docs
+        return out
+
+    def _eval(self, index: CorpusIndex, node: Node) -> Set[int]:
+        if isinstance(node, Term):
+            return self._term_docs(index, node)
+        if isinstance(node, Or):
+            out: Set[int] = set()
+            for item in node.items:
+                out |= self._eval(index, item)
+            return out
+        if isinstance(node, Not):
+            return set(range(index.size)) - self._eval(index, node.item)
+
+        # And: intersect the positive parts smallest first, then subtract
+        # the negated ones instead of building their complements.
+        positive = [i for i in node.items if not isinstance(i, Not)]
+        negative = [i.item for i in node.items if isinstance(i, Not)]
+        if positive:
+            sets = sorted((self._eval(index, i) for i in positive), key=len)
+            docs = set(sets[0])
+            for other in sets[1:]:
+                if not docs:
+                    return docs
+                docs &= other
+        else:
+            docs = set(range(index.size))
+        for item in negative:
+            if not docs:
+                break
+            docs -= self._eval(index, item)
+        return docs
+
+    def search(self, index: CorpusIndex) -> Set[int]:
+        """Positions of the gigs in `index` that match."""
+        if self.root is None:
+            return set(range(index.size))
+        return self._eval(index, self.root)
+
+    def filter(self, gigs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        gigs = list(gigs)
+        hits = self.search(CorpusIndex(gigs))
+        return [g for i, g in enumerate(gigs) if i in hits]
+
+    def _matches(self, parts: Dict[str, str], node: Node) -> bool:
+        if isinstance(node, Term):
+            pattern = _phrase_re(node)
+            components = FIELD_COMPONENTS[node.field] if node.field else self.default_components
+            return any(pattern.search(parts[c]) for c in components)
+        if isinstance(node, Or):
+            return any(self._matches(parts, i) for i in node.items)
+        if isinstance(node, And):
+            return all(self._matches(parts, i) for i in node.items)
+        return not self._matches(parts, node.item)
+
+    def matches(self, gig: Dict[str, Any]) -> bool:
+        """One gig, matched on its own text (no index is built)."""
+        return self.root is None or self._matches(gig_components(gig), self.root)
+
+
+@lru_cache(maxsize=256)
+def parse_query(text: Optional[str], default_components: Tuple[str, ...] = DEFAULT_COMPONENTS) -> Query:
+    """
+    Parse a query string once; evaluate it with `.search(index)`.
+    """
+    text = text or ""
+    root = _Parser(_lex(text)).parse_or()
+    return Query(text=text, root=root, default_components=default_components)
@@ -0,0 +1,154 @@
+# app/core/ranking.py
+
+"""
+Ranking helpers: bounded top-k selection and cursor pagination.
+
+Ordering is always score high -> low with ties broken by id, so a page never
+depends on the order gigs were fetched in. A Ranking only sorts as deep as
+the pages that have actually been requested, and RankingCache keeps recent
+rankings around so page 2 resumes from the cached one instead of rescoring.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+RankKey = Tuple[float, str]
+
+
+def gig_id(gig: Dict[str, Any]) -> str:
+    return str(gig.get("id") or gig.get("url") or "")
+
+
+def rank_key(gig: Dict[str, Any], score_key: str = "score") -> RankKey:
+    """Sort key: higher score first, then id ascending."""
+    return (-float(gig.get(score_key) or 0), gig_id(gig))
+
+
+def top_k(items: Iterable[T], k: int, key: Callable[[T], Any] = rank_key) -> List[T]:
+    """
+    The k best items in rank order, using a bounded heap (O(n log k))
+    instead of sorting everything.
+    """
+    if k <= 0:
+        return []
+    return heapq.nsmallest(k, items, key=key)
+
+
+class Ranking(Generic[T]):
+    """
+    A lazily sorted ranking over a fixed list of items.
+
+    Only the prefix needed for the requested pages is selected; the prefix
+    grows geometrically, and falls back to a full sort once it would cover
+    most of the items anyway.
+    """
+
+    def __init__(
+        self,
+        items: List[T],
+        key: Callable[[T], Any] = rank_key,
+        view: Optional[Callable[[T], Any]] = None,
+    ):
+        self._items = items
+        self._key = key
+        self._view = view
+        self._sorted: List[T] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _select(self, need: int) -> None:
+        if need > len(self._sorted) and len(self._sorted) < len(self._items):
+            depth = max(need, 2 * len(self._sorted))
+            if 2 * depth >= len(self._items):
+                self._sorted = sorted(self._items, key=self._key)
+            else:
+                self._sorted = heapq.nsmallest(depth, self._items, key=self._key)
+
+    def prepare(self, count: int) -> None:
+        """Sort far enough to serve the first `count` items."""
+        self._select(count)
+
+    def page(self, offset: int, limit: int) -> List[Any]:
+        """
+        Items [offset, offset + limit) in rank order, passed through `view`
+        when one was given (e.g. to build the output dict for a position).
+        """
+        return list(self.iter_page(offset, limit))
+
+    def iter_page(self, offset: int, limit: int) -> Iterator[Any]:
+        """
+        Like page(), but builds each view only when it is consumed.
+        """
+        self._select(offset + limit)
+        selected = self._sorted
+        for k in range(offset, min(offset + limit, len(selected))):
+            yield selected[k] if self._view is None else self._view(selected[k])
+
+
+class RankingCache:
+    """
+    LRU of rankings keyed by (corpus version, ranking fingerprint).
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Ranking]" = OrderedDict()
+
+    def get(self, version: str, fingerprint: str) -> Optional[Ranking]:
+        key = (version, fingerprint)
+        ranking = self._entries.get(key)
+        if ranking is not None:
+            self._entries.move_to_end(key)
+        return ranking
+
+    def put(self, version: str, fingerprint: str, ranking: Ranking) -> None:
+        self._entries[(version, fingerprint)] = ranking
+        self._entries.move_to_end((version, fingerprint))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def latest(self, fingerprint: str) -> Optional[Tuple[str, Ranking]]:
+        """(version, ranking) most recently used for `fingerprint`, any version."""
+        for (version, fp), ranking in reversed(self._entries.items()):
+            if fp == fingerprint:
+                return version, ranking
+        return None
+
+
+# -----------------------------
+# Fingerprints and cursors
+# -----------------------------
+def ranking_fingerprint(*parts: Any) -> str:
+    """Hash everything that decides the order of a ranking."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(version: str, fingerprint: str, offset: int) -> str:
+    raw = json.dumps({"v": version, "f": fingerprint, "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, int]:
+    """
+    Returns (corpus version, ranking fingerprint, offset).
+    Raises ValueError for anything that is not a cursor we issued.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        version, fingerprint, offset = str(data["v"]), str(data["f"]), int(data["o"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return version, fingerprint, offset
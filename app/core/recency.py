@@ -0,0 +1,81 @@
+# app/core/recency.py
+
+"""
+Recency decay over a whole corpus at once.
+
+Posting times are stored on each gig as `posted_epoch` (seconds, UTC) when
+it is ingested, so recency is one vectorized pass against a single `now`:
+
+    score = 0.5 ** (age_days / half_life_days)     (1.0 = now, -> 0 with age)
+
+Gigs without a posting time score 0.0, as do all gigs when the half-life is
+not positive. `DecayTable` trades exactness for speed with one precomputed
+value per whole day of age.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None  # type: ignore[assignment]
+
+SECONDS_PER_DAY = 86400.0
+
+Epoch = Optional[float]
+
+
+def recency_scores(epochs: Sequence[Epoch], now: float, half_life_days: float) -> List[float]:
+    """
+    Exponential half-life decay for every posting time in `epochs`.
+    """
+    if half_life_days <= 0:
+        return [0.0] * len(epochs)
+
+    rate = math.log(0.5) / (half_life_days * SECONDS_PER_DAY)
+
+    if np is not None and len(epochs) > 64:
+        ts = np.array([e if e is not None else np.nan for e in epochs], dtype=np.float64)
+        ages = np.maximum(0.0, now - ts)
+        out = np.exp(ages * rate)
+        return np.nan_to_num(out, nan=0.0).tolist()
+
+    exp = math.exp
+    return [0.0 if e is None else exp(max(0.0, now - e) * rate) for e in epochs]
+
+
+class DecayTable:
+    """
+    Precomputed per-day decay buckets: age is truncated to whole days and
+    looked up. Ages beyond `max_days` score 0.0.
+    """
+
+    def __init__(self, half_life_days: float, max_days: int = 365):
+        self.half_life_days = half_life_days
+        self.max_days = max_days
+        if half_life_days <= 0:
+            self.buckets = [0.0] * (max_days + 1)
+        else:
+            self.buckets = [0.5 ** (d / half_life_days) for d in range(max_days + 1)]
+
+    def scores(self, epochs: Sequence[Epoch], now: float) -> List[float]:
+        buckets = self.buckets
+        last = self.max_days
+        out: List[float] = []
+        for e in epochs:
+            if e is None:
+                out.append(0.0)
+                continue
+            day = int(max(0.0, now - e) // SECONDS_PER_DAY)
+            out.append(buckets[day] if day <= last else 0.0)
+        return out
+
+
+@lru_cache(maxsize=8)
+def decay_table(half_life_days: float, max_days: int = 365) -> DecayTable:
+    """Shared DecayTable per half-life; built once per process."""
+    return DecayTable(half_life_days, max_days)
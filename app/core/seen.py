@@ -0,0 +1,157 @@
+# app/core/seen.py
+
+"""
+Persistent "already seen" set for the CLI watch mode.
+
+    seen = SeenSet.load(path, capacity=100_000)
+    fresh = [g for g in gigs if not seen.seen(g)]
+    seen.add_many(fresh)
+    seen.save()
+
+Membership is a Bloom filter over gig fingerprints (source + id), so the
+file and the memory it takes are fixed by `capacity` and `error_rate`,
+not by how many gigs have gone by. To stay bounded over weeks of uptime
+without the false-positive rate creeping up, there are two generations:
+new fingerprints go into `current`; once it holds `capacity` of them it
+becomes `previous` and a fresh `current` starts. A lookup checks both, so
+a gig is remembered for at least `capacity` and at most 2 x `capacity`
+insertions, and the false-positive rate stays under about 2 x error_rate.
+
+A false positive means an unseen gig is taken as seen and not reported;
+a seen gig is never reported twice while it is remembered.
+
+File layout:
+
+    GASEEN1
+    {"bits": m, "hashes": k, "capacity": n, "count": c}
+    <m / 8 bytes: current><m / 8 bytes: previous>
+
+The file is rewritten atomically (app.core.files), so a crash mid-save
+leaves the previous version in place.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.logs import get_logger, log_event
+from app.core.ranking import gig_id
+from app.core.files import atomic_write
+
+log = get_logger(__name__)
+
+SEEN_MAGIC = b"GASEEN1\n"
+DEFAULT_CAPACITY = 100_000
+DEFAULT_ERROR_RATE = 0.001
+
+
+def fingerprint(gig: Dict[str, Any]) -> str:
+    return f"{gig.get('source') or ''}:{gig_id(gig)}"
+
+
+def bloom_size(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """(bits, hashes) for `capacity` items at `error_rate`; bits is a multiple of 8."""
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    bits = max(8, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class SeenSet:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        self.capacity = max(1, capacity)
+        self.bits, self.hashes = bloom_size(self.capacity, error_rate)
+        self.current = bytearray(self.bits // 8)
+        self.previous = bytearray(self.bits // 8)
+        self.count = 0  # fingerprints added to `current`
+        self.path: Optional[Path] = None
+
+    def _positions(self, key: str) -> List[int]:
+        # double hashing (Kirsch & Mitzenmacher): k positions from one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def _has(bits: bytearray, positions: List[int]) -> bool:
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return self._has(self.current, positions) or self._has(self.previous, positions)
+
+    def seen(self, gig: Dict[str, Any]) -> bool:
+        return fingerprint(gig) in self
+
+    def add(self, key: str) -> bool:
+        """Remember `key`; False if it was (probably) already there."""
+        positions = self._positions(key)
+        if self._has(self.current, positions):
+            return False
+        if self.count >= self.capacity:
+            self.rotate()
+        for p in positions:
+            self.current[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+        return True
+
+    def add_many(self, gigs: Iterable[Dict[str, Any]]) -> int:
+        return sum(self.add(fingerprint(g)) for g in gigs)
+
+    def rotate(self) -> None:
+        """Start a new generation; the oldest one is forgotten."""
+        self.previous, self.current = self.current, bytearray(self.bits // 8)
+        self.count = 0
+        log_event(log, "seen.rotated", capacity=self.capacity)
+
+    # --- persistence ---------------------------------------------------------
+
+    def save(self, path: Optional[Path | str] = None) -> Path:
+        target = Path(path or self.path or "")
+        if not target.name:
+            raise ValueError("no path to save the seen-set to")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        header = {"bits": self.bits, "hashes": self.hashes, "capacity": self.capacity, "count": self.count}
+        atomic_write(target, [SEEN_MAGIC, json.dumps(header).encode("utf-8") + b"\n", self.current, self.previous])
+        self.path = target
+        return target
+
+    @classmethod
+    def load(
+        cls, path: Path | str, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE
+    ) -> "SeenSet":
+        """
+        The set saved at `path`, or an empty one if there is none. A file
+        sized for a different capacity / error rate, or one that does not
+        parse, is replaced by an empty set (with a warning).
+        """
+        seen = cls(capacity, error_rate)
+        seen.path = Path(path)
+        try:
+            raw = seen.path.read_bytes()
+        except FileNotFoundError:
+            return seen
+        try:
+            if not raw.startswith(SEEN_MAGIC):
+                raise ValueError("not a seen-set file")
+            end = raw.index(b"\n", len(SEEN_MAGIC))
+            header = json.loads(raw[len(SEEN_MAGIC):end])
+            if (header["bits"], header["hashes"], header["capacity"]) != (seen.bits, seen.hashes, seen.capacity):
+                raise ValueError(f"sized for capacity {header['capacity']}, not {seen.capacity}")
+            size = seen.bits // 8
+            body = raw[end + 1:]
+            if len(body) != 2 * size:
+                raise ValueError("truncated")
+            count = int(header["count"])
+            seen.current = bytearray(body[:size])
+            seen.previous = bytearray(body[size:])
+            seen.count = count
+        except (ValueError, KeyError, TypeError) as e:
+            log_event(log, "seen.reset", logging.WARNING, path=str(path), error=str(e))
+        return seen
@@ -0,0 +1,126 @@
+# app/core/serialization.py
+
+"""
+Pre-serialized JSON fragments for response bodies.
+
+Gigs in a corpus snapshot do not change between requests, so neither does
+their JSON. Each gig (or scored gig) is serialized once and the bytes are
+cached under a key derived from its content; a response body is then
+assembled by joining cached fragments instead of encoding every gig again.
+
+The cache key is the gig's content frozen into nested tuples. Hashing it
+is cheap because Python caches the hash of each string object, and gigs
+from the same snapshot share those strings with every copy made of them.
+Non-string scalars carry their type in the key, so 1, 1.0 and True, which
+compare equal but serialize differently, never share a fragment.
+
+Fragments use the same encoding as Starlette's JSONResponse (compact
+separators, UTF-8, no ASCII escaping), so bodies are byte-for-byte what
+returning the dict would have produced.
+
+FRAGMENTS is used from the event loop and from Starlette's threadpool
+(sync iterators of streamed responses), so the LRU bookkeeping runs under
+a lock; serializing a missing fragment happens outside it.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Sequence, Tuple
+
+
+class Raw(bytes):
+    """Bytes that are already JSON; embedded as-is by json_object()."""
+
+
+def dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _freeze(value: Any) -> Hashable:
+    t = type(value)
+    if t is str:
+        return value
+    if t is dict:
+        return (dict, tuple([(k, v if type(v) is str else _freeze(v)) for k, v in value.items()]))
+    if t is list or t is tuple:
+        return (list, tuple([v if type(v) is str else _freeze(v) for v in value]))
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return _freeze(dict(value))
+    if isinstance(value, (list, tuple)):
+        return _freeze(list(value))
+    if hasattr(value, "model_dump_json"):  # pydantic model
+        return (type(value), _freeze(value.__dict__))
+    if isinstance(value, Hashable):
+        return (type(value), value)
+    return (type(value), repr(value))
+
+
+def content_key(obj: Any) -> Hashable:
+    return _freeze(obj)
+
+
+def _serialize(obj: Any) -> bytes:
+    if hasattr(obj, "model_dump_json"):
+        return obj.model_dump_json().encode("utf-8")
+    return dumps(obj)
+
+
+class FragmentCache:
+    """
+    LRU of serialized JSON keyed by content. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 20_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def fragment(self, obj: Any) -> bytes:
+        key = content_key(obj)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return data
+            self.misses += 1
+        data = _serialize(obj)
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+
+FRAGMENTS = FragmentCache()
+
+
+def json_array(fragments: Iterable[bytes]) -> Raw:
+    return Raw(b"[" + b",".join(fragments) + b"]")
+
+
+def json_object(fields: Sequence[Tuple[str, Any]]) -> bytes:
+    """
+    An object from (key, value) pairs in order; Raw values are spliced in
+    without re-encoding.
+    """
+    parts = [
+        dumps(key) + b":" + (value if isinstance(value, Raw) else dumps(value))
+        for key, value in fields
+    ]
+    return b"{" + b",".join(parts) + b"}"
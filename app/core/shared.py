@@ -0,0 +1,233 @@
+# app/core/shared.py
+
+"""
+Corpus snapshots and result pages shared between worker processes.
+
+With several uvicorn workers, one refresher process (app.refresher) fetches
+upstream and publishes each corpus as a snapshot file; workers only read.
+
+Snapshot file layout (one JSON document per line):
+
+    GASNAP1
+    {"version": ..., "published_at": ..., "count": n}
+    <gig 0>
+    ...
+    <gig n-1>
+
+Files are written under a temporary name and renamed into place, then the
+CURRENT file is swapped to point at the new one, so a reader never sees a
+partial snapshot. Old snapshots are unlinked after publishing.
+
+Workers attach to the current snapshot through a read-only mapping
+(MappedGigs) and keep only the offset of each line: a gig is parsed when it
+is read and then dropped, so the gig data sits once in the page cache
+(/dev/shm is a good GA_SHARED_DIR) however many workers there are. The
+token index each worker builds over the mapping (app.core.index) is still
+its own; that part of the memory grows with the number of workers.
+
+SharedResultCache stores finished response bodies keyed by their ETag, so
+a page computed by one worker is served by all of them. It holds about
+`max_entries` pages; the oldest go first.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from app.core.files import atomic_write
+from app.core.serialization import FRAGMENTS, dumps
+
+SNAPSHOT_MAGIC = b"GASNAP1\n"
+CURRENT = "CURRENT"
+KEEP_SNAPSHOTS = 2
+
+
+# -----------------------------
+# Publishing (refresher side)
+# -----------------------------
+def publish_snapshot(directory: str, gigs: Sequence[Dict[str, Any]], version: str) -> Path:
+    """
+    Write a snapshot for `version` and point CURRENT at it. Publishing the
+    version that is already current is a no-op.
+    """
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    name = f"corpus-{version}.snap"
+    path = root / name
+    if current_snapshot_name(directory) == name and path.exists():
+        return path
+
+    header = {"version": version, "published_at": time.time(), "count": len(gigs)}
+    chunks = [SNAPSHOT_MAGIC, dumps(header) + b"\n"]
+    chunks.extend(FRAGMENTS.fragment(g) + b"\n" for g in gigs)
+    atomic_write(path, chunks)
+    atomic_write(root / CURRENT, [name.encode("utf-8")])
+
+    old = sorted(root.glob("corpus-*.snap"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in old[KEEP_SNAPSHOTS:]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+def current_snapshot_name(directory: str) -> Optional[str]:
+    try:
+        return (Path(directory) / CURRENT).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class MappedGigs(Sequence[Dict[str, Any]]):
+    """
+    The gigs of one snapshot file, read through a read-only mapping.
+
+    Indexing parses that one line; nothing parsed is kept. The mapping stays
+    open for as long as the object is referenced, and the file can be
+    unlinked by the publisher meanwhile.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._view[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            self._view.close()
+            raise ValueError(f"{path} is not a corpus snapshot")
+        pos = len(SNAPSHOT_MAGIC)
+        end = self._view.find(b"\n", pos)
+        self.header: Dict[str, Any] = json.loads(self._view[pos:end])
+        # starts[i]..starts[i + 1] - 1 is line i (without its newline)
+        self._starts = array("Q", [end + 1])
+        for _ in range(self.header["count"]):
+            end = self._view.find(b"\n", self._starts[-1])
+            self._starts.append(end + 1)
+
+    def __len__(self) -> int:
+        return len(self._starts) - 1
+
+    @overload
+    def __getitem__(self, i: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("gig index out of range")
+        return json.loads(self._view[self._starts[i]:self._starts[i + 1] - 1])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self) -> None:
+        self._view.close()
+
+
+def read_snapshot(path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(header, gigs) from a snapshot file, fully parsed."""
+    mapped = MappedGigs(path)
+    try:
+        return mapped.header, list(mapped)
+    finally:
+        mapped.close()
+
+
+# -----------------------------
+# Attaching (worker side)
+# -----------------------------
+class SharedCorpus:
+    """
+    Reader for the published snapshots in `directory`.
+
+    `load()` returns the same MappedGigs object for as long as CURRENT does
+    not change, which CorpusStore takes as "unchanged, keep the built index".
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._name: Optional[str] = None
+        self._gigs: Optional[MappedGigs] = None
+        self.header: Dict[str, Any] = {}
+
+    @property
+    def published(self) -> bool:
+        return current_snapshot_name(self.directory) is not None
+
+    def load(self) -> MappedGigs:
+        name = current_snapshot_name(self.directory)
+        if name is None:
+            raise FileNotFoundError(f"no corpus published in {self.directory}")
+        if name != self._name or self._gigs is None:
+            # the previous mapping closes once the last snapshot using it goes
+            self._gigs = MappedGigs(Path(self.directory) / name)
+            self.header = self._gigs.header
+            self._name = name
+        return self._gigs
+
+
+class SharedResultCache:
+    """
+    Response bodies keyed by ETag, one file each, shared by every worker.
+    Entries of superseded corpus versions are removed by `prune`. `trim`
+    removes the least recently written ones beyond `max_entries`; it scans
+    the directory, so `put` only runs it every `trim_every` writes (a tenth
+    of `max_entries` by default) and the refresher runs it on every cycle.
+    Between trims each worker can add up to `trim_every` entries more.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 1000, trim_every: Optional[int] = None):
+        self.root = Path(directory) / "results"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.trim_every = max(1, trim_every if trim_every is not None else self.max_entries // 10)
+        self._puts = 0
+
+    def _path(self, version: str, etag: str) -> Path:
+        return self.root / f"{version}-{etag.strip(chr(34))}.json"
+
+    def get(self, version: str, etag: str) -> Optional[bytes]:
+        try:
+            return self._path(version, etag).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, version: str, etag: str, body: bytes) -> None:
+        atomic_write(self._path(version, etag), [body])
+        self._puts += 1
+        if self._puts % self.trim_every == 0:
+            self.trim()
+
+    def trim(self) -> int:
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:  # removed by another worker
+                        pass
+        if len(entries) <= self.max_entries:
+            return 0
+        entries.sort()
+        stale = entries[: len(entries) - self.max_entries]
+        for _, path in stale:
+            Path(path).unlink(missing_ok=True)
+        return len(stale)
+
+    def prune(self, keep_version: str) -> int:
+        removed = 0
+        for path in self.root.glob("*.json"):
+            if not path.name.startswith(f"{keep_version}-"):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
@@ -0,0 +1,64 @@
+# app/core/streaming.py
+
+"""
+NDJSON streaming for search responses.
+
+A streamed response is one JSON document per line: a header object first
+(everything except the gigs), then one gig per line as the ranking yields
+it. Nothing is buffered beyond the line being written, so the first bytes
+go out before later gigs are even built.
+
+Clients opt in with `Accept: application/x-ndjson` or `?stream=1`.
+
+Server-Sent Events (text/event-stream) are used for pushed alerts.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterable, Dict, Iterable, Iterator, Optional
+
+from starlette.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_ndjson(accept: Optional[str], stream: bool = False) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in (accept or "")
+
+
+def ndjson_line(obj: Any) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+def ndjson_lines(header: Dict[str, Any], items: Iterable[Any]) -> Iterator[bytes]:
+    """Items that are bytes are taken to be serialized JSON already."""
+    yield ndjson_line(header)
+    for item in items:
+        yield item + b"\n" if isinstance(item, bytes) else ndjson_line(item)
+
+
+def ndjson_response(header: Dict[str, Any], items: Iterable[Any], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    return StreamingResponse(ndjson_lines(header, items), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+def sse_event(data: bytes, event: Optional[str] = None, event_id: Optional[str] = None) -> bytes:
+    """One SSE message; `data` is a single line of JSON."""
+    head = b""
+    if event_id is not None:
+        head += b"id: " + event_id.encode("utf-8") + b"\n"
+    if event is not None:
+        head += b"event: " + event.encode("utf-8") + b"\n"
+    return head + b"data: " + data + b"\n\n"
+
+
+SSE_KEEPALIVE = b": keep-alive\n\n"
+
+
+def sse_response(events: AsyncIterable[bytes], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})},
+    )
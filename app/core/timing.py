@@ -0,0 +1,80 @@
+# app/core/timing.py
+
+"""
+Per-request stage spans, reported in a Server-Timing header.
+
+    with request_timer() as timer:
+        with span("score"):
+            ...
+    response.headers["Server-Timing"] = timer.header()
+
+`span()` always feeds the stage histogram in app.core.metrics; when a
+request timer is active (a context variable, so nested helpers need no
+extra parameter) it also records the span for that request. Off the
+request path, or with no timer, a span costs two perf_counter() calls.
+
+Spans with the same name add up, e.g. "score" in a batch search.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from app.core.metrics import STAGE_SECONDS, Histogram
+
+_current: ContextVar[Optional["RequestTimer"]] = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: Dict[str, float] = {}  # name -> seconds, in first-seen order
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def timings(self) -> Dict[str, float]:
+        """Milliseconds per span, plus "total"."""
+        out = {name: round(seconds * 1000, 3) for name, seconds in self.spans.items()}
+        out["total"] = round(self.total() * 1000, 3)
+        return out
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.timings().items())
+
+
+@contextmanager
+def request_timer() -> Iterator[RequestTimer]:
+    timer = RequestTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, histogram: Histogram = STAGE_SECONDS, **labels: str) -> Iterator[None]:
+    """
+    Time a stage. Observed into `histogram` with `labels` (default:
+    stage=name) and added to the active request timer, if any.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        histogram.observe(seconds, **(labels or {"stage": name}))
+        timer = _current.get()
+        if timer is not None:
+            timer.add(name, seconds)
@@ -1,60 +1,170 @@
+"""
+Streaming exporters: listings go out one at a time, so memory stays flat
+however many there are.
+
+    export(gigs, ["gigs.json", "gigs.csv.gz", ("report.txt", "md")])
+
+`export` makes a single pass over any iterable (a generator is fine) and
+feeds every target as it goes. The format comes from the file suffix
+(.json, .jsonl / .ndjson, .csv, .md) unless given explicitly, and a
+trailing .gz (or compress=True) gzips the output.
+
+CSV needs its columns up front: pass `fieldnames` (GIG_FIELDS covers the
+gigs the CLI writes), or the writer holds the first `sample` rows, takes
+the union of their keys as the header, and streams from there on. Keys
+outside the header are left out of the file; their names are logged once,
+when it is closed.
+"""
+
 from __future__ import annotations
 from pathlib import Path
-import json
 import csv
-from typing import Sequence, Mapping, Any, Iterable
+import gzip
+import json
+import logging
+from contextlib import ExitStack
+from typing import IO, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from app.core.logs import get_logger, log_event
+
+log = get_logger(__name__)
+
+Target = Union[str, Path, Tuple[Union[str, Path], str]]
+
+CSV_SAMPLE = 100
+
+# Every key a fetched, deduped and scored gig can carry (providers,
+# app.core.dates, app.core.dedupe, CLI scoring), in the sorted order a
+# sampled header would have
+GIG_FIELDS = sorted({
+    "source", "id", "position", "title", "company", "tags", "url", "description",
+    "location", "salary", "remote", "date", "epoch", "published", "posted_epoch",
+    "duplicates", "score", "explain",
+})
 
 
 def _to_path(path: str | Path) -> Path:
     return Path(path)
 
 
-def save_json(listings: Sequence[Mapping[str, Any]], path: str | Path) -> None:
+def format_for(path: str | Path, default: Optional[str] = None) -> str:
     """
-    Save listings as pretty-printed JSON.
+    Export format from a file name: gigs.csv.gz -> "csv". An unknown
+    suffix gives `default`, or a ValueError without one.
     """
-    p = _to_path(path)
-    p.write_text(
-        json.dumps(listings, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
-    print(f"[export] JSON      → {p}")
+    suffixes = [s.lower() for s in _to_path(path).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    suffix = suffixes[-1].lstrip(".") if suffixes else ""
+    fmt = "jsonl" if suffix == "ndjson" else suffix
+    if fmt not in WRITERS:
+        if default is not None:
+            return default
+        raise ValueError(f"can't tell the export format of {path}; use one of {', '.join(WRITERS)}")
+    return fmt
 
 
-def save_csv(listings: Sequence[Mapping[str, Any]], path: str | Path) -> None:
-    """
-    Save listings as a flat CSV. We collect all keys that appear in any listing
-    and use them as columns.
-    """
+def open_output(path: str | Path, compress: Optional[bool] = None) -> IO[str]:
+    """A text stream to `path`, gzipped if it ends in .gz (or compress=True)."""
     p = _to_path(path)
+    if compress is None:
+        compress = p.suffix.lower() == ".gz"
+    if compress:
+        return gzip.open(p, "wt", encoding="utf-8", newline="")
+    return p.open("w", encoding="utf-8", newline="")
 
-    if not listings:
-        p.write_text("", encoding="utf-8")
-        print(f"[export] CSV       → {p} (no rows)")
-        return
 
-    # union of keys across all listings
-    fieldnames = sorted({key for item in listings for key in item.keys()})
+# -----------------------------
+# Writers
+# -----------------------------
+class JsonWriter:
+    """A JSON array, laid out like json.dumps(listings, indent=2)."""
 
-    with p.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for item in listings:
-            row = {k: item.get(k, "") for k in fieldnames}
-            writer.writerow(row)
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.rows = 0
 
-    print(f"[export] CSV       → {p}")
+    def write(self, item: Mapping[str, Any]) -> None:
+        self.f.write("[\n  " if not self.rows else ",\n  ")
+        # strings never contain raw newlines, so this only indents structure
+        self.f.write(json.dumps(item, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+        self.rows += 1
 
+    def close(self) -> None:
+        self.f.write("\n]" if self.rows else "[]")
 
-def save_md(listings: Sequence[Mapping[str, Any]], path: str | Path) -> None:
-    """
-    Save listings as a Markdown report, roughly human-readable.
-    """
-    p = _to_path(path)
 
-    lines: list[str] = ["# Gig Agent Results", ""]
+class JsonLinesWriter:
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.rows = 0
+
+    def write(self, item: Mapping[str, Any]) -> None:
+        self.f.write(json.dumps(item, ensure_ascii=False))
+        self.f.write("\n")
+        self.rows += 1
+
+    def close(self) -> None:
+        pass
+
+
+class CsvWriter:
+    """Flat CSV with declared `fieldnames`, or the keys of the first `sample` rows."""
+
+    def __init__(self, f: IO[str], fieldnames: Optional[Sequence[str]] = None, sample: int = CSV_SAMPLE):
+        self.f = f
+        self.sample = max(1, sample)
+        self.rows = 0
+        self._pending: List[Mapping[str, Any]] = []
+        self._writer: Optional[csv.DictWriter] = None
+        self._columns: frozenset = frozenset()
+        self._dropped: set = set()
+        if fieldnames is not None:
+            self._start(list(fieldnames))
+
+    def _start(self, fieldnames: List[str]) -> None:
+        self._columns = frozenset(fieldnames)
+        self._writer = csv.DictWriter(self.f, fieldnames=fieldnames, restval="", extrasaction="ignore")
+        self._writer.writeheader()
+        for item in self._pending:
+            self._writer.writerow(item)
+        self._pending = []
+
+    def write(self, item: Mapping[str, Any]) -> None:
+        self.rows += 1
+        if self._writer is not None:
+            if not self._columns.issuperset(item):
+                self._dropped.update(key for key in item if key not in self._columns)
+            self._writer.writerow(item)
+            return
+        self._pending.append(item)
+        if len(self._pending) >= self.sample:
+            self._start(sorted({key for row in self._pending for key in row.keys()}))
+
+    def close(self) -> None:
+        # no rows and no declared columns: an empty file, as before
+        if self._writer is None and self._pending:
+            self._start(sorted({key for row in self._pending for key in row.keys()}))
+        if self._dropped:
+            log_event(log, "export.csv_dropped_columns", logging.WARNING, columns=sorted(self._dropped))
 
-    for i, item in enumerate(listings, start=1):
+
+class MarkdownWriter:
+    """A Markdown report, roughly human-readable."""
+
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.rows = 0
+        self._lines = 0
+        for line in ("# Gig Agent Results", ""):
+            self._line(line)
+
+    def _line(self, text: str) -> None:
+        self.f.write(f"\n{text}" if self._lines else text)
+        self._lines += 1
+
+    def write(self, item: Mapping[str, Any]) -> None:
+        self.rows += 1
         title = item.get("title", "(no title)")
         company = item.get("company", "")
         location = item.get("location", "")
@@ -62,7 +172,7 @@ def save_md(listings: Sequence[Mapping[str, Any]], path: str | Path) -> None:
         source = item.get("source", "")
         score = item.get("score")
 
-        lines.append(f"## {i}. {title}")
+        self._line(f"## {self.rows}. {title}")
 
         meta_bits = []
         if company:
@@ -73,15 +183,81 @@ def save_md(listings: Sequence[Mapping[str, Any]], path: str | Path) -> None:
             meta_bits.append(f"[{source}]")
 
         if meta_bits:
-            lines.append("**" + " • ".join(meta_bits) + "**")
+            self._line("**" + " • ".join(meta_bits) + "**")
 
         if score is not None:
-            lines.append(f"_Score: {score}_")
+            self._line(f"_Score: {score}_")
 
         if url:
-            lines.append(f"[View listing]({url})")
+            self._line(f"[View listing]({url})")
+
+        self._line("")  # blank line between entries
+
+    def close(self) -> None:
+        pass
+
+
+WRITERS: Dict[str, Any] = {
+    "json": JsonWriter,
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+    "md": MarkdownWriter,
+}
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def export(
+    listings: Iterable[Mapping[str, Any]],
+    targets: Sequence[Target],
+    fieldnames: Optional[Sequence[str]] = None,
+    compress: Optional[bool] = None,
+) -> int:
+    """
+    Write `listings` to every target in one pass; returns the row count.
+    A target is a path (format from its suffix) or a (path, format) pair.
+    """
+    with ExitStack() as stack:
+        outputs = []
+        for target in targets:
+            path, fmt = target if isinstance(target, tuple) else (target, format_for(target))
+            if fmt not in WRITERS:
+                raise ValueError(f"unknown export format {fmt!r}; use one of {', '.join(WRITERS)}")
+            f = stack.enter_context(open_output(path, compress))
+            writer = CsvWriter(f, fieldnames) if fmt == "csv" else WRITERS[fmt](f)
+            outputs.append((str(path), fmt, writer))
+
+        rows = 0
+        for item in listings:
+            for _, _, writer in outputs:
+                writer.write(item)
+            rows += 1
+        for _, _, writer in outputs:
+            writer.close()
 
-        lines.append("")  # blank line between entries
+    for path, fmt, _ in outputs:
+        log_event(log, "export.written", format=fmt, path=path, rows=rows)
+    return rows
 
-    p.write_text("\n".join(lines), encoding="utf-8")
-    print(f"[export] Markdown  → {p}")
+
+def save_json(listings: Iterable[Mapping[str, Any]], path: str | Path) -> None:
+    """
+    Save listings as pretty-printed JSON.
+    """
+    export(listings, [(path, "json")])
+
+
+def save_csv(listings: Iterable[Mapping[str, Any]], path: str | Path) -> None:
+    """
+    Save listings as a flat CSV. The columns are the keys of the first
+    CSV_SAMPLE listings.
+    """
+    export(listings, [(path, "csv")])
+
+
+def save_md(listings: Iterable[Mapping[str, Any]], path: str | Path) -> None:
+    """
+    Save listings as a Markdown report, roughly human-readable.
+    """
+    export(listings, [(path, "md")])
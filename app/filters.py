@@ -1,8 +1,12 @@
 from __future__ import annotations
-from datetime import datetime, timedelta
 import re
 from typing import List, Dict, Any, Iterable
 
+from app.core.dates import cutoff_epoch, posted_epoch
+from app.core.filtering import FilterChain, ListingView, Predicate, compile_chain, query_predicate
+from app.core.index import CorpusIndex
+from app.core.query import parse_query
+
 def accept(listing, *args, **kwargs) -> bool:
     """
     Backwards-compatibility shim for older code that imported `accept`
@@ -35,32 +39,10 @@ def dedupe_listings(listings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 def _matches_query(listing: Dict[str, Any], query: str) -> bool:
     """
-    Very simple query matcher:
-    - supports 'AND' between terms
-    - otherwise treats it as space-separated terms
-    - matches against title + company + description text
+    Match one listing against a query (see app.core.query for the syntax)
+    across title + company + description. The parsed query is memoized.
     """
-    if not query:
-        return True
-
-    text_parts = [
-        listing.get("title", ""),
-        listing.get("company", ""),
-        listing.get("description", ""),
-    ]
-    haystack = " ".join(p for p in text_parts if p).lower()
-
-    # split on 'AND' first
-    and_parts = [part.strip() for part in query.split("AND")]
-    for part in and_parts:
-        if not part:
-            continue
-        # each part may have multiple words; all must appear
-        words = part.lower().split()
-        if not all(word in haystack for word in words):
-            return False
-
-    return True
+    return parse_query(query).matches(listing)
 
 
 def _is_remote(listing: Dict[str, Any]) -> bool:
@@ -82,41 +64,25 @@ def _is_remote(listing: Dict[str, Any]) -> bool:
     return False
 
 
-def _within_days(listing: Dict[str, Any], days: int) -> bool:
+def _within_days(listing: Dict[str, Any], days: int, cutoff: int | None = None) -> bool:
     """
     Filter listing by an approximate 'posted within N days' rule.
-    Tries posted_at or date-like fields.
+    Uses the posted_epoch stamped at ingest (parsed from the listing's
+    date fields if it hasn't been stamped yet).
     """
     if not days or days <= 0:
         return True
 
-    # Look for a few common date fields
-    raw = (
-        listing.get("posted_at")
-        or listing.get("date")
-        or listing.get("created_at")
-        or listing.get("published_at")
-    )
-    if not raw:
-        # No date info → keep it by default (we can adjust later)
-        return True
-
-    # Try a couple of basic parse strategies
-    dt = None
-    for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S"):
-        try:
-            dt = datetime.strptime(raw, fmt)
-            break
-        except Exception:
-            continue
-
-    if dt is None:
-        # Unknown format → keep it for now
+    epoch = listing.get("posted_epoch")
+    if not isinstance(epoch, int):
+        epoch = posted_epoch(listing)
+    if epoch is None:
+        # No usable date info → keep it by default (we can adjust later)
         return True
 
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    # naive vs aware safety: compare using .timestamp()
-    return dt.timestamp() >= cutoff.timestamp()
+    if cutoff is None:
+        cutoff = cutoff_epoch(days)
+    return epoch >= cutoff
 
 
 def _blocked_company(listing: Dict[str, Any], blocked: Iterable[str]) -> bool:
@@ -149,6 +115,91 @@ def _role_allowed(listing: Dict[str, Any], allowed: Iterable[str]) -> bool:
     return False
 
 
+# -----------------------------
+# Compiled predicates
+# -----------------------------
+# Same rules as the helpers above, with the per-call parsing done once up
+# front and fields read through the shared ListingView.
+def _remote_predicate(remote_only: bool) -> Predicate | None:
+    if not remote_only:
+        return None
+
+    def test(view: ListingView) -> bool:
+        return (
+            view.get("is_remote") is True
+            or "remote" in view.field("location")
+            or "remote" in view.field("title")
+        )
+
+    return Predicate("remote", test, cost=2.0, pass_rate=0.7)
+
+
+def _posted_predicate(days: int | None) -> Predicate | None:
+    if not days or days <= 0:
+        return None
+    cutoff = cutoff_epoch(days)
+
+    def test(view: ListingView) -> bool:
+        epoch = view.get("posted_epoch")
+        if not isinstance(epoch, int):
+            epoch = posted_epoch(view.listing)
+        return epoch is None or epoch >= cutoff
+
+    return Predicate("posted_within", test, cost=1.0, pass_rate=0.5)
+
+
+def _csv_lower(raw: str | None) -> List[str]:
+    return [c.strip().lower() for c in (raw or "").split(",") if c.strip()]
+
+
+def _company_predicate(company_block: str | None) -> Predicate | None:
+    blocked = _csv_lower(company_block)
+    if not blocked:
+        return None
+
+    def test(view: ListingView) -> bool:
+        company = view.field("company")
+        return not any(b in company for b in blocked)
+
+    return Predicate("company_block", test, cost=2.0, pass_rate=0.95)
+
+
+def _role_predicate(role_allow: str | None) -> Predicate | None:
+    allowed = _csv_lower(role_allow)
+    if not allowed:
+        return None
+
+    def test(view: ListingView) -> bool:
+        title = view.field("title")
+        return any(a in title for a in allowed)
+
+    return Predicate("role_allow", test, cost=2.0, pass_rate=0.3)
+
+
+def compile_filters(
+    query: str | None = None,
+    remote_only: bool = False,
+    posted_within: int | None = None,
+    company_block: str | None = None,
+    role_allow: str | None = None,
+    index: CorpusIndex | None = None,
+) -> FilterChain:
+    """
+    Compile the filter options into one predicate chain (see apply_filters).
+    The query is matched per listing, or resolved against `index` when one
+    covering the listings the chain will see is given.
+    """
+    return compile_chain(
+        [
+            query_predicate(parse_query(query), index),
+            _remote_predicate(remote_only),
+            _posted_predicate(posted_within),
+            _company_predicate(company_block),
+            _role_predicate(role_allow),
+        ]
+    )
+
+
 def apply_filters(
     listings: Iterable[Dict[str, Any]],
     query: str | None = None,
@@ -156,42 +207,20 @@ def apply_filters(
     posted_within: int | None = None,
     company_block: str | None = None,
     role_allow: str | None = None,
+    index: CorpusIndex | None = None,
 ) -> List[Dict[str, Any]]:
     """
-    Apply a pipeline of filters to the listing set.
+    Filter the listing set in a single pass.
 
-    - query: simple AND query across title/company/description
+    - query: query across title/company/description (AND/OR/NOT, "phrases",
+      title:/company:/tag: prefixes, word* wildcards; see app.core.query)
     - remote_only: keep only remote-friendly roles
     - posted_within: keep jobs posted within N days (best-effort)
     - company_block: comma-separated list of company name fragments to exclude
     - role_allow: comma-separated list of role fragments to include
-    """
-    result = list(listings)
-
-    # Text query
-    if query:
-        result = [l for l in result if _matches_query(l, query)]
-
-    # Remote only
-    if remote_only:
-        result = [l for l in result if _is_remote(l)]
 
-    # Posted within N days
-    if posted_within:
-        result = [l for l in result if _within_days(l, posted_within)]
-
-    # Company blocklist
-    blocked = []
-    if company_block:
-        blocked = [c.strip() for c in company_block.split(",") if c.strip()]
-        if blocked:
-            result = [l for l in result if not _blocked_company(l, blocked)]
-
-    # Role allow-list
-    allowed = []
-    if role_allow:
-        allowed = [r.strip() for r in role_allow.split(",") if r.strip()]
-        if allowed:
-            result = [l for l in result if _role_allowed(l, allowed)]
-
-    return result
+    Pass `index` when a CorpusIndex over `listings` already exists; without
+    one the query is matched listing by listing.
+    """
+    chain = compile_filters(query, remote_only, posted_within, company_block, role_allow, index)
+    return chain.apply(listings)
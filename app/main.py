@@ -1,13 +1,20 @@
 from __future__ import annotations
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Request, Response
 from typing import List
+from itertools import islice
 import asyncio
+import hashlib
 
 from .models import ScoredGig, Gig
-from .sources.remoteok import RemoteOK
+from .sources.remoteok_api import RemoteOK
 from .sources.wwr import WeWorkRemotely
-from .scoring import rank_gigs
 from .filters import accept
+from .core.scoring import score_gig
+from .core.streaming import ndjson_response, wants_ndjson
+from .core.caching import cache_control, etag_matches, make_etag
+from .core.serialization import FRAGMENTS, json_array, json_object
+from .core.timing import request_timer, span
+from .settings import get_settings
 
 app = FastAPI(title="Gig Agent", version="0.1.0")
 
@@ -15,14 +22,63 @@ app = FastAPI(title="Gig Agent", version="0.1.0")
 def health():
     return {"ok": True}
 
+def rank_gigs(gigs: List[Gig]) -> List[ScoredGig]:
+    """Best first (ties by id). The gigs were validated at ingest, so the
+    scored copies skip validation."""
+    scored = [ScoredGig.model_construct(**g.__dict__, score=score_gig(g.__dict__)) for g in gigs]
+    scored.sort(key=lambda g: (-g.score, g.id))
+    return scored
+
+def corpus_version(gigs: List[Gig]) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for g in gigs:
+        digest.update(FRAGMENTS.fragment(g))
+    return digest.hexdigest()
+
 @app.get("/gigs", response_model=List[ScoredGig])
-async def gigs(limit: int = Query(25, ge=1, le=200)):
-    sources = [RemoteOK(), WeWorkRemotely()]
-    results: List[Gig] = []
-    fetched = await asyncio.gather(*[s.fetch(limit=limit) for s in sources])
-    for group in fetched:
-        for g in group:
-            if accept(g):
-                results.append(g)
-    ranked = rank_gigs(results)[:limit]
-    return ranked
+async def gigs(
+    request: Request,
+    limit: int = Query(25, ge=1, le=200),
+    stream: bool = Query(False),
+    debug: bool = Query(False),
+):
+    # Server-Timing carries the per-stage spans; with debug=1 the gigs come
+    # back as {"gigs": [...], "timings": {...}} instead of a bare list
+    with request_timer() as timer:
+        sources = [RemoteOK(), WeWorkRemotely()]
+        results: List[Gig] = []
+        with span("fetch"):
+            fetched = await asyncio.gather(*[s.fetch(limit=limit) for s in sources])
+        ndjson = wants_ndjson(request.headers.get("accept"), stream)
+        # the ranking only depends on what was fetched, so answer 304 before filtering
+        headers = {
+            "ETag": make_etag(corpus_version([g for group in fetched for g in group]), limit, ndjson),
+            "Cache-Control": cache_control(int(get_settings().refresh_seconds)),
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            headers["Server-Timing"] = timer.header()
+            return Response(status_code=304, headers=headers)
+        with span("filter"):
+            for group in fetched:
+                for g in group:
+                    if accept(g):
+                        results.append(g)
+        with span("score"):
+            ranked = rank_gigs(results)
+        # Gigs were validated when the sources built them; returning bytes skips
+        # response_model re-validation, and each gig's JSON is cached by content
+        fragments = (FRAGMENTS.fragment(g) for g in islice(ranked, limit))
+        if ndjson:
+            # one line per gig, serialized as it is sent
+            # same header shape as app.api; this endpoint has no profiles or cursors
+            header = {"profile_used": None, "next_cursor": None}
+            headers["Server-Timing"] = timer.header()
+            return ndjson_response(header, fragments, headers=headers)
+        with span("serialize"):
+            body = json_array(fragments)
+    headers["Server-Timing"] = timer.header()
+    if debug:
+        headers.pop("ETag")
+        headers["Cache-Control"] = "no-store"
+        body = json_object([("gigs", body), ("timings", timer.timings())])
+    return Response(body, media_type="application/json", headers=headers)
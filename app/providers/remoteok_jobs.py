@@ -1,20 +1,78 @@
 # app/providers/remoteok.py
 
-from typing import List, Dict
-import httpx
+from typing import Any, List, Dict, Optional
 
 REMOTEOK_API = "https://remoteok.com/api"
+USER_AGENT = "gig-agent/0.1"
 
 
 async def fetch_remoteok_jobs(limit: int = 25) -> List[Dict]:
     """
     Fetch jobs from the RemoteOK API and return a list of normalized gig dicts.
     """
-    async with httpx.AsyncClient(timeout=30.0, headers={"User-Agent": "gig-agent/0.1"}) as client:
+    import httpx  # imported on first fetch; it dominates cold-start time
+
+    async with httpx.AsyncClient(timeout=30.0, headers={"User-Agent": USER_AGENT}) as client:
         resp = await client.get(REMOTEOK_API)
         resp.raise_for_status()
         data = resp.json()
 
+    return parse_jobs(data, limit)
+
+
+class RemoteOKFeed:
+    """
+    RemoteOK for long-running callers (the CLI --watch mode): one HTTP
+    client kept open across polls, and conditional GETs with the last
+    ETag / Last-Modified. On a 304 the previous gigs are returned without
+    re-parsing, and `not_modified` is set.
+
+        async with RemoteOKFeed() as feed:
+            gigs = await feed.fetch(limit=25)
+    """
+
+    def __init__(self, url: str = REMOTEOK_API, client: Any = None):
+        self.url = url
+        self._client = client
+        self._validators: Dict[str, str] = {}
+        self._gigs: Optional[List[Dict]] = None
+        self._limit = 0
+        self.not_modified = False
+
+    async def __aenter__(self) -> "RemoteOKFeed":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, limit: int = 25) -> List[Dict]:
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(timeout=30.0, headers={"User-Agent": USER_AGENT})
+
+        cached = self._gigs is not None and self._limit == limit
+        resp = await self._client.get(self.url, headers=self._validators if cached else {})
+        self.not_modified = cached and resp.status_code == 304
+        if self.not_modified:
+            return [dict(g) for g in self._gigs]
+        resp.raise_for_status()
+
+        self._validators = {}
+        if resp.headers.get("etag"):
+            self._validators["If-None-Match"] = resp.headers["etag"]
+        if resp.headers.get("last-modified"):
+            self._validators["If-Modified-Since"] = resp.headers["last-modified"]
+        self._gigs, self._limit = parse_jobs(resp.json(), limit), limit
+        return [dict(g) for g in self._gigs]
+
+
+def parse_jobs(data: Any, limit: int) -> List[Dict]:
     # RemoteOK has a metadata element at index 0, then jobs
     jobs_raw = data[1:] if data and isinstance(data, list) else data
 
@@ -31,6 +89,8 @@ async def fetch_remoteok_jobs(limit: int = 25) -> List[Dict]:
                 "description": job.get("description"),
                 "location": job.get("location") or "Remote",
                 "salary": job.get("salary") or job.get("compensation"),
+                "date": job.get("date"),
+                "posted_epoch": job.get("epoch"),  # seconds, UTC
             }
         )
     return gigs
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
+import calendar
 from typing import List, Dict, Optional, Tuple
 
-import feedparser
-from bs4 import BeautifulSoup
-
 # WWR has an "all jobs" feed plus category feeds.
 WWR_FEEDS = [
     "https://weworkremotely.com/remote-jobs.rss",  # all jobs
@@ -13,10 +11,18 @@ WWR_FEEDS = [
     # "https://weworkremotely.com/categories/remote-sales-and-marketing-jobs.rss",
 ]
 
+# feedparser and BeautifulSoup are imported on first fetch, not at startup
 def _extract_text(html: str) -> str:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html or "", "html.parser")
     return soup.get_text(" ", strip=True)
 
+def _published_epoch(entry) -> Optional[int]:
+    # feedparser already parsed the RSS date into a UTC struct_time
+    parsed = getattr(entry, "published_parsed", None)
+    return calendar.timegm(parsed) if parsed else None
+
 def _parse_title_company(raw_title: str) -> Tuple[str, Optional[str]]:
     # Common WWR RSS title format: "Company: Role"
     if not raw_title:
@@ -27,6 +33,8 @@ def _parse_title_company(raw_title: str) -> Tuple[str, Optional[str]]:
     return raw_title.strip(), None
 
 async def fetch_wwr_jobs(limit: int = 50) -> List[Dict]:
+    import feedparser
+
     gigs: List[Dict] = []
 
     for url in WWR_FEEDS:
@@ -57,6 +65,8 @@ async def fetch_wwr_jobs(limit: int = 50) -> List[Dict]:
                 "location": "Remote",       # nicer than None for display
                 "salary": None,             # match RemoteOK schema
                 "remote": True,
+                "published": getattr(entry, "published", None),
+                "posted_epoch": _published_epoch(entry),  # seconds, UTC
             }
     )
 
@@ -0,0 +1,87 @@
+# app/refresher.py
+
+"""
+Corpus refresher for multi-worker deployments.
+
+    GA_SHARED_DIR=/dev/shm/gig-agent python -m app.refresher
+    GA_SHARED_DIR=/dev/shm/gig-agent uvicorn app.api:app --workers 4
+
+This is the only process that talks to the job boards. Every
+GA_REFRESH_SECONDS it fetches, stamps and dedupes the gigs (the same
+pipeline a single worker runs) and publishes them as a snapshot in
+GA_SHARED_DIR (app.core.shared). Workers pick up a new version within
+GA_SHARED_POLL_SECONDS; result pages cached for older versions are pruned
+and the shared result cache is trimmed to GA_SHARED_RESULTS_MAX.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from app.api import fetch_corpus
+from app.core.index import CorpusIndex
+from app.core.logs import configure_logging, get_logger, log_event
+from app.core.shared import SharedResultCache, publish_snapshot
+from app.settings import get_settings
+
+log = get_logger(__name__)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="gig-agent corpus refresher")
+    parser.add_argument(
+        "--dir",
+        default=settings.shared_dir,
+        help="Shared directory the workers read (default: GA_SHARED_DIR)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=settings.refresh_seconds,
+        help="Seconds between fetches (default: GA_REFRESH_SECONDS)",
+    )
+    parser.add_argument("--once", action="store_true", help="Publish one snapshot and exit")
+    return parser.parse_args(argv)
+
+
+async def refresh_once(directory: str) -> str:
+    gigs = await fetch_corpus()
+    version = CorpusIndex(gigs).version
+    path = publish_snapshot(directory, gigs, version)
+    results = SharedResultCache(directory, max_entries=get_settings().shared_results_max)
+    pruned = results.prune(version) + results.trim()
+    log_event(log, "snapshot.published", file=path.name, gigs=len(gigs), pruned_results=pruned)
+    return version
+
+
+async def run(directory: str, interval: float, once: bool = False) -> None:
+    while True:
+        started = time.monotonic()
+        try:
+            await refresh_once(directory)
+        except Exception as e:
+            # keep serving the last published snapshot
+            log_event(log, "refresh.failed", logging.ERROR, error=repr(e))
+            if once:
+                raise
+        if once:
+            return
+        await asyncio.sleep(max(1.0, interval - (time.monotonic() - started)))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    settings = get_settings()
+    configure_logging(settings.log_level, settings.log_format, settings.log_sample)
+    if not args.dir:
+        print("Set GA_SHARED_DIR or pass --dir.")
+        return 2
+    asyncio.run(run(args.dir, args.interval, once=args.once))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
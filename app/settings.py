@@ -2,6 +2,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 import os
 from datetime import timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.core.dedupe import DedupeConfig
 
 def _csv(name: str) -> list[str]:
     raw = os.getenv(name, "") or ""
@@ -14,6 +18,29 @@ class Settings:
     min_pay: float | None
     remote_only: bool
     allow_contracts: bool
+    scoring_engine: str
+    scoring_workers: int
+    parallel_min_gigs: int
+    dedupe: bool
+    dedupe_threshold: float
+    dedupe_bands: int
+    refresh_seconds: float
+    shared_dir: str
+    shared_poll_seconds: float
+    shared_results_max: int
+    admission_limit: int
+    admission_max: int
+    admission_queue: int
+    admission_queue_timeout: float
+    admission_degrade: bool
+    log_level: str
+    log_format: str
+    log_sample: str
+    config_dir: str
+    profile_poll_seconds: float
+    seen_file: str
+    seen_capacity: int
+    watch_min_score: float
 
     @classmethod
     def load(cls) -> "Settings":
@@ -23,16 +50,83 @@ class Settings:
             min_pay=float(os.getenv("GA_MIN_PAY")) if os.getenv("GA_MIN_PAY") else None,
             remote_only=(os.getenv("GA_REMOTE_ONLY", "true").lower() == "true"),
             allow_contracts=(os.getenv("GA_ALLOW_CONTRACTS", "true").lower() == "true"),
+            scoring_engine=os.getenv("GA_SCORING_ENGINE", "index").strip().lower(),
+            # 0 = one worker per CPU; 1 = always score in-process
+            scoring_workers=int(os.getenv("GA_SCORING_WORKERS", "0")),
+            parallel_min_gigs=int(os.getenv("GA_PARALLEL_MIN_GIGS", "5000")),
+            # near-duplicate removal at ingest (app.core.dedupe)
+            dedupe=(os.getenv("GA_DEDUPE", "true").lower() == "true"),
+            dedupe_threshold=float(os.getenv("GA_DEDUPE_THRESHOLD", "0.6")),
+            dedupe_bands=int(os.getenv("GA_DEDUPE_BANDS", "24")),
+            # how long a fetched corpus is served before refetching (also Cache-Control max-age)
+            refresh_seconds=float(os.getenv("GA_REFRESH_SECONDS", "300")),
+            # multi-worker mode: app.refresher publishes here, workers only read
+            shared_dir=os.getenv("GA_SHARED_DIR", "").strip(),
+            shared_poll_seconds=float(os.getenv("GA_SHARED_POLL_SECONDS", "5")),
+            shared_results_max=int(os.getenv("GA_SHARED_RESULTS_MAX", "1000")),
+            # search admission control (app.core.admission); GA_ADMISSION_MAX=0 turns it off
+            admission_limit=int(os.getenv("GA_ADMISSION_LIMIT", "8")),
+            admission_max=int(os.getenv("GA_ADMISSION_MAX", "64")),
+            admission_queue=int(os.getenv("GA_ADMISSION_QUEUE", "32")),
+            admission_queue_timeout=float(os.getenv("GA_ADMISSION_QUEUE_TIMEOUT", "1.0")),
+            # when shedding, serve the last cached ranking for the profile if there is one
+            admission_degrade=(os.getenv("GA_ADMISSION_DEGRADE", "true").lower() == "true"),
+            # structured logging (app.core.logs): json or text; per-message keep rates
+            log_level=os.getenv("GA_LOG_LEVEL", "INFO").strip().upper(),
+            log_format=os.getenv("GA_LOG_FORMAT", "json").strip().lower(),
+            log_sample=os.getenv("GA_LOG_SAMPLE", "search.request=0.01,search.ranked=0.01"),
+            # profile registry (app.core.profiles): configs/ by default; 0 = no hot reload
+            config_dir=os.getenv("GA_CONFIG_DIR", "").strip(),
+            profile_poll_seconds=float(os.getenv("GA_PROFILE_POLL_SECONDS", "5")),
+            # CLI --watch (app.core.seen): seen-set file, gigs per generation, report threshold
+            seen_file=os.getenv("GA_SEEN_FILE", "").strip()
+            or os.path.join(os.path.expanduser("~"), ".cache", "gig-agent", "seen.bloom"),
+            seen_capacity=int(os.getenv("GA_SEEN_CAPACITY", "100000")),
+            watch_min_score=float(os.getenv("GA_WATCH_MIN_SCORE", "1")),
         )
 
-settings = Settings.load()
+    def dedupe_config(self) -> "DedupeConfig":
+        from app.core.dedupe import DedupeConfig
+
+        try:
+            return DedupeConfig(bands=self.dedupe_bands, threshold=self.dedupe_threshold)
+        except ValueError as exc:
+            raise ValueError(f"GA_DEDUPE_BANDS: {exc}") from None
+
+_dotenv_loaded = False
+_settings: Settings | None = None
+
+
+def _load_dotenv() -> None:
+    # Try to load .env if python-dotenv is available; otherwise rely on process env
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv  # optional
+        load_dotenv()
+    except Exception:
+        pass
+
+
+def get_settings() -> Settings:
+    """
+    The process settings, read from the environment (and .env) on first
+    use rather than at import time.
+    """
+    global _settings
+    if _settings is None:
+        _load_dotenv()
+        _settings = Settings.load()
+    return _settings
+
 
-# Try to load .env if python-dotenv is available; otherwise rely on process env
-try:
-    from dotenv import load_dotenv  # optional
-    load_dotenv()
-except Exception:
-    pass
+def __getattr__(name: str):
+    # `from app.settings import settings` keeps working, built on first access
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def _get(name: str, default: str = "") -> str:
     v = os.getenv(name)
@@ -45,12 +139,15 @@ def _get_float(name: str, default: float) -> float:
         return default
 
 def get_scoring_settings():
+    _load_dotenv()
     # keywords as lowercased, trimmed list
     kws = [k.strip().lower() for k in _get("PREFERRED_KEYWORDS", "").split(",") if k.strip()]
     weight_keywords = _get_float("WEIGHT_KEYWORDS", 0.7)
     weight_remote   = _get_float("WEIGHT_REMOTE",   0.2)
     weight_recency  = _get_float("WEIGHT_RECENCY",  0.1)
     half_life_days  = int(float(_get("RECENCY_HALF_LIFE_DAYS", "21")))
+    # Per-day decay buckets instead of exact decay (cheaper on large batches)
+    recency_buckets = _get("RECENCY_BUCKETS", "false").strip().lower() == "true"
 
     # Normalize weights to sum to 1.0
     total = max(1e-9, (weight_keywords + weight_remote + weight_recency))
@@ -63,4 +160,5 @@ def get_scoring_settings():
         "keywords": kws,
         "weights": weights,
         "half_life_days": half_life_days,
+        "recency_buckets": recency_buckets,
     }
@@ -9,11 +9,13 @@ Usage (CLI):
 
 from __future__ import annotations
 
+import hashlib
 import re
 import sys
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 class WorkMode(str, Enum):
     REMOTE = "remote"
@@ -88,6 +90,129 @@ NEGATIVE_REMOTE_RE = _compile(NEGATIVE_REMOTE)
 LOCAL_ONLY_RE = _compile(LOCAL_ONLY)
 
 
+# --- Fused scanner ----------------------------------------------------------
+#
+# The four groups above are matched in a single pass by one regex. Every
+# alternative is bounded (no `.*` or open-ended character runs) and the
+# alternation sits inside a lookahead, so overlapping hits at every position
+# are still seen. The two patterns with an unbounded gap are split into
+# atoms that are joined afterwards by position:
+#
+#   on-site ... <n> days           ONSITE end <= NDAYS start
+#   located in <letters> office    LOCATED end < OFFICE start, with only
+#                                  letters/spaces in between
+#
+# which keeps the whole scan linear in the length of the text.
+#
+# Each atom maps to the pattern keys it proves. Where one atom is a prefix
+# of another ("remote" / "remote not available"), the longer one is listed
+# first and also implies the shorter one, because a lookahead only reports
+# the first alternative that matches at a position.
+
+_ATOMS: List[Tuple[str, Tuple[str, ...]]] = [
+    (r"\bremote not available\b", ("neg", "pos:0")),
+    (r"\bremote work (?:is )?not (?:available|offered)\b", ("neg", "pos:0")),
+    (r"\bremote\b", ("pos:0",)),
+    (r"work from home", ("pos:1",)),
+    (r"work from anywhere", ("pos:5",)),
+    (r"work\-from\-home", ("pos:2",)),
+    (r"fully remote", ("pos:3",)),
+    (r"100% remote", ("pos:4",)),
+    (r"distributed team", ("pos:6",)),
+    (r"telecommuting", ("pos:8",)),
+    (r"telecommute", ("pos:7",)),
+    (r"home\-based", ("pos:9",)),
+    (r"\bhybrid\b", ("hybrid",)),
+    (r"\b\d+ days in (?:the )?office\b", ("hybrid",)),
+    (r"\bon[- ]site only\b", ("neg", "ONSITE")),
+    (r"\bin[- ]office only\b", ("neg",)),
+    (r"\bon[- ]site\b", ("ONSITE",)),
+    (r"\b(?:\d|one|two|three) days\b", ("NDAYS",)),
+    (r"\bno remote\b", ("neg",)),
+    (r"\bnot remote\b", ("neg",)),
+    (r"\bmust be on[- ]site\b", ("neg",)),
+    (r"\bmust be in[- ]office\b", ("neg",)),
+    (r"\brelocation required\b", ("neg",)),
+    (r"\blocated in ", ("LOCATED",)),
+    (r" (?:office|campus)\b", ("OFFICE",)),
+    (r"\blocal candidates only\b", ("local",)),
+    (r"\bmust live within\b", ("local",)),
+    (r"\bwithin \d+ ?(?:miles|km|kilometers)\b", ("local",)),
+]
+
+# Attempts are only started where an atom can begin: at a word boundary, or
+# mid-word for the unanchored literal phrases (work from home, fully remote,
+# 100% remote, distributed team, telecommute, home-based). " office" always
+# follows a letter when it can complete a "located in" match, so it sits on
+# a boundary too.
+_FUSED_RE = re.compile(
+    r"(?:\b|\B(?=[wfdth1]))(?=" + "|".join(f"(?P<a{i}>{pat})" for i, (pat, _) in enumerate(_ATOMS)) + ")",
+    re.IGNORECASE,
+)
+_ATOM_KEYS: Dict[str, Tuple[str, ...]] = {f"a{i}": keys for i, (_, keys) in enumerate(_ATOMS)}
+_ONSITE_LEN = len("on-site")
+_RUN_BREAK_RE = re.compile(r"[^A-Za-z ]", re.IGNORECASE)
+
+
+def _located_in_office(text: str, located: List[int], offices: List[int]) -> bool:
+    """
+    True if some "located in " end `a` is followed by " office"/" campus"
+    at `s > a` with only letters/spaces in text[a:s]. Only the latest `a`
+    before each `s` needs checking, and a failed `a` stays failed, so each
+    stretch of text is inspected at most once.
+    """
+    j = 0
+    latest: Optional[int] = None
+    dead: Optional[int] = None
+    for s in offices:
+        while j < len(located) and located[j] < s:
+            latest = located[j]
+            j += 1
+        if latest is None or latest == dead:
+            continue
+        if _RUN_BREAK_RE.search(text, latest, s) is None:
+            return True
+        dead = latest
+    return False
+
+
+def _scan(normalized: str) -> Tuple[int, bool, bool, bool]:
+    """
+    One pass over whitespace-collapsed text.
+    Returns (positive pattern count, hybrid, negative, local-only).
+    """
+    hits: Set[str] = set()
+    onsite_end: Optional[int] = None
+    ndays_start = -1
+    located: List[int] = []
+    offices: List[int] = []
+
+    for m in _FUSED_RE.finditer(normalized):
+        group = m.lastgroup
+        for key in _ATOM_KEYS[group]:
+            if key == "ONSITE":
+                end = m.start(group) + _ONSITE_LEN
+                if onsite_end is None or end < onsite_end:
+                    onsite_end = end
+            elif key == "NDAYS":
+                ndays_start = max(ndays_start, m.start(group))
+            elif key == "LOCATED":
+                located.append(m.end(group))
+            elif key == "OFFICE":
+                offices.append(m.start(group))
+            else:
+                hits.add(key)
+
+    if onsite_end is not None and ndays_start >= onsite_end:
+        hits.add("hybrid")
+    if located and offices and "neg" not in hits:
+        if _located_in_office(normalized, located, offices):
+            hits.add("neg")
+
+    pos_count = sum(1 for key in hits if key.startswith("pos:"))
+    return pos_count, "hybrid" in hits, "neg" in hits, "local" in hits
+
+
 # --- Core logic -------------------------------------------------------------
 
 
@@ -95,23 +220,16 @@ def _count_matches(regexes: List[re.Pattern], text: str) -> int:
     return sum(1 for r in regexes if r.search(text))
 
 
-def score_remote(text: str) -> RemoteCheckResult:
-    """
-    Inspect a job/gig text and guess whether it's remote-friendly.
-    """
-
+def _classify(text: str) -> RemoteCheckResult:
     normalized = " ".join(text.split())  # collapse whitespace
 
-    pos_count = _count_matches(POSITIVE_REMOTE_RE, normalized)
-    hybrid_count = _count_matches(HYBRID_HINTS_RE, normalized)
-    neg_count = _count_matches(NEGATIVE_REMOTE_RE, normalized)
-    local_count = _count_matches(LOCAL_ONLY_RE, normalized)
+    pos_count, has_hybrid, has_negative, has_local = _scan(normalized)
 
     flags: Dict[str, bool] = {
         "has_positive_remote": pos_count > 0,
-        "has_hybrid_hints": hybrid_count > 0,
-        "has_negative_remote": neg_count > 0,
-        "has_local_only": local_count > 0,
+        "has_hybrid_hints": has_hybrid,
+        "has_negative_remote": has_negative,
+        "has_local_only": has_local,
     }
 
     reasons: List[str] = []
@@ -166,6 +284,49 @@ def score_remote(text: str) -> RemoteCheckResult:
     )
 
 
+# --- Cache + batch API ------------------------------------------------------
+
+_CACHE_SIZE = 4096
+_cache: "OrderedDict[bytes, RemoteCheckResult]" = OrderedDict()
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def score_remote(text: str) -> RemoteCheckResult:
+    """
+    Inspect a job/gig text and guess whether it's remote-friendly.
+
+    Results are cached by a hash of the text; treat them as read-only.
+    """
+    key = _text_key(text)
+    result = _cache.get(key)
+    if result is not None:
+        _cache.move_to_end(key)
+        return result
+
+    result = _classify(text)
+    _cache[key] = result
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+def classify_many(texts: Iterable[str]) -> List[RemoteCheckResult]:
+    """
+    Batch version of score_remote: identical texts are classified once.
+    """
+    seen: Dict[str, RemoteCheckResult] = {}
+    out: List[RemoteCheckResult] = []
+    for text in texts:
+        result = seen.get(text)
+        if result is None:
+            result = seen[text] = score_remote(text)
+        out.append(result)
+    return out
+
+
 def is_remote_ok(text: str, *, require_strict_remote: bool = False) -> bool:
     """
     Simple boolean check.
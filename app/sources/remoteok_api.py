@@ -0,0 +1,32 @@
+from __future__ import annotations
+from typing import Iterable, List
+from ..models import Gig
+from ..providers.remoteok_jobs import fetch_remoteok_jobs
+from .base import Source
+
+# RemoteOK's JSON API as Gig models (app.sources.remoteok is the remote-work
+# classifier, kept free of pydantic for the CLI).
+
+class RemoteOK(Source):
+    name = "remoteok"
+
+    async def fetch(self, limit: int = 50) -> Iterable[Gig]:
+        gigs: List[Gig] = []
+        for job in await fetch_remoteok_jobs(limit=limit):
+            if not job.get("url"):
+                continue  # nothing to link to
+            g = Gig(
+                id=f"remoteok-{job.get('id')}",
+                title=job.get("position") or "",
+                company=job.get("company"),
+                url=job["url"],
+                source=self.name,
+                location=job.get("location"),
+                remote=True,
+                tags=[str(t) for t in job.get("tags") or []],
+                description=job.get("description"),
+                pay=None,
+                contract=True,
+            )
+            gigs.append(g)
+        return gigs
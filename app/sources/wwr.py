@@ -1,7 +1,6 @@
 from __future__ import annotations
-import feedparser, re
+import re
 from typing import Iterable, List
-from bs4 import BeautifulSoup
 from ..models import Gig
 from .base import Source
 
@@ -10,6 +9,8 @@ from .base import Source
 WWR_RSS = "https://weworkremotely.com/categories/remote-programming-jobs.rss"
 
 def _extract_text(html: str) -> str:
+    from bs4 import BeautifulSoup  # lazy: only needed once a feed is fetched
+
     soup = BeautifulSoup(html or "", "html.parser")
     return soup.get_text(" ", strip=True)
 
@@ -17,6 +18,8 @@ class WeWorkRemotely(Source):
     name = "weworkremotely"
 
     async def fetch(self, limit: int = 50) -> Iterable[Gig]:
+        import feedparser
+
         feed = feedparser.parse(WWR_RSS)
         gigs: List[Gig] = []
         for entry in feed.entries[:limit]:
@@ -53,22 +53,21 @@ class UserConfig:
 def load_user_config(profile: Optional[str]) -> Optional[UserConfig]:
     """
     If profile is None, return None (no customization).
-    Otherwise, load configs/<profile>.json.
+    Otherwise, the parsed configs/<profile>.json from the profile registry
+    (app.core.profiles), which reads each file once and reloads it only
+    when it changes. The returned config is shared: don't modify it.
     """
     if not profile:
         return None
 
-    config_dir = DEFAULT_CONFIG_DIR
-    path = config_dir / f"{profile}.json"
+    from app.core.profiles import get_registry
 
-    if not path.exists():
+    registry = get_registry()
+    entry = registry.get(profile, "user")
+    if entry is None:
+        path = registry.directory / f"{profile}.json"
         raise FileNotFoundError(
             f"Profile '{profile}' not found at {path}. "
             f"Create it or choose a different --profile."
         )
-
-    data = path.read_text(encoding="utf-8")
-    import json
-    obj = json.loads(data)
-
-    return UserConfig.from_dict(obj)
+    return entry.config
@@ -0,0 +1,77 @@
+# benchmarks/bench_batch_search.py
+
+"""
+Batch search latency as the number of profiles grows.
+
+    python -m benchmarks.bench_batch_search [n_gigs] [max_profiles]
+
+For 1, 2, 4, ... profiles, times one run_batch_search call against the same
+number of separate run_gig_search calls on a prebuilt corpus snapshot
+(fetching is excluded from both; the batch saves that too). The ranking
+cache is cleared before every call so each one really scores.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+
+import app.api as api
+from app.core.corpus import CorpusStore
+from app.core.ranking import RankingCache
+from benchmarks.corpus import synthetic_gigs
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(fn())
+    return time.perf_counter() - start
+
+
+def main(argv) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 5000
+    max_profiles = int(argv[2]) if len(argv) > 2 else 16
+
+    async def no_fetch():
+        raise RuntimeError("snapshot is prebuilt")
+
+    store = CorpusStore(no_fetch, refresh_seconds=1e9)
+    store._snapshot = store.build(synthetic_gigs(n))
+    api.CORPUS = store
+
+    keys = list(api.PROFILES)
+    configs = [api.profile_user_config(keys[i % len(keys)]) for i in range(max_profiles)]
+    # vary keywords so repeated keys are distinct profiles
+    configs = [{**c, "keywords": c["keywords"] + [f"extra{i}"]} for i, c in enumerate(configs)]
+
+    # warm the snapshot's term caches so the first row is not penalized
+    _timed(lambda: api.run_batch_search(configs, limit=10))
+
+    print(f"gigs={n}")
+    print(f"{'profiles':>8s} {'batch':>10s} {'separate':>10s} {'ratio':>6s}")
+    count = 1
+    while count <= max_profiles:
+        chosen = configs[:count]
+
+        async def batch():
+            api.RANKINGS = RankingCache()
+            await api.run_batch_search(chosen, limit=10)
+
+        async def separate():
+            api.RANKINGS = RankingCache()
+            for config in chosen:
+                await api.run_gig_search(config, limit=10)
+
+        b, s = _timed(batch), _timed(separate)
+        print(f"{count:8d} {b * 1e3:8.1f}ms {s * 1e3:8.1f}ms {s / b:6.2f}")
+        count *= 2
+    api.SCORER.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,51 @@
+# benchmarks/bench_dedupe.py
+
+"""
+Near-duplicate detection on a large synthetic corpus with planted reposts.
+
+    python -m benchmarks.bench_dedupe [n_gigs] [repost_fraction]
+
+Reports wall time for signatures + LSH + clustering and recall of the
+planted duplicates. Pairwise comparison would need n^2/2 signature checks.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from app.core.dedupe import DedupeConfig, find_clusters
+from benchmarks.corpus import synthetic_gigs
+
+
+def main(argv) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    fraction = float(argv[2]) if len(argv) > 2 else 0.1
+    rng = random.Random(3)
+
+    gigs = synthetic_gigs(n)
+    planted = []
+    for i in rng.sample(range(n), int(n * fraction)):
+        words = gigs[i]["description"].split()
+        for _ in range(3):  # a few edited words, like a repost
+            words[rng.randrange(len(words))] = rng.choice(("updated", "new", "hiring"))
+        planted.append((i, len(gigs)))
+        gigs.append({**gigs[i], "id": f"repost-{i}", "description": " ".join(words)})
+
+    config = DedupeConfig()
+    start = time.perf_counter()
+    clusters = find_clusters(gigs, config)
+    elapsed = time.perf_counter() - start
+
+    cluster_of = {i: k for k, c in enumerate(clusters) for i in c}
+    found = sum(1 for a, b in planted if cluster_of[a] == cluster_of[b])
+    merged = len(gigs) - len(clusters)
+    print(f"gigs={len(gigs)} planted={len(planted)} bands={config.bands} threshold={config.threshold}")
+    print(f"clustering {elapsed:8.3f}s  ({elapsed / len(gigs) * 1e6:.1f} us/gig)")
+    print(f"recall {found / max(1, len(planted)):.3f}  merged={merged}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
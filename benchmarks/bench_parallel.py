@@ -0,0 +1,58 @@
+# benchmarks/bench_parallel.py
+
+"""
+Scaling of the process-pool scorer with the number of workers.
+
+    python -m benchmarks.bench_parallel [n_gigs] [max_workers]
+
+Prints wall time and speedup over one in-process worker for 1, 2, 4, ...
+workers up to `max_workers` (default: the CPU count). The pool is warmed
+up before timing so process start-up is not counted.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from app.api import profile_plans
+from app.core.parallel import ParallelScorer, default_workers
+from app.core.plan import compile_plan
+from app.user_config import load_user_config
+from benchmarks.corpus import synthetic_gigs
+
+
+def main(argv) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    max_workers = int(argv[2]) if len(argv) > 2 else default_workers()
+    gigs = synthetic_gigs(n)
+    cases = {
+        "1 plan (cindy config)": [compile_plan(load_user_config("cindy"))],
+        f"{len(profile_plans())} plans (built-in)": profile_plans(),
+    }
+
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    for label, plans in cases.items():
+        print(f"{label}, {n} gigs")
+        baseline = None
+        reference = None
+        for workers in counts:
+            with ParallelScorer(plans, workers=workers, min_parallel=1) as scorer:
+                scorer.top_k(gigs[: workers * 4], 1)  # start the pool
+                start = time.perf_counter()
+                result = scorer.top_k(gigs, 10)
+                elapsed = time.perf_counter() - start
+            reference = reference or result
+            assert result == reference
+            baseline = baseline or elapsed
+            print(f"  workers={workers:<3} {elapsed:8.3f}s  speedup x{baseline / elapsed:4.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
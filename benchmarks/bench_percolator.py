@@ -0,0 +1,57 @@
+# benchmarks/bench_percolator.py
+
+"""
+Percolation cost as the number of saved searches grows.
+
+    python -m benchmarks.bench_percolator [new_gigs] [max_searches]
+
+Every gig mentions 5 of `skills` made-up skill words and saved searches
+want 1-3 of them, so each search matches a small share of new gigs. For
+each search count, reports time per new gig, candidate searches checked per
+gig and real matches per gig; brute force would check every search for
+every gig.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from app.core.percolator import Percolator, SavedSearch
+from app.core.plan import compile_profile_dict
+from benchmarks.corpus import synthetic_gigs
+
+
+def main(argv) -> int:
+    n_new = int(argv[1]) if len(argv) > 1 else 200
+    max_searches = int(argv[2]) if len(argv) > 2 else 16_000
+    rng = random.Random(9)
+
+    skills = [f"skill{k:05d}" for k in range(5000)]
+
+    def with_skills(gigs):
+        return [{**g, "description": f"{g['description']} {' '.join(rng.sample(skills, 5))}"} for g in gigs]
+
+    corpus = with_skills(synthetic_gigs(2000, seed=1))
+    fresh = with_skills(synthetic_gigs(n_new, seed=2))
+
+    print(f"new gigs={n_new} skills={len(skills)}")
+    print(f"{'searches':>9s} {'us/gig':>9s} {'candidates/gig':>15s} {'matches/gig':>12s}")
+    count = 1000
+    while count <= max_searches:
+        perc = Percolator()
+        perc.observe(corpus)
+        for i in range(count):
+            kws = rng.sample(skills, rng.randint(1, 3))
+            perc.add(SavedSearch(str(i), compile_profile_dict({"keywords": kws}), min_score=10))
+        start = time.perf_counter()
+        matches = perc.percolate(fresh)
+        elapsed = time.perf_counter() - start
+        print(f"{count:9d} {elapsed / n_new * 1e6:9.0f} {perc.candidates_checked / n_new:15.1f} {len(matches) / n_new:12.1f}")
+        count *= 4
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,74 @@
+# benchmarks/bench_profiles.py
+
+"""
+Profile registry cost with many user profiles.
+
+    python -m benchmarks.bench_profiles [profiles]
+
+Writes `profiles` UserConfig files to a temporary directory and times:
+- the initial load (read, parse and compile every file)
+- a reload when nothing changed (one stat per file), which is what the
+  API's watcher does every GA_PROFILE_POLL_SECONDS
+- a reload after one file changed
+- a lookup, against load_user_config's old read-and-parse per call
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.profiles import ProfileRegistry
+from app.user_config import UserConfig
+
+WORDS = ["email", "python", "design", "sales", "react", "writer", "devops", "seo", "video", "support"]
+
+
+def _timed(fn, rounds: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main(argv) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 5000
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(n):
+            data = {
+                "profile_name": f"user{i}",
+                "titles_include": rng.sample(WORDS, 2),
+                "keywords_must_have": rng.sample(WORDS, 1),
+                "keywords_nice_to_have": rng.sample(WORDS, 4),
+                "keywords_avoid": ["unpaid"],
+            }
+            (root / f"user{i}.json").write_text(json.dumps(data), encoding="utf-8")
+
+        registry = ProfileRegistry(root)
+        print(f"{n} profiles")
+        print(f"initial load      {_timed(registry.reload) * 1000:9.1f} ms")
+        print(f"reload, no change {_timed(registry.reload, 5) * 1000:9.1f} ms")
+
+        path = root / "user42.json"
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        print(f"reload, 1 changed {_timed(registry.reload) * 1000:9.1f} ms")
+
+        keys = [f"user{rng.randrange(n)}" for _ in range(10_000)]
+        lookup = _timed(lambda: [registry.get(k) for k in keys]) / len(keys)
+        reparse = _timed(
+            lambda: [UserConfig.from_dict(json.loads((root / f"{k}.json").read_text("utf-8"))) for k in keys[:1000]]
+        ) / 1000
+        print(f"lookup            {lookup * 1e6:9.2f} us   (read + parse per call: {reparse * 1e6:.1f} us)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,59 @@
+# benchmarks/bench_remote_classifier.py
+
+"""
+Compare the per-pattern remote classifier with the fused single-pass scan,
+on adversarial inputs and on a realistic batch.
+
+    python -m benchmarks.bench_remote_classifier [size]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from app.sources import remoteok
+from benchmarks.corpus import synthetic_gigs
+
+
+def _per_pattern(text: str):
+    normalized = " ".join(text.split())
+    return [
+        remoteok._count_matches(regexes, normalized)
+        for regexes in (
+            remoteok.POSITIVE_REMOTE_RE,
+            remoteok.HYBRID_HINTS_RE,
+            remoteok.NEGATIVE_REMOTE_RE,
+            remoteok.LOCAL_ONLY_RE,
+        )
+    ]
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main(argv) -> int:
+    size = int(argv[1]) if len(argv) > 1 else 4_000
+    adversarial = {
+        "repeated on-site": "on-site " * size,
+        "located in + letters, no office": "located in " + "a " * size + "1 office",
+        "repeated located in": ("located in " + "x" * 20 + " ") * (size // 4) + "1",
+    }
+    for label, text in adversarial.items():
+        _timed(f"per-pattern: {label}", lambda: _per_pattern(text))
+        _timed(f"fused:       {label}", lambda: remoteok._classify(text))
+
+    gigs = synthetic_gigs(20_000)
+    texts = [" ".join(filter(None, (g.get("title"), g.get("description")))) for g in gigs]
+    _timed("per-pattern: 20k gigs", lambda: [_per_pattern(t) for t in texts])
+    _timed("fused:       20k gigs", lambda: [remoteok._classify(t) for t in texts])
+    _timed("classify_many: 20k gigs", lambda: remoteok.classify_many(texts))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,52 @@
+# benchmarks/bench_scoring_engines.py
+
+"""
+Compare the reference scorer with the inverted-index and NumPy engines.
+
+    python -m benchmarks.bench_scoring_engines [n_gigs]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from app.core.index import CorpusIndex
+from app.core.matrix import TermMatrix, numpy_available
+from app.core.plan import compile_plan
+from app.core.scoring import score_gig
+from app.user_config import load_user_config
+from benchmarks.corpus import synthetic_gigs
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main(argv) -> int:
+    n = int(argv[1]) if len(argv) > 1 else 100_000
+    config = load_user_config("cindy")
+    plan = compile_plan(config)
+    gigs = _timed(f"generate {n} gigs", lambda: synthetic_gigs(n))
+
+    ref = _timed("score_gig loop", lambda: [score_gig(g, user_config=config) for g in gigs])
+    index = _timed("build CorpusIndex", lambda: CorpusIndex(gigs))
+    got = _timed("CorpusIndex.score", lambda: index.score(plan))
+    assert got == ref
+
+    if not numpy_available():
+        print("numpy not installed; skipping TermMatrix")
+        return 0
+
+    matrix = _timed("build TermMatrix", lambda: TermMatrix.for_plans(index, [plan]))
+    got = _timed("TermMatrix.score", lambda: matrix.score(plan))
+    assert got.tolist() == ref
+    print(f"matrix shape={matrix.shape} nnz={matrix.nnz}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
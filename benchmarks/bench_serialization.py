@@ -0,0 +1,86 @@
+# benchmarks/bench_serialization.py
+
+"""
+Response serialization cost for one page of scored gigs.
+
+    python -m benchmarks.bench_serialization [limit] [rounds]
+
+Compares, per response of `limit` gigs:
+- validated: what response_model=List[ScoredGig] costs (validate every gig,
+  including HttpUrl parsing, dump to JSON types, encode)
+- encoder: FastAPI's jsonable_encoder + JSONResponse for a returned dict
+- fragments (cold / warm): cached per-gig JSON joined into the body
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from app.core.serialization import FragmentCache, json_array, json_object
+from app.models import ScoredGig
+from benchmarks.corpus import synthetic_gigs
+
+
+def _timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main(argv) -> int:
+    limit = int(argv[1]) if len(argv) > 1 else 200
+    rounds = int(argv[2]) if len(argv) > 2 else 50
+
+    page = [
+        {
+            "id": g["id"],
+            "title": g.get("position") or g.get("title") or "",
+            "company": g.get("company"),
+            "url": g["url"],
+            "source": g.get("source") or "remoteok",
+            "description": g.get("description"),
+            "tags": list(g.get("tags") or []),
+            "score": float(i % 7),
+        }
+        for i, g in enumerate(synthetic_gigs(limit))
+    ]
+    adapter = TypeAdapter(List[ScoredGig])
+    header = {"limit": limit}
+
+    def validated():
+        # what FastAPI does with a response_model: validate, dump, encode
+        gigs = adapter.dump_python(adapter.validate_python(page), mode="json")
+        return JSONResponse({"header": header, "gigs": gigs}).body
+
+    def encoder():
+        return JSONResponse(jsonable_encoder({"header": header, "gigs": page})).body
+
+    def fragments(cache: FragmentCache):
+        return json_object([("header", header), ("gigs", json_array(cache.fragment(g) for g in page))])
+
+    warm = FragmentCache()
+    fragments(warm)
+    results = {
+        "validated": _timed(validated, rounds),
+        "encoder": _timed(encoder, rounds),
+        "fragments cold": _timed(lambda: fragments(FragmentCache()), rounds),
+        "fragments warm": _timed(lambda: fragments(warm), rounds),
+    }
+    assert JSONResponse({"header": header, "gigs": page}).body == fragments(warm)
+
+    print(f"limit={limit} rounds={rounds}")
+    base = results["encoder"]
+    for name, seconds in results.items():
+        print(f"{name:16s} {seconds * 1e3:8.3f} ms/response  ({base / seconds:5.1f}x vs encoder)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
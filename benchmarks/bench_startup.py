@@ -0,0 +1,51 @@
+# benchmarks/bench_startup.py
+
+"""
+Cold-start cost: wall time of a fresh interpreter importing each entry point.
+
+    python -m benchmarks.bench_startup [rounds]
+
+Each round starts a new `python -c "import <module>"` process, so nothing
+is cached in sys.modules; the median is reported along with the bare
+interpreter startup for reference. Modules that fail to import are shown
+as such. tests/test_import_time.py enforces budgets on the same modules.
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULES = ["app.settings", "app.cli", "app.api", "app.main", "app.refresher"]
+
+
+def _timed(module: str) -> float:
+    code = f"import {module}" if module else "pass"
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise ImportError(result.stderr.decode("utf-8", "replace").strip().splitlines()[-1])
+    return elapsed
+
+
+def main(argv) -> int:
+    rounds = int(argv[1]) if len(argv) > 1 else 5
+    baseline = statistics.median(_timed("") for _ in range(rounds))
+    print(f"{'(interpreter)':<16} {baseline * 1000:8.1f} ms")
+    for module in MODULES:
+        try:
+            median = statistics.median(_timed(module) for _ in range(rounds))
+        except ImportError as e:
+            print(f"{module:<16} {'failed':>8}    {e}")
+            continue
+        print(f"{module:<16} {median * 1000:8.1f} ms   (+{(median - baseline) * 1000:.1f} ms imports)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,38 @@
+# benchmarks/corpus.py
+
+"""
+Synthetic corpora for the benchmarks, built by remixing the recorded gigs in
+tests/fixtures/gigs.json so term frequencies look like real listings.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "gigs.json"
+
+
+def recorded_gigs() -> List[Dict]:
+    return json.loads(FIXTURE.read_text(encoding="utf-8"))
+
+
+def synthetic_gigs(n: int, seed: int = 7) -> List[Dict]:
+    rng = random.Random(seed)
+    base = recorded_gigs()
+    words = " ".join(g.get("description") or "" for g in base).split()
+    gigs: List[Dict] = []
+    for i in range(n):
+        tpl = base[i % len(base)]
+        extra = " ".join(rng.choice(words) for _ in range(rng.randint(40, 120)))
+        gigs.append(
+            {
+                **tpl,
+                "id": f"{tpl['id']}-{i}",
+                "url": f"{tpl['url']}?v={i}",
+                "description": f"{tpl.get('description') or ''} {extra}",
+            }
+        )
+    return gigs
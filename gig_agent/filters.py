@@ -1,10 +1,36 @@
 # gig_agent/filters.py
 from __future__ import annotations
-from datetime import datetime, timedelta
+import re
 from typing import Iterable, List, Dict, Optional
 
+from app.core.dates import cutoff_epoch, posted_epoch
+from app.core.filtering import FilterChain, ListingView, Predicate, compile_chain, query_predicate
+from app.core.index import CorpusIndex
+from app.core.query import parse_query
+
+# Fields a bare query word searches here (company only via company:)
+QUERY_COMPONENTS = ("title", "description")
+
 Listing = Dict[str, object]
 
+_QUOTED_RE = re.compile(r'("[^"]*"?)')
+
+
+def _query_text(query: Optional[str]) -> str:
+    """
+    Queries here used to ignore 'and' / 'or' in any case and AND every other
+    word. Upper-case AND / OR / NOT are operators now (see app.core.query);
+    other spellings of 'and' / 'or' outside quotes are still dropped rather
+    than searched for.
+    """
+    parts = _QUOTED_RE.split(query or "")
+    return "".join(
+        part if part.startswith('"') else " ".join(
+            w for w in part.split(" ") if w in ("AND", "OR") or w.lower() not in ("and", "or")
+        )
+        for part in parts
+    )
+
 
 def _normalize(text: Optional[str]) -> str:
     return (text or "").strip().lower()
@@ -28,42 +54,20 @@ def filter_posted_within(listings: Iterable[Listing], days: Optional[int]) -> Li
     if not days:
         return list(listings)
 
-    cutoff = datetime.utcnow() - timedelta(days=days)
+    cutoff = cutoff_epoch(days)
     result: List[Listing] = []
 
     for row in listings:
-        published = row.get("published") or row.get("date") or row.get("posted_at")
-        if not published:
-            # keep if we don't know – or skip if you prefer stricter
-            result.append(row)
-            continue
-
-        dt = _parse_date(published)
-        if dt is None or dt >= cutoff:
+        epoch = row.get("posted_epoch")
+        if not isinstance(epoch, int):
+            epoch = posted_epoch(row)
+        # keep if we don't know – or skip if you prefer stricter
+        if epoch is None or epoch >= cutoff:
             result.append(row)
 
     return result
 
 
-def _parse_date(value) -> Optional[datetime]:
-    if isinstance(value, datetime):
-        return value
-
-    if not value:
-        return None
-
-    text = str(value).strip()
-
-    # try a couple of common formats; extend if needed
-    for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%SZ"):
-        try:
-            return datetime.strptime(text, fmt)
-        except ValueError:
-            continue
-
-    return None
-
-
 def filter_company_blocklist(listings: Iterable[Listing], blocked: List[str]) -> List[Listing]:
     if not blocked:
         return list(listings)
@@ -97,30 +101,89 @@ def filter_title_allowlist(listings: Iterable[Listing], allowed_terms: List[str]
 
 def filter_query_keywords(listings: Iterable[Listing], query: Optional[str]) -> List[Listing]:
     """
-    Very simple keyword AND filter based on a query string, e.g.:
-      'writer AND newsletter'
-    We'll split on whitespace, ignore 'and'/'or', and require all remaining terms.
+    Keyword filter based on a query string, e.g.:
+      'writer AND newsletter', 'writer OR editor', '"content strategy" NOT intern'
+    See app.core.query for the full syntax; lower-case 'and' / 'or' are ignored.
     """
-    if not query:
+    parsed = parse_query(_query_text(query), QUERY_COMPONENTS)
+    if parsed.empty:
         return list(listings)
+    return parsed.filter(listings)
 
-    raw_terms = query.replace("AND", " ").replace("OR", " ").split()
-    terms = [_normalize(t) for t in raw_terms if t.lower() not in {"and", "or"}]
-    if not terms:
-        return list(listings)
 
-    result: List[Listing] = []
-    for row in listings:
-        haystack = " ".join(
-            [
-                _normalize(str(row.get("title", ""))),
-                _normalize(str(row.get("description", ""))),
-            ]
-        )
-        if all(term in haystack for term in terms):
-            result.append(row)
+def _field_text(value: object) -> str:
+    return _normalize(str(value))
 
-    return result
+
+# Predicate versions of the filters above, for the single-pass chain.
+def _remote_predicate(remote_only: bool) -> Optional[Predicate]:
+    if not remote_only:
+        return None
+
+    def test(view: ListingView) -> bool:
+        return "remote" in view.field("location") or "remote" in view.field("title")
+
+    return Predicate("remote", test, cost=2.0, pass_rate=0.7)
+
+
+def _posted_predicate(days: Optional[int]) -> Optional[Predicate]:
+    if not days:
+        return None
+    cutoff = cutoff_epoch(days)
+
+    def test(view: ListingView) -> bool:
+        epoch = view.get("posted_epoch")
+        if not isinstance(epoch, int):
+            epoch = posted_epoch(view.listing)
+        return epoch is None or epoch >= cutoff
+
+    return Predicate("posted_within", test, cost=1.0, pass_rate=0.5)
+
+
+def _company_predicate(blocked: List[str]) -> Optional[Predicate]:
+    if not blocked:
+        return None
+    blocked_norm = [_normalize(c) for c in blocked]
+
+    def test(view: ListingView) -> bool:
+        company = view.field("company")
+        return not (company and any(b and b in company for b in blocked_norm))
+
+    return Predicate("company_block", test, cost=2.0, pass_rate=0.95)
+
+
+def _title_predicate(allowed_terms: List[str]) -> Optional[Predicate]:
+    if not allowed_terms:
+        return None
+    allowed_norm = [_normalize(t) for t in allowed_terms]
+
+    def test(view: ListingView) -> bool:
+        title = view.field("title")
+        return any(term in title for term in allowed_norm)
+
+    return Predicate("role_allow", test, cost=2.0, pass_rate=0.3)
+
+
+def compile_filters(
+    query: Optional[str] = None,
+    remote_only: bool = False,
+    posted_within: Optional[int] = None,
+    company_block: Optional[str] = None,
+    role_allow: Optional[str] = None,
+    index: Optional[CorpusIndex] = None,
+) -> FilterChain:
+    blocked = [c.strip() for c in (company_block or "").split(",") if c.strip()]
+    allowed = [r.strip() for r in (role_allow or "").split(",") if r.strip()]
+    return compile_chain(
+        [
+            query_predicate(parse_query(_query_text(query), QUERY_COMPONENTS), index),
+            _remote_predicate(remote_only),
+            _posted_predicate(posted_within),
+            _company_predicate(blocked),
+            _title_predicate(allowed),
+        ],
+        normalize=_field_text,
+    )
 
 
 def apply_filters(
@@ -130,21 +193,12 @@ def apply_filters(
     posted_within: Optional[int] = None,
     company_block: Optional[str] = None,
     role_allow: Optional[str] = None,
+    index: Optional[CorpusIndex] = None,
 ) -> List[Listing]:
     """
-    High-level convenience wrapper used by CLI.
-    company_block and role_allow are comma-separated strings.
+    High-level convenience wrapper used by CLI: all filters in one pass.
+    company_block and role_allow are comma-separated strings; `index` is an
+    optional prebuilt CorpusIndex over `listings` for the query.
     """
-    rows: List[Listing] = list(listings)
-
-    rows = filter_query_keywords(rows, query)
-    rows = filter_remote_only(rows, remote_only)
-    rows = filter_posted_within(rows, posted_within)
-
-    blocked = [c.strip() for c in (company_block or "").split(",") if c.strip()]
-    rows = filter_company_blocklist(rows, blocked)
-
-    allowed = [r.strip() for r in (role_allow or "").split(",") if r.strip()]
-    rows = filter_title_allowlist(rows, allowed)
-
-    return rows
+    chain = compile_filters(query, remote_only, posted_within, company_block, role_allow, index)
+    return chain.apply(listings)
@@ -1,29 +1,11 @@
 from __future__ import annotations
-import math
 import re
 from datetime import datetime, timezone
-from typing import Dict, List, Any
-from .config import get_scoring_settings
-
-_DT_FORMATS = [
-    "%Y-%m-%dT%H:%M:%SZ",
-    "%Y-%m-%dT%H:%M:%S%z",
-    "%Y-%m-%d",
-    "%m/%d/%Y",
-]
-
-def _parse_dt(s: str | None):
-    if not s:
-        return None
-    for fmt in _DT_FORMATS:
-        try:
-            dt = datetime.strptime(s, fmt)
-            if not dt.tzinfo:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except Exception:
-            continue
-    return None
+from typing import Dict, List, Any, Optional
+from app.core.dates import posted_epoch
+from app.core.ranking import rank_key, top_k
+from app.core.recency import decay_table, recency_scores
+from app.settings import get_scoring_settings
 
 def _text(*parts: Any) -> str:
     return " ".join([str(p) for p in parts if p]).lower()
@@ -52,44 +34,73 @@ def _keyword_score(listing: Dict[str, Any], keywords: List[str]) -> float:
             score += 1
     return score / max(1, len(keywords))  # normalize 0..1
 
-def _recency_score(listing: Dict[str, Any], half_life_days: int) -> float:
-    # Convert publication date to an exponential decay (1.0=now, ~0 as it ages)
-    dt = _parse_dt(listing.get("published") or listing.get("date"))
-    if not dt:
-        return 0.0
-    now = datetime.now(timezone.utc)
-    age_days = max(0.0, (now - dt).total_seconds() / 86400.0)
-    # half-life decay: score = 0.5 ** (age / half_life)
-    if half_life_days <= 0:
-        return 0.0
-    return math.pow(0.5, age_days / float(half_life_days))
+def _posted_epoch(listing: Dict[str, Any]) -> Optional[int]:
+    # Prefer the epoch stamped at ingest; parse the raw dates only as a fallback
+    epoch = listing.get("posted_epoch")
+    if isinstance(epoch, int):
+        return epoch
+    return posted_epoch(listing)
 
-def score_listing(listing: Dict[str, Any]) -> float:
-    s = get_scoring_settings()
-    kws       = s["keywords"]
-    weights   = s["weights"]
-    half_life = s["half_life_days"]
+def _recency_vector(
+    listings: List[Dict[str, Any]],
+    s: Dict[str, Any],
+    now: Optional[float] = None,
+) -> List[float]:
+    # One decay pass over the batch against a single `now`
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    epochs = [_posted_epoch(item) for item in listings]
+    if s.get("recency_buckets"):
+        return decay_table(float(s["half_life_days"])).scores(epochs, now)
+    return recency_scores(epochs, now, float(s["half_life_days"]))
 
-    k = _keyword_score(listing, kws)
-    r = 1.0 if _is_remote(listing) else 0.0
-    t = _recency_score(listing, half_life)
+def _recency_score(listing: Dict[str, Any], half_life_days: int) -> float:
+    # Convert publication date to an exponential decay (1.0=now, ~0 as it ages)
+    return _recency_vector([listing], {"half_life_days": half_life_days})[0]
 
+def _combine(k: float, r: float, t: float, weights: Dict[str, float]) -> float:
     # weighted combination → 0..1
     final = (k * weights["keywords"]) + (r * weights["remote"]) + (t * weights["recency"])
     return round(float(final), 4)
 
-def apply_scoring(listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def score_listing(
+    listing: Dict[str, Any],
+    s: Optional[Dict[str, Any]] = None,
+    recency: Optional[float] = None,
+) -> float:
+    s = s or get_scoring_settings()
+    k = _keyword_score(listing, s["keywords"])
+    r = 1.0 if _is_remote(listing) else 0.0
+    t = _recency_vector([listing], s)[0] if recency is None else recency
+    return _combine(k, r, t, s["weights"])
+
+def apply_scoring(listings: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    s = get_scoring_settings()  # one settings snapshot per batch
+    recency = _recency_vector(listings, s)
     out = []
-    for item in listings:
+    for item, t in zip(listings, recency):
         item = dict(item)
-        item["score"] = score_listing(item)
+        item["score"] = score_listing(item, s, recency=t)
         out.append(item)
-    # sort high → low
-    out.sort(key=lambda x: x.get("score", 0), reverse=True)
+    # high → low; only select the top `limit` when that's all the caller needs
+    if limit is not None:
+        return top_k(out, limit)
+    out.sort(key=rank_key)
     return out
+def _profile_keywords(user_config: Dict[str, Any]) -> List[str]:
+    # Build a combined keyword list from the user profile
+    combined_keywords: List[str] = []
+
+    for field in ("keywords", "skills", "preferred_roles"):
+        for val in user_config.get(field, []) or []:
+            if isinstance(val, str):
+                combined_keywords.append(val.lower())
+    return combined_keywords
+
 def score_listing_for_profile(
     listing: Dict[str, Any],
     user_config: Dict[str, Any],
+    s: Optional[Dict[str, Any]] = None,
+    recency: Optional[float] = None,
 ) -> float:
     """
     Score a listing using a dynamic user_config instead of global keywords.
@@ -99,37 +110,31 @@ def score_listing_for_profile(
       - preferred_roles: List[str]
       - disqualifiers: List[str]   (optional, handled outside if you prefer)
     """
-    s = get_scoring_settings()
-    weights   = s["weights"]
-    half_life = s["half_life_days"]
-
-    # Build a combined keyword list from the user profile
-    combined_keywords: List[str] = []
+    s = s or get_scoring_settings()
 
-    for field in ("keywords", "skills", "preferred_roles"):
-        for val in user_config.get(field, []) or []:
-            if isinstance(val, str):
-                combined_keywords.append(val.lower())
-
-    k = _keyword_score(listing, combined_keywords)
+    k = _keyword_score(listing, _profile_keywords(user_config))
     r = 1.0 if _is_remote(listing) else 0.0
-    t = _recency_score(listing, half_life)
-
-    final = (k * weights["keywords"]) + (r * weights["remote"]) + (t * weights["recency"])
-    return round(float(final), 4)
+    t = _recency_vector([listing], s)[0] if recency is None else recency
+    return _combine(k, r, t, s["weights"])
 
 def apply_scoring_for_profile(
     listings: List[Dict[str, Any]],
     user_config: Dict[str, Any],
+    limit: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """
     Apply per-user scoring across a batch of listings.
+    If `limit` is given, only the top `limit` listings are returned.
     """
+    s = get_scoring_settings()  # one settings snapshot per batch
+    recency = _recency_vector(listings, s)
     out = []
-    for item in listings:
+    for item, t in zip(listings, recency):
         item = dict(item)
-        item["score"] = score_listing_for_profile(item, user_config)
+        item["score"] = score_listing_for_profile(item, user_config, s, recency=t)
         out.append(item)
 
-    out.sort(key=lambda x: x.get("score", 0), reverse=True)
+    if limit is not None:
+        return top_k(out, limit)
+    out.sort(key=rank_key)
     return out
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController, Overloaded
+from app.core.ranking import RankingCache
+from app.settings import get_settings
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_full_queue_is_refused_at_once_and_waiters_run_in_order():
+    async def run():
+        admission = AdmissionController(initial_limit=1, max_limit=1, max_queue=2, queue_timeout=5.0)
+        await admission.acquire()
+        order = []
+
+        async def waiter(name):
+            await admission.acquire()
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(n)) for n in ("a", "b")]
+        await asyncio.sleep(0)
+        assert admission.queued == 2
+        with pytest.raises(Overloaded) as exc:
+            await admission.acquire()
+        assert exc.value.reason == "queue full" and exc.value.retry_after >= 1
+
+        admission.release()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert order == ["a"] and admission.in_flight == 1
+        admission.release()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b"]
+
+    asyncio.run(run())
+
+
+def test_queue_deadline_sheds_the_waiter():
+    async def run():
+        admission = AdmissionController(initial_limit=1, max_limit=1, queue_timeout=0.01)
+        await admission.acquire()
+        with pytest.raises(Overloaded) as exc:
+            await admission.acquire()
+        assert exc.value.reason == "queue timeout"
+        assert admission.queued == 0 and admission.timed_out == 1
+
+    asyncio.run(run())
+
+
+def test_limit_shrinks_when_latency_climbs_and_grows_when_healthy():
+    admission = AdmissionController(initial_limit=16, max_limit=64)
+    for _ in range(20):
+        admission._observe(0.01)
+    for _ in range(20):
+        admission._observe(0.2)
+    assert admission.capacity < 16
+
+    shrunk = admission.limit
+    admission.in_flight = admission.capacity
+    for _ in range(200):
+        admission._observe(0.2)
+    assert admission.limit > shrunk
+
+
+def test_saturated_search_gets_503_or_the_stale_ranking(monkeypatch):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    visible = list(corpus)
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in visible if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in visible if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    monkeypatch.setattr(get_settings(), "admission_degrade", True)
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    fresh = client.get("/gigs", params={"profile": "developer", "limit": 5})
+    assert fresh.status_code == 200
+
+    # every slot busy and no room to queue
+    saturated = AdmissionController(initial_limit=1, max_limit=1, max_queue=0)
+    saturated.in_flight = 1
+    monkeypatch.setattr(api, "ADMISSION", saturated)
+    visible.pop()
+    api.CORPUS.invalidate()
+
+    stale = client.get("/gigs", params={"profile": "developer", "limit": 5})
+    assert stale.status_code == 200
+    assert stale.headers["x-degraded"] == "stale-cache"
+    assert int(stale.headers["retry-after"]) >= 1
+    assert stale.json()["gigs"] == fresh.json()["gigs"]
+
+    refused = client.get("/gigs", params={"profile": "creative", "limit": 5})
+    assert refused.status_code == 503
+    assert int(refused.headers["retry-after"]) >= 1
+
+
+def test_concurrent_searches_are_shed_while_one_is_scoring(monkeypatch):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_fetch(limit=50):
+        return [dict(g) for g in corpus]
+
+    async def no_wwr(limit=50):
+        return []
+
+    score = api.SCORER.score
+
+    def slow_score(*args, **kwargs):
+        time.sleep(0.2)
+        return score(*args, **kwargs)
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_fetch)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", no_wwr)
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    monkeypatch.setattr(get_settings(), "admission_degrade", False)
+    monkeypatch.setattr(api, "ADMISSION", AdmissionController(initial_limit=1, max_limit=1, max_queue=0))
+    monkeypatch.setattr(api.SCORER, "score", slow_score)
+    api.CORPUS.invalidate()
+
+    async def run():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await api.CORPUS.snapshot()
+            return await asyncio.gather(*(
+                client.post("/gigs/search", json={"keywords": [f"kw{n}"]}) for n in range(4)
+            ))
+
+    statuses = sorted(r.status_code for r in asyncio.run(run()))
+    assert statuses[0] == 200 and statuses[-1] == 503
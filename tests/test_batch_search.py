@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.ranking import RankingCache
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _client(monkeypatch, fetches):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_remoteok(limit=50):
+        fetches.append("remoteok")
+        return [dict(g) for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    api.CORPUS.invalidate()
+    return api, TestClient(api.app)
+
+
+def test_batch_matches_single_searches_with_one_fetch(monkeypatch):
+    fetches = []
+    api, client = _client(monkeypatch, fetches)
+    custom = {"keywords": ["email", "designer"], "disqualifiers": ["crypto"]}
+    scored = []
+    real_score = api.SCORER.score_async
+
+    async def spy(gigs, plans=None, index=None):
+        scored.append(len(plans))
+        return await real_score(gigs, plans, index=index)
+
+    monkeypatch.setattr(api.SCORER, "score_async", spy)
+    resp = client.post(
+        "/gigs/search/batch",
+        json={"profiles": ["cindy", "developer", custom, "cindy"], "limit": 4},
+    )
+    assert resp.status_code == 200 and resp.headers["etag"]
+    results = resp.json()["results"]
+    assert len(fetches) == 1
+    assert scored == [3]  # the repeated profile is scored once, all in one pass
+
+    for key, result in zip(("cindy", "developer"), results):
+        single = client.get("/gigs", params={"profile": key, "limit": 4}).json()
+        assert result == single
+    single = client.post("/gigs/search", params={"limit": 4}, json=custom).json()
+    assert results[2]["gigs"] == single["gigs"]
+    assert results[3] == results[0]
+
+    # cursors from the batch continue on the single endpoint, from cache
+    rest = client.get(
+        "/gigs", params={"profile": "developer", "limit": 50, "cursor": results[1]["next_cursor"]}
+    ).json()
+    ids = [g["id"] for g in results[1]["gigs"] + rest["gigs"]]
+    assert len(ids) == len(set(ids)) and len(fetches) == 1
+
+    again = client.post(
+        "/gigs/search/batch",
+        json={"profiles": ["cindy", "developer", custom, "cindy"], "limit": 4},
+        headers={"If-None-Match": resp.headers["etag"]},
+    )
+    assert again.status_code == 304
+
+
+def test_batch_rejects_empty_profile_list(monkeypatch):
+    _, client = _client(monkeypatch, [])
+    assert client.post("/gigs/search/batch", json={"profiles": []}).status_code == 422
@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.caching import etag_matches, make_etag
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_etag_matching_rules():
+    tag = make_etag("v1", "fp", 0, 10)
+    assert tag.startswith('"') and tag.endswith('"')
+    assert tag == make_etag("v1", "fp", 0, 10)
+    assert tag != make_etag("v2", "fp", 0, 10)
+    assert etag_matches(tag, tag)
+    assert etag_matches(f'"other", W/{tag}', tag)
+    assert etag_matches("*", tag)
+    assert not etag_matches(None, tag)
+    assert not etag_matches('"other"', tag)
+
+
+def test_if_none_match_skips_fetch_and_scoring(monkeypatch):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    fetches = []
+
+    async def fake_remoteok(limit=50):
+        fetches.append("remoteok")
+        return [dict(g) for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus if g["source"] != "remoteok"]
+
+    def no_scoring(*args, **kwargs):
+        raise AssertionError("a 304 must not score")
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    params = {"profile": "cindy", "limit": 5}
+    first = client.get("/gigs", params=params)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and first.headers["cache-control"].startswith("private, max-age=")
+
+    monkeypatch.setattr(api.SCORER, "score_async", no_scoring)
+    monkeypatch.setattr(api.RANKINGS, "get", no_scoring)
+    again = client.get("/gigs", params=params, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    assert len(fetches) == 1  # the corpus snapshot was reused
+
+    # a different page, profile or output format is a different tag
+    monkeypatch.undo()
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    for other in ({"profile": "cindy", "limit": 6}, {"profile": "creative", "limit": 5}, {**params, "explain": 1}):
+        resp = client.get("/gigs", params=other, headers={"If-None-Match": etag})
+        assert resp.status_code == 200 and resp.headers["etag"] != etag
+
+    # a new corpus version invalidates the tag
+    corpus.pop()
+    api.CORPUS.invalidate()
+    assert client.get("/gigs", params=params, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_profiles_that_rank_alike_still_get_their_own_tag(monkeypatch):
+    import app.api as api
+    from app.core.ranking import RankingCache
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_fetch(limit=50):
+        return [dict(g) for g in corpus]
+
+    async def no_fetch(limit=50):
+        return []
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_fetch)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", no_fetch)
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    # skills and preferred_roles do not change the ranking, only profile_used
+    first = client.post("/gigs/search", json={"keywords": ["email"], "skills": ["copywriting"]})
+    second = client.post(
+        "/gigs/search",
+        json={"keywords": ["email"], "skills": ["python"], "preferred_roles": ["editor"]},
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert second.status_code == 200 and second.headers["etag"] != first.headers["etag"]
+    assert second.json()["profile_used"]["skills"] == ["python"]
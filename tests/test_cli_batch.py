@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import app.cli as cli
+import app.core.profiles as profiles
+from app.core.profiles import ProfileRegistry
+from app.core.scoring import score_gig
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _registry(tmp_path):
+    directory = tmp_path / "configs"
+    directory.mkdir()
+    for key, keywords in {"ana": ["python"], "bo": ["email"], "cy": ["design"]}.items():
+        (directory / f"{key}.json").write_text(
+            json.dumps({"profile_name": key, "keywords_nice_to_have": keywords}), encoding="utf-8"
+        )
+    registry = ProfileRegistry(directory)
+    registry.reload()
+    return registry
+
+
+def test_batch_fetches_once_and_writes_one_ranked_file_per_profile(monkeypatch, tmp_path, capsys):
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    calls = []
+
+    async def fake_remoteok(limit=50):
+        calls.append(limit)
+        return [dict(g) for g in corpus]
+
+    registry = _registry(tmp_path)
+    monkeypatch.setattr(profiles, "_registry", registry)
+    monkeypatch.setattr(cli, "fetch_remoteok_jobs", fake_remoteok)
+    out = tmp_path / "out"
+
+    cli.main(["--all-profiles", "--out-dir", str(out)])
+
+    assert calls == [25]
+    assert sorted(p.name for p in out.iterdir()) == ["ana.json", "bo.json", "cy.json"]
+    for key in ("ana", "bo", "cy"):
+        ranked = json.loads((out / f"{key}.json").read_text(encoding="utf-8"))
+        config = registry.get(key).config
+        assert len(ranked) == len(cli.normalize_gigs([dict(g) for g in corpus]))
+        assert [g["score"] for g in ranked] == sorted((g["score"] for g in ranked), reverse=True)
+        assert all(g["score"] == score_gig(g, user_config=config) for g in ranked)
+    report = capsys.readouterr().out
+    assert "[TIME] 3 profiles" in report
+    assert all(f"{stage} " in report for stage in ("fetch", "normalize", "score", "write", "total"))
+
+    calls.clear()
+    cli.main(["--profiles", "bo, ana", "--out-dir", str(tmp_path / "two")])
+    assert calls == [25]
+    assert sorted(p.name for p in (tmp_path / "two").iterdir()) == ["ana.json", "bo.json"]
+
+
+def test_batch_rejects_unknown_profiles_and_single_profile_options(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiles, "_registry", _registry(tmp_path))
+    with pytest.raises(SystemExit, match="Unknown profile.*nope"):
+        cli.main(["--profiles", "ana,nope", "--out-dir", str(tmp_path / "out")])
+    for argv in (
+        ["--profiles", "ana"],
+        ["--profiles", "ana", "--profile", "bo", "--out-dir", "x"],
+        ["--all-profiles", "--recommend", "--out-dir", "x"],
+        ["--out-dir", "x"],
+    ):
+        with pytest.raises(SystemExit):
+            cli.parse_args(argv)
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+from app.core.dates import _parse_string, posted_epoch, stamp_posted, to_epoch
+from app.filters import apply_filters
+
+TS = int(datetime(2025, 10, 17, 14, 5, 11, tzinfo=timezone.utc).timestamp())
+DAY = int(datetime(2025, 10, 17, tzinfo=timezone.utc).timestamp())
+
+
+def test_sniffs_every_supported_shape():
+    assert to_epoch("2025-10-17T14:05:11Z") == TS
+    assert to_epoch("2025-10-17T16:05:11+02:00") == TS
+    assert to_epoch("2025-10-17T14:05:11.250000+00:00") == TS
+    assert to_epoch("2025-10-17T14:05:11") == TS
+    assert to_epoch("2025-10-17") == DAY
+    assert to_epoch("Fri, 17 Oct 2025 14:05:11 +0000") == TS
+    assert to_epoch("Fri, 17 Oct 2025 14:05:11 GMT") == TS
+    assert to_epoch("17 Oct 2025 14:05:11 +0000") == TS
+    assert to_epoch("10/17/2025") == DAY
+    assert to_epoch(str(TS)) == TS
+    assert to_epoch(TS) == TS
+    assert to_epoch(TS * 1000) == TS
+    assert to_epoch(datetime(2025, 10, 17)) == DAY
+
+
+def test_garbage_is_none_and_strings_are_memoized():
+    for bad in (None, "", "yesterday", "2025-13-45", "Foo, 99 Bar", True, [], 0):
+        assert to_epoch(bad) is None
+    before = _parse_string.cache_info().hits
+    to_epoch("2025-10-17")
+    to_epoch("2025-10-17")
+    assert _parse_string.cache_info().hits >= before + 1
+
+
+def test_stamp_and_filter_compare_integers(monkeypatch):
+    gigs = stamp_posted(
+        [
+            {"title": "a", "published": "Fri, 17 Oct 2025 14:05:11 +0000"},
+            {"title": "b", "epoch": TS - 30 * 86400},
+            {"title": "c", "date": "2025-10-16T00:00:00+00:00"},
+            {"title": "d"},
+        ]
+    )
+    assert [g["posted_epoch"] for g in gigs] == [TS, TS - 30 * 86400, DAY - 86400, None]
+    assert posted_epoch({"date": "nonsense", "created_at": "2025-10-17"}) == DAY
+
+    import app.core.dates as dates
+
+    monkeypatch.setattr(dates.time, "time", lambda: TS + 86400)
+    kept = apply_filters(gigs, posted_within=7)
+    assert [g["title"] for g in kept] == ["a", "c", "d"]
@@ -0,0 +1,62 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from app.core.dedupe import DedupeConfig, dedupe_near, find_clusters
+from app.settings import Settings
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _corpus():
+    return json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+
+def test_cross_posted_gig_collapses_to_newest_copy():
+    gigs = _corpus()
+    gigs[0]["posted_epoch"], gigs[20]["posted_epoch"] = 100, 200
+    assert [c for c in find_clusters(gigs) if len(c) > 1] == [[0, 20]]
+
+    kept = dedupe_near(gigs)
+    assert len(kept) == len(gigs) - 1
+    assert kept[0]["id"] == gigs[20]["id"]
+    assert kept[0]["duplicates"] == [
+        {"source": "remoteok", "id": gigs[0]["id"], "url": gigs[0]["url"]}
+    ]
+    assert "duplicates" not in gigs[20]
+
+    strict = DedupeConfig(threshold=0.99)
+    assert len(dedupe_near(gigs, strict)) == len(gigs)
+
+
+def test_reposts_with_edits_cluster_and_empty_gigs_stay():
+    rng = random.Random(11)
+    gigs = _corpus()
+    # one edited word in a very short post moves too many shingles to count
+    # as a repost, so only edit posts of typical length
+    edited = [n for n, g in enumerate(gigs) if len((g.get("description") or "").split()) >= 16][:10]
+    reposts = []
+    for n in edited:
+        words = gigs[n]["description"].split()
+        words[rng.randrange(len(words))] = "updated"
+        reposts.append({**gigs[n], "id": f"repost-{n}", "description": " ".join(words)})
+    empties = [{"id": "e1"}, {"id": "e2", "description": "<p></p>"}]
+
+    clusters = find_clusters(gigs + reposts + empties)
+    cluster_of = {i: tuple(c) for c in clusters for i in c}
+    for k, n in enumerate(edited):
+        assert cluster_of[n] == cluster_of[len(gigs) + k]
+    assert len(clusters) == len(gigs) - 1 + len(empties)
+    assert all(len(c) == 1 for c in clusters if c[0] >= len(gigs) + len(reposts))
+
+
+def test_bands_outside_one_to_num_perm_are_rejected(monkeypatch):
+    assert DedupeConfig(bands=120).rows == 1
+    for bands in (0, 121, -3):
+        with pytest.raises(ValueError, match="bands"):
+            DedupeConfig(bands=bands)
+    monkeypatch.setenv("GA_DEDUPE_BANDS", "500")
+    with pytest.raises(ValueError, match="GA_DEDUPE_BANDS"):
+        Settings.load().dedupe_config()
@@ -0,0 +1,121 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+import app.cli as cli
+import app.exporters as exporters
+from app.exporters import GIG_FIELDS, CsvWriter, MarkdownWriter, export, format_for, save_md
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _gigs():
+    return json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+
+def test_one_pass_writes_every_format_and_json_matches_dumps(tmp_path):
+    gigs = _gigs()
+    consumed = []
+
+    def stream():
+        for gig in gigs:
+            consumed.append(gig)
+            yield gig
+
+    rows = export(
+        stream(),
+        [tmp_path / "g.json", tmp_path / "g.jsonl.gz", tmp_path / "g.csv", (tmp_path / "g.txt", "md")],
+    )
+    assert rows == len(consumed) == len(gigs)
+
+    assert (tmp_path / "g.json").read_text(encoding="utf-8") == json.dumps(gigs, indent=2, ensure_ascii=False)
+    with gzip.open(tmp_path / "g.jsonl.gz", "rt", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == gigs
+    with open(tmp_path / "g.csv", newline="", encoding="utf-8") as f:
+        table = list(csv.DictReader(f))
+    assert len(table) == len(gigs) and table[0]["id"] == str(gigs[0]["id"])
+    assert (tmp_path / "g.txt").read_text(encoding="utf-8").count("\n## ") == len(gigs)
+
+    export([], [tmp_path / "e.json", tmp_path / "e.csv"])
+    assert (tmp_path / "e.json").read_text() == "[]" and (tmp_path / "e.csv").read_text() == ""
+
+
+def test_markdown_and_csv_schema():
+    out = io.StringIO()
+    md = MarkdownWriter(out)
+    md.write({"title": "Writer", "company": "Acme", "score": 3})
+    assert out.getvalue() == "# Gig Agent Results\n\n## 1. Writer\n**Acme**\n_Score: 3_\n"
+
+    out = io.StringIO()
+    sampled = CsvWriter(out, sample=2)
+    for row in ({"b": 1}, {"a": 2}, {"a": 3, "late": "dropped"}):
+        sampled.write(row)
+    sampled.close()
+    assert out.getvalue().splitlines() == ["a,b", ",1", "2,", "3,"]
+
+    out = io.StringIO()
+    declared = CsvWriter(out, fieldnames=["id"])
+    declared.write({"id": 7, "other": "x"})
+    assert out.getvalue().splitlines() == ["id", "7"]
+
+
+def test_peak_memory_does_not_grow_with_listings(tmp_path):
+    def stream(n):
+        for i in range(n):
+            yield {"id": i, "title": f"Role {i}", "description": "x" * 200, "tags": ["a", "b"]}
+
+    def peak(n):
+        tracemalloc.start()
+        export(stream(n), [tmp_path / "p.json.gz", tmp_path / "p.csv", tmp_path / "p.md"])
+        _, top = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return top
+
+    small, large = peak(1_000), peak(20_000)
+    assert large < small * 2
+
+
+def test_cli_out_writes_several_formats_and_defaults_unknown_suffixes_to_json(tmp_path, capsys):
+    paths = [str(tmp_path / "gigs.json"), str(tmp_path / "gigs.csv.gz")]
+    cli.write_out(paths, iter(_gigs()))
+    assert json.loads(Path(paths[0]).read_text(encoding="utf-8")) == _gigs()
+    assert f"Wrote {len(_gigs())} gigs to" in capsys.readouterr().out
+
+    assert cli.parse_args(["--out", "a.jsonl", "--out", "b.md"]).out == ["a.jsonl", "b.md"]
+    assert cli.parse_args(["--out", "results.txt"]).out == ["results.txt"]
+    cli.write_out(str(tmp_path / "results.txt"), iter(_gigs()))
+    assert json.loads((tmp_path / "results.txt").read_text(encoding="utf-8")) == _gigs()
+    with pytest.raises(ValueError):
+        format_for("gigs.xlsx")
+    save_md(iter(_gigs()), tmp_path / "r.md")
+
+
+def test_csv_logs_dropped_columns_and_cli_keeps_late_gig_fields(tmp_path, capsys):
+    records = []
+    handler = logging.Handler(logging.WARNING)
+    handler.emit = records.append
+    exporters.log.addHandler(handler)
+    try:
+        sampled = CsvWriter(io.StringIO(), sample=1)
+        for row in ({"a": 1}, {"a": 2, "late": 1}, {"a": 3, "late": 2, "later": 3}):
+            sampled.write(row)
+        sampled.close()
+        # a gig that only shows up after the first CSV_SAMPLE rows
+        gigs = [*_gigs()] * 5 + [{**_gigs()[0], "duplicates": [{"source": "wwr", "id": "x"}], "score": 2.5}]
+        cli.write_out(str(tmp_path / "gigs.csv"), iter(gigs))
+    finally:
+        exporters.log.removeHandler(handler)
+
+    assert [(r.getMessage(), r.fields) for r in records] == [
+        ("export.csv_dropped_columns", {"columns": ["late", "later"]}),
+    ]
+    with open(tmp_path / "gigs.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(gigs) and list(rows[0]) == GIG_FIELDS
+    assert rows[-1]["score"] == "2.5" and "wwr" in rows[-1]["duplicates"]
@@ -0,0 +1,168 @@
+import itertools
+import json
+import re
+from pathlib import Path
+
+import app.filters as app_filters
+import gig_agent.filters as ga_filters
+from app.core.dates import stamp_posted
+from app.core.filtering import FilterChain, Predicate
+from app.core.index import CorpusIndex
+from app.core.plan import gig_components
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _corpus():
+    gigs = stamp_posted(json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8")))
+    # titles only on some fixtures; mirror position into title for half of them
+    for i, g in enumerate(gigs):
+        if not g.get("title") and i % 2:
+            g["title"] = g.get("position")
+    gigs.append({"id": "odd", "title": None, "company": None, "location": None, "is_remote": True})
+    return gigs
+
+
+OPTIONS = {
+    "query": [None, "email", "marketing AND remote", "senior developer", "AND", "email and marketing", "market", "develop"],
+    "remote_only": [False, True],
+    "posted_within": [None, 0, 7, 3650],
+    "company_block": [None, "brightwave, folio", " , "],
+    "role_allow": [None, "engineer,marketing", "developer"],
+}
+
+
+def _combos():
+    keys = list(OPTIONS)
+    for values in itertools.product(*OPTIONS.values()):
+        yield dict(zip(keys, values))
+
+
+def _query_reference(gig, query, components, loose_operators=False):
+    """
+    The old keyword filters: every word a substring of one of `components`
+    ("market" matches "marketing"), without the query parser or an index.
+    With `loose_operators`, lower-case and/or are dropped as gig_agent does.
+    """
+    words = [w.lower() for w in (query or "").split() if w not in ("AND", "OR", "NOT")]
+    if loose_operators:
+        words = [w for w in words if w not in ("and", "or")]
+    parts = gig_components(gig)
+    return all(any(w in parts[c] for c in components) for w in words)
+
+
+def _app_stages(gigs, query, remote_only, posted_within, company_block, role_allow):
+    """The list-per-stage pipeline in app/filters, with a reference query match."""
+    result = list(gigs)
+    if query:
+        result = [g for g in result if _query_reference(g, query, ("title", "company", "description"))]
+    if remote_only:
+        result = [g for g in result if app_filters._is_remote(g)]
+    if posted_within:
+        result = [g for g in result if app_filters._within_days(g, posted_within)]
+    blocked = [c.strip() for c in (company_block or "").split(",") if c.strip()]
+    if blocked:
+        result = [g for g in result if not app_filters._blocked_company(g, blocked)]
+    allowed = [r.strip() for r in (role_allow or "").split(",") if r.strip()]
+    if allowed:
+        result = [g for g in result if app_filters._role_allowed(g, allowed)]
+    return result
+
+
+def _ga_stages(gigs, query, remote_only, posted_within, company_block, role_allow):
+    """The list-per-stage pipeline in gig_agent/filters, with a reference query match."""
+    rows = [g for g in gigs if _query_reference(g, query, ga_filters.QUERY_COMPONENTS, loose_operators=True)]
+    rows = ga_filters.filter_remote_only(rows, remote_only)
+    rows = ga_filters.filter_posted_within(rows, posted_within)
+    rows = ga_filters.filter_company_blocklist(
+        rows, [c.strip() for c in (company_block or "").split(",") if c.strip()]
+    )
+    return ga_filters.filter_title_allowlist(
+        rows, [r.strip() for r in (role_allow or "").split(",") if r.strip()]
+    )
+
+
+def test_app_chain_matches_stage_pipeline():
+    gigs = _corpus()
+    for opts in _combos():
+        assert app_filters.apply_filters(iter(gigs), **opts) == _app_stages(gigs, **opts), opts
+
+
+def test_gig_agent_chain_matches_stage_pipeline():
+    gigs = _corpus()
+    for opts in _combos():
+        assert ga_filters.apply_filters(iter(gigs), **opts) == _ga_stages(gigs, **opts), opts
+
+
+def test_query_paths_agree_with_and_without_an_index():
+    gigs = _corpus()
+    for query in OPTIONS["query"]:
+        want = [g for g in gigs if _query_reference(g, query, ("title", "company", "description"))]
+        assert [g for g in gigs if app_filters._matches_query(g, query or "")] == want, query
+        ga_want = [g for g in gigs if _query_reference(g, query, ga_filters.QUERY_COMPONENTS, True)]
+        assert ga_filters.filter_query_keywords(gigs, query) == ga_want, query
+    assert ga_filters.filter_query_keywords(gigs, 'or "email and"') == ga_filters.filter_query_keywords(
+        gigs, '"email and"'
+    )
+    index = CorpusIndex(gigs)
+    copies = CorpusIndex([dict(g) for g in gigs])  # e.g. a snapshot's own dicts
+    for module in (app_filters, ga_filters):
+        for query in OPTIONS["query"]:
+            plain = module.compile_filters(query=query).apply(gigs)
+            assert module.compile_filters(query=query, index=index).apply(gigs) == plain, query
+            assert module.compile_filters(query=query, index=copies).apply(gigs) == plain, query
+        unindexed = {"id": "elsewhere", "source": "x", "title": "Email lead"}
+        assert module.compile_filters(query="email", index=index).apply([unindexed]) == [unindexed]
+        assert module.compile_filters(query="  ").apply(gigs) == gigs
+
+        # no index: the query is matched lazily, nothing is read ahead
+        def listings():
+            for n in itertools.count():
+                yield {"id": n, "title": "Email marketer" if n % 3 == 0 else "Designer", "location": "Remote"}
+
+        source = listings()
+        first = list(itertools.islice(module.compile_filters(query="email").stream(source), 4))
+        assert [g["id"] for g in first] == [0, 3, 6, 9]
+        assert next(source)["id"] == 10
+
+
+def test_chain_is_lazy_stops_at_first_rejection_and_reorders():
+    calls = []
+
+    def probe(name, keep):
+        def test(view):
+            calls.append(name)
+            return keep(view.listing)
+        return test
+
+    chain = FilterChain(
+        [
+            Predicate("slow_loose", probe("slow_loose", lambda g: True), cost=10, pass_rate=0.9),
+            Predicate("cheap_tight", probe("cheap_tight", lambda g: g["n"] % 10 == 0), cost=1, pass_rate=0.1),
+        ],
+        calibrate=0,
+    )
+    assert [p.name for p in chain.predicates] == ["cheap_tight", "slow_loose"]
+
+    listings = ({"n": n} for n in range(1000))
+    stream = chain.stream(listings)
+    assert next(stream) == {"n": 0}
+    assert calls == ["cheap_tight", "slow_loose"]
+    assert next(listings) == {"n": 1}  # nothing read ahead
+
+    calls.clear()
+    kept = list(chain.stream({"n": n} for n in range(1, 100)))
+    assert len(kept) == 9
+    assert calls.count("cheap_tight") == 99 and calls.count("slow_loose") == 9
+
+    # misleading priors: measurement has to put the selective check first
+    measured = FilterChain(
+        [
+            Predicate("slow_loose", lambda v: sum(range(200)) > 0, cost=1, pass_rate=0.1),
+            Predicate("cheap_tight", lambda v: v.listing["n"] % 10 == 0, cost=10, pass_rate=0.9),
+        ],
+        calibrate=50,
+    )
+    assert measured.predicates[0].name == "slow_loose"
+    assert measured.apply({"n": n} for n in range(200)) == [{"n": n} for n in range(0, 200, 10)]
+    assert measured.predicates[0].name == "cheap_tight"
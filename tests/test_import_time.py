@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative import time budgets (ms) for a cold interpreter. FastAPI itself
+# accounts for most of the API's; the CLI has no web stack at all.
+BUDGETS_MS = {"app.api": 1500, "app.main": 1500, "app.cli": 400}
+
+# Loaded on first fetch / first use, never at startup
+LAZY = ("httpx", "feedparser", "bs4", "numpy", "rich")
+
+
+def _import(module):
+    code = f"import sys, {module}; print(','.join(m for m in {LAZY!r} if m in sys.modules))"
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+
+
+def _cumulative_ms(stderr, module):
+    # "import time:  self [us] | cumulative | imported package"
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise AssertionError(f"{module} not in -X importtime output")
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_cold_import_stays_within_budget(module):
+    result = _import(module)
+    if result.returncode != 0:
+        raise AssertionError(result.stderr[-2000:])
+    assert result.stdout.strip() == "", f"{module} imported {result.stdout.strip()} eagerly"
+    assert _cumulative_ms(result.stderr, module) <= BUDGETS_MS[module]
+
+
+def test_servers_read_no_settings_at_import():
+    code = "import app.api, app.main, app.refresher, app.settings as s; print(s._settings is None)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.stdout.strip() == "True", result.stderr[-2000:]
@@ -0,0 +1,104 @@
+import json
+from pathlib import Path
+
+from app.core.index import CorpusIndex
+from app.core.plan import compile_plan, compile_profile_dict, explain, gig_fields
+from app.core.scoring import score_gig
+from app.user_config import UserConfig, load_user_config
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _corpus():
+    return json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+
+def _api_reference(gig, user_config):
+    title = (gig.get("title") or gig.get("position") or "").lower()
+    desc = (gig.get("description") or "").lower()
+    haystack = f"{title} {desc}"
+    hits = sum(1 for kw in user_config["keywords"] if kw and kw.lower() in haystack)
+    return score_gig(gig, user_config) + hits * 10
+
+
+def test_user_config_scores_match_score_gig():
+    gigs = _corpus()
+    configs = [
+        load_user_config("cindy"),
+        UserConfig(
+            profile_name="edge",
+            keywords_must_have=["c++", "engineer"],
+            keywords_nice_to_have=["next.js", "react", "react", "hub"],
+            keywords_avoid=["on-site", "full stack"],
+            titles_include=["developer"],
+            remote_only=False,
+            preferred_seniority=["junior"],
+        ),
+    ]
+    index = CorpusIndex(gigs)
+    for config in configs:
+        scores = index.score(compile_plan(config))
+        assert scores == [score_gig(g, user_config=config) for g in gigs]
+
+
+def test_score_many_matches_api_boost():
+    from app.api import PROFILES, profile_user_config, score_profiles
+
+    gigs = _corpus()
+    batch = score_profiles(gigs)
+    assert set(batch) == set(PROFILES)
+    for key, scores in batch.items():
+        config = profile_user_config(key)
+        assert scores == [_api_reference(g, config) for g in gigs]
+
+
+def test_score_many_shared_rules_match_single_plans():
+    gigs = _corpus()
+    configs = [
+        load_user_config("cindy"),
+        UserConfig(profile_name="a", keywords_must_have=["email"], keywords_nice_to_have=["email", "seo"]),
+        UserConfig(profile_name="b", keywords_nice_to_have=["seo", "email"], keywords_avoid=["crypto"]),
+    ]
+    plans = [compile_plan(c, name=str(i)) for i, c in enumerate(configs)]
+    plans.append(compile_profile_dict({"keywords": ["email", "email", "design"]}, name="dup"))
+    index = CorpusIndex(gigs)
+    many = index.score_many(plans)
+    for plan in plans:
+        assert many[plan.name] == CorpusIndex(gigs).score(plan)
+
+
+def test_terms_keep_substring_semantics():
+    gigs = [
+        {"position": "Emails and next.js", "description": "C++ shop"},
+        {"position": "Mail room", "description": "nothing here"},
+    ]
+    index = CorpusIndex(gigs)
+    assert index.docs("text", "email") == {0}
+    assert index.docs("text", "mail") == {0, 1}
+    assert index.docs("text", "next.js") == {0}
+    assert index.docs("text", "c++") == {0}
+    assert index.docs("text", "") == {0, 1}
+
+    plan = compile_profile_dict({"keywords": ["mail", "room"]})
+    assert index.score(plan) == [10.0, 20.0]
+
+
+def test_explain_breakdown_adds_up_to_score():
+    gigs = _corpus()
+    config = UserConfig(
+        profile_name="why",
+        keywords_must_have=["python", "remote"],
+        keywords_nice_to_have=["react", "email"],
+        keywords_avoid=["on-site"],
+        titles_include=["engineer"],
+    )
+    plan = compile_plan(config)
+    for gig in gigs:
+        breakdown = explain(plan, gig)
+        assert breakdown["score"] == score_gig(gig, user_config=config)
+        assert breakdown["score"] == sum(r["weight"] for r in breakdown["rules"])
+        for rule in breakdown["rules"]:
+            if rule["kind"] == "must_have":
+                assert rule["terms"] and all(t not in gig_fields(gig)["text"] for t in rule["terms"])
+            else:
+                assert rule["terms"]
@@ -0,0 +1,29 @@
+import io
+import json
+import logging
+
+from app.core.logs import configure_logging, get_logger, log_event
+from app.settings import settings
+
+
+def test_records_are_json_lines_and_hot_messages_are_sampled():
+    out = io.StringIO()
+    configure_logging("INFO", "json", "search.request=0.25,noisy=0", stream=out)
+    log = get_logger("tests")
+    try:
+        for i in range(8):
+            log_event(log, "search.request", n=i)
+        log_event(log, "noisy")
+        log_event(log, "noisy", logging.WARNING, why="never sampled")
+        log_event(log, "corpus.fetched", gigs=3)
+        log_event(log, "debug.detail", logging.DEBUG)
+    finally:
+        # flushes the test stream, then restores the app's configuration
+        configure_logging(settings.log_level, settings.log_format, settings.log_sample)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r.get("n") for r in records if r["msg"] == "search.request"] == [0, 4]
+    assert [r["level"] for r in records if r["msg"] == "noisy"] == ["warning"]
+    fetched = next(r for r in records if r["msg"] == "corpus.fetched")
+    assert fetched["gigs"] == 3 and fetched["logger"] == "gig_agent.tests"
+    assert not any(r["msg"] == "debug.detail" for r in records)
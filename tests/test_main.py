@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import app.main as main
+import app.sources.remoteok_api as remoteok_api
+from app.models import Gig, ScoredGig
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _client(monkeypatch):
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in corpus if g["source"] == "remoteok"][:limit] + [{"id": 0, "position": "No link"}]
+
+    class NoWWR:
+        async def fetch(self, limit=50):
+            return []
+
+    monkeypatch.setattr(remoteok_api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(main, "WeWorkRemotely", NoWWR)
+    return TestClient(main.app)
+
+
+def test_gigs_are_ranked_and_stream_with_the_api_header(monkeypatch):
+    client = _client(monkeypatch)
+    plain = client.get("/gigs", params={"limit": 5})
+    assert plain.status_code == 200
+    gigs = plain.json()
+    assert 0 < len(gigs) <= 5 and all(g["source"] == "remoteok" and g["url"] for g in gigs)
+    assert [(-g["score"], g["id"]) for g in gigs] == sorted((-g["score"], g["id"]) for g in gigs)
+
+    lines = client.get("/gigs", params={"limit": 5, "stream": True}).text.splitlines()
+    assert json.loads(lines[0]) == {"profile_used": None, "next_cursor": None}
+    assert [json.loads(line) for line in lines[1:]] == gigs
+
+
+def test_rank_gigs_builds_scored_copies_without_revalidating():
+    gigs = [
+        Gig(id="b", title="Remote writer", url="https://example.com/b", source="wwr"),
+        Gig(id="a", title="Onsite clerk", url="https://example.com/a", source="wwr"),
+        Gig(id="c", title="Remote editor", url="https://example.com/c", source="wwr"),
+    ]
+    ranked = main.rank_gigs(gigs)
+    assert [g.id for g in ranked] == ["b", "c", "a"]
+    assert all(type(g) is ScoredGig for g in ranked)
+    assert ranked[0].url is gigs[0].url  # copied, not re-parsed
@@ -0,0 +1,79 @@
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.core.index import CorpusIndex
+from app.core.plan import compile_plan
+from app.core.scoring import score_gig
+from app.user_config import UserConfig, load_user_config
+
+np = pytest.importorskip("numpy")
+
+from app.core.matrix import TermMatrix, score_plans  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_matrix_matches_reference_scorer():
+    gigs = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    configs = [
+        load_user_config("cindy"),
+        UserConfig(
+            profile_name="wide",
+            keywords_must_have=["remote"],
+            keywords_nice_to_have=["react", "react", "design", "c++"],
+            keywords_avoid=["on-site", "full stack"],
+            titles_include=["engineer", "developer"],
+            locations_preferred=["remote", "us"],
+            max_hours_per_week=20,
+            preferred_seniority=["senior", "junior"],
+        ),
+        UserConfig(profile_name="bare", remote_only=False),
+    ]
+    plans = [compile_plan(c) for c in configs]
+    index = CorpusIndex(gigs)
+    matrix = TermMatrix.for_plans(index, plans)
+
+    for config, plan in zip(configs, plans):
+        expected = [score_gig(g, user_config=config) for g in gigs]
+        assert matrix.score(plan).tolist() == expected
+
+    batch = score_plans(CorpusIndex(gigs), plans, engine="numpy")
+    assert batch["cindy"] == [score_gig(g, user_config=configs[0]) for g in gigs]
+
+
+def _score_concurrently(gigs, plans):
+    index = CorpusIndex(gigs)
+    start = threading.Barrier(len(plans))
+
+    def run(plan):
+        start.wait()
+        return score_plans(index, [plan], engine="numpy")[plan.name]
+
+    with ThreadPoolExecutor(len(plans)) as pool:
+        return dict(zip((p.name for p in plans), pool.map(run, plans)))
+
+
+def test_concurrent_scoring_on_one_index_is_consistent():
+    gigs = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    words = sorted({w.strip(".,()").lower() for g in gigs for w in (g.get("description") or "").split()})
+    words = [w for w in words if w.isalpha()][:160]
+    # distinct plans, so every thread adds columns to the shared matrix
+    configs = [
+        UserConfig(profile_name=f"p{n}", keywords_nice_to_have=words[n * 10:(n + 1) * 10], keywords_avoid=[words[-n - 1]])
+        for n in range(16)
+    ]
+    plans = [compile_plan(c) for c in configs]
+    expected = {p.name: [score_gig(g, user_config=c) for g in gigs] for p, c in zip(plans, configs)}
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often, so unguarded builds interleave
+    try:
+        for _ in range(20):
+            assert _score_concurrently(gigs, plans) == expected
+    finally:
+        sys.setswitchinterval(interval)
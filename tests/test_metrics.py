@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Registry
+from app.core.ranking import RankingCache
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    stages = registry.histogram("t_seconds", "Stage time", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        stages.observe(value, stage="score")
+    hits = registry.counter("t_hits_total", "Hits", ["cache"])
+    hits.inc(cache='a"b')
+
+    text = registry.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{stage="score",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="score",le="1"} 3' in text
+    assert 't_seconds_bucket{stage="score",le="+Inf"} 4' in text
+    assert 't_seconds_sum{stage="score"} 4.05' in text
+    assert 't_seconds_count{stage="score"} 4' in text
+    assert 't_hits_total{cache="a\\"b"} 1' in text
+    assert registry.histogram("t_seconds", "Stage time", ["stage"]) is stages
+
+
+def test_metrics_endpoint_reports_search_stages(monkeypatch):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_remoteok(limit=50):
+        raise RuntimeError("upstream down")
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    errors = api.UPSTREAM_ERRORS.value(source="remoteok")
+    scored = api.SEARCHES.value(served_from="scored")
+    cached = api.SEARCHES.value(served_from="ranking_cache")
+    first = client.get("/gigs", params={"profile": "developer", "limit": 5})
+    client.get("/gigs", params={"profile": "developer", "limit": 5, "cursor": first.json()["next_cursor"]})
+
+    assert api.UPSTREAM_ERRORS.value(source="remoteok") == errors + 1
+    assert api.SEARCHES.value(served_from="scored") == scored + 1
+    assert api.SEARCHES.value(served_from="ranking_cache") == cached + 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for stage in ("filter", "score", "sort", "serialize"):
+        assert f'ga_stage_duration_seconds_count{{stage="{stage}"}}' in response.text
+    assert 'ga_fetch_duration_seconds_count{source="wwr"}' in response.text
+    assert f"ga_corpus_gigs {len(api.CORPUS.current.gigs)}" in response.text
+    assert 'ga_admission_total{result="admitted"}' in response.text
+    assert 'ga_fragment_cache_total{result="hit"}' in response.text
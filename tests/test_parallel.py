@@ -0,0 +1,39 @@
+import asyncio
+import json
+from pathlib import Path
+
+from app.core.parallel import ParallelScorer
+from app.core.plan import compile_plan, compile_profile_dict
+from app.core.ranking import gig_id
+from app.core.scoring import score_gig
+from app.user_config import load_user_config
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _corpus():
+    gigs = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    # repeat with fresh ids so shards hold ties across boundaries
+    return [{**g, "id": f"{n}-{gig_id(g)}"} for n in range(4) for g in gigs]
+
+
+def test_pool_scores_match_in_process_and_top_k_merges_in_rank_order():
+    gigs = _corpus()
+    config = load_user_config("cindy")
+    installed = compile_plan(config)
+    adhoc = compile_profile_dict({"keywords": ["python", "email"]}, name="adhoc")
+
+    with ParallelScorer([installed], workers=2, min_parallel=1) as scorer:
+        scores = scorer.score(gigs, [installed, adhoc])
+        best = scorer.top_k(gigs, 7, [installed, adhoc])
+        assert asyncio.run(scorer.score_async(gigs, [adhoc])) == {"adhoc": scores["adhoc"]}
+
+    serial = ParallelScorer([installed], workers=1)
+    assert scores == serial.score(gigs, [installed, adhoc])
+    assert scores[installed.name] == [score_gig(g, user_config=config) for g in gigs]
+
+    for name, hits in best.items():
+        want = sorted(range(len(gigs)), key=lambda i: (-scores[name][i], gig_id(gigs[i])))[:7]
+        assert [pos for pos, _ in hits] == want
+        assert [s for _, s in hits] == [scores[name][i] for i in want]
+        assert serial.top_k(gigs, 7, [installed, adhoc])[name] == hits
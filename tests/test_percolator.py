@@ -0,0 +1,190 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.percolator import AlertHub, Percolator, SavedSearch, trigger_clauses
+from app.core.plan import compile_plan, compile_profile_dict, evaluate, gig_fields
+from app.user_config import UserConfig
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _corpus():
+    return json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+
+def _brute_force(searches, gigs):
+    out = []
+    for gig in gigs:
+        fields = gig_fields(gig)
+        for s in sorted(searches, key=lambda s: s.id):
+            triggered = any(
+                all(t in fields[c.field] for t in c.terms) if c.mode == "missing"
+                else any(t in fields[c.field] for t in c.terms)
+                for c in trigger_clauses(s.plan)
+            )
+            if not triggered or any(d in fields["haystack"] for d in s.disqualifiers):
+                continue
+            score = evaluate(s.plan, gig)
+            if score >= s.min_score:
+                out.append((s.id, gig["id"], score))
+    return out
+
+
+def test_percolate_matches_brute_force():
+    gigs = _corpus()
+    rng = random.Random(5)
+    words = sorted({w.strip(".,()").lower() for g in gigs for w in (g.get("description") or "").split()})
+    perc = Percolator()
+    perc.observe(gigs[:10])
+    searches = []
+    for i in range(150):
+        kws = rng.sample(words, rng.randint(1, 3)) + (["ai"] if i % 25 == 0 else [])
+        s = SavedSearch(
+            f"s{i:03d}",
+            compile_profile_dict({"keywords": kws}, name=f"s{i}"),
+            disqualifiers=tuple(rng.sample(words, 1)) if i % 3 == 0 else (),
+            min_score=rng.choice([0.0, 10.0, 15.0]),
+        )
+        searches.append(perc.add(s))
+    config = UserConfig(profile_name="u", keywords_must_have=["email", "marketing"], titles_include=["manager"])
+    searches.append(perc.add(SavedSearch("user", compile_plan(config), min_score=-100)))
+    perc.reindex()
+
+    got = [(m.search_id, m.gig["id"], m.score) for m in perc.percolate(gigs)]
+    assert got == _brute_force(searches, gigs)
+    assert got  # the fixtures do match some of them
+
+
+def test_candidates_do_not_grow_with_unrelated_searches():
+    gig = _corpus()[0]
+    perc = Percolator()
+    perc.add(SavedSearch("email", compile_profile_dict({"keywords": ["email"]})))
+    for i in range(2000):
+        perc.add(SavedSearch(f"x{i}", compile_profile_dict({"keywords": [f"zq{i:04d}x"]})))
+    matches = perc.match(gig)
+    assert [m.search_id for m in matches] == ["email"]
+    assert perc.candidates_checked < 20
+
+    assert perc.remove("email") and not perc.remove("email")
+    assert perc.match(gig) == [] and len(perc) == 2000
+
+
+def test_searches_without_terms_are_rejected():
+    perc = Percolator()
+    try:
+        perc.add(SavedSearch("none", compile_profile_dict({"keywords": []})))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_hub_drops_oldest_for_slow_subscribers():
+    async def run():
+        hub = AlertHub(max_pending=2)
+        queue = hub.subscribe("s")
+        from app.core.percolator import PercolatorMatch
+
+        sent = hub.publish(PercolatorMatch("s", {"id": str(i)}, 1.0) for i in range(3))
+        assert sent == 3 and hub.publish([PercolatorMatch("other", {}, 1.0)]) == 0
+        assert [queue.get_nowait().gig["id"] for _ in range(2)] == ["1", "2"]
+        hub.unsubscribe("s", queue)
+        assert hub.subscribers("s") == 0
+
+    asyncio.run(run())
+
+
+def test_new_gigs_are_pushed_to_alert_subscribers(monkeypatch):
+    import app.api as api
+
+    corpus = _corpus()
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    monkeypatch.setattr(api, "PERCOLATOR", Percolator())
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    client.get("/gigs", params={"profile": "cindy"})  # baseline fetch
+    created = client.post("/alerts", json={"profile": {"keywords": ["zeppelin"]}})
+    assert created.status_code == 201
+    alert_id = created.json()["id"]
+    assert client.post("/alerts", json={"profile": {"keywords": []}}).status_code == 400
+    assert client.get("/alerts/nope/events").status_code == 404
+
+    corpus.append({
+        "id": "new-1", "source": "remoteok", "position": "Zeppelin Copywriter",
+        "company": "Airship", "url": "https://example.com/new-1",
+        "description": "Remote copy role for a zeppelin maker.",
+    })
+
+    async def never():
+        return False
+
+    async def flow():
+        events = api.alert_events(alert_id, never)
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)  # let the stream subscribe
+        await api.CORPUS.refresh()
+        message = await asyncio.wait_for(pending, timeout=5)
+        await events.aclose()
+        return message
+
+    message = asyncio.run(flow())
+    lines = message.decode().splitlines()
+    assert lines[:2] == ["id: 1", "event: match"]
+    gig = json.loads(lines[2][len("data: "):])
+    assert gig["id"] == "new-1" and gig["score"] >= 10
+    assert api.ALERTS.subscribers(alert_id) == 0
+
+    assert client.delete(f"/alerts/{alert_id}").status_code == 200
+    assert client.delete(f"/alerts/{alert_id}").status_code == 404
+
+
+def test_empty_first_fetch_is_not_the_baseline_and_shared_mode_rejects_alerts(monkeypatch, tmp_path):
+    import app.api as api
+    from app.core.corpus import CorpusStore
+    from app.core.shared import SharedCorpus
+
+    corpus = []
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in corpus]
+
+    async def fake_wwr(limit=50):
+        return []
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    percolator = Percolator()
+    percolator.add(SavedSearch(id="s", plan=compile_profile_dict({"keywords": ["email"]}, name="s")))
+    monkeypatch.setattr(api, "PERCOLATOR", percolator)
+    published = []
+    monkeypatch.setattr(api.ALERTS, "publish", lambda matches: published.extend(matches) or len(matches))
+
+    store = CorpusStore(api.fetch_corpus, refresh_seconds=0)
+    store.on_refresh(api._percolate_new_gigs)
+    asyncio.run(store.refresh())  # empty: no baseline yet
+    corpus.extend(_corpus())
+    asyncio.run(store.refresh())  # first real corpus is the baseline
+    assert published == []
+    corpus.append({
+        "id": "new-1", "source": "remoteok", "position": "Email Marketer",
+        "company": "Acme", "url": "https://example.com/new-1", "description": "Remote email role.",
+    })
+    asyncio.run(store.refresh())
+    assert [m.gig["id"] for m in published] == ["new-1"]
+
+    monkeypatch.setattr(api, "SHARED", SharedCorpus(str(tmp_path)))
+    resp = TestClient(api.app).post("/alerts", json={"profile": "cindy"})
+    assert resp.status_code == 501
@@ -0,0 +1,130 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.profiles as profiles
+from app.core.profiles import ProfileRegistry
+from app.core.ranking import RankingCache
+from app.settings import get_settings
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _write(path, data, bump=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if bump:  # same-second edits must still look changed
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump))
+
+
+def test_registry_reloads_only_changed_files_and_swaps_generations(monkeypatch, tmp_path):
+    _write(tmp_path / "ana.json", {"profile_name": "ana", "keywords_nice_to_have": ["figma"]})
+    _write(tmp_path / "profiles" / "design.json", {"label": "Design", "keywords": ["designer"]})
+    _write(tmp_path / "profiles" / "ops.json", {"keywords": ["devops"]})
+    registry = ProfileRegistry(tmp_path)
+    assert registry.reload() == 3 and registry.version == 1
+
+    ana, design = registry.get("ana"), registry.get("Design", "search")
+    assert ana.config.keywords_nice_to_have == ["figma"] and ana.plan.name == "ana"
+    assert design.label == "Design" and design.config["keywords"] == ["designer"]
+    assert list(registry.view("search")) == ["design", "ops"]
+    assert registry.get("design") is None  # kinds are separate namespaces
+
+    assert registry.reload() == 0 and registry.version == 1
+
+    _write(tmp_path / "profiles" / "design.json", {"keywords": ["illustrator"]}, bump=10**9)
+    (tmp_path / "profiles" / "ops.json").unlink()
+    assert registry.reload() == 2 and registry.version == 2
+    assert registry.get("ana") is ana  # untouched files are not re-read
+    assert registry.get("design", "search").plan.fingerprint != design.plan.fingerprint
+    assert "ops" not in registry.view("search")
+
+    _write(tmp_path / "ana.json", {"keywords_avoid": "not a list"}, bump=2 * 10**9)
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    registry.reload()
+    assert registry.get("ana") is ana  # the last good version keeps serving
+    assert registry.get("broken") is None
+    assert set(registry.errors) == {str(tmp_path / "ana.json"), str(tmp_path / "broken.json")}
+
+    # broken files are not re-read (or re-logged) on every tick, only once they change
+    reads = []
+    real_read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self.name) or real_read_text(self, *a, **k))
+    errors = dict(registry.errors)
+    assert registry.reload() == 0 and reads == [] and registry.errors == errors
+    _write(tmp_path / "broken.json", {"profile_name": "fixed"}, bump=10**9)
+    assert registry.reload() == 1 and reads == ["broken.json"]
+    assert registry.get("broken") is not None and set(registry.errors) == {str(tmp_path / "ana.json")}
+
+
+def test_gigs_uses_registry_profiles_without_file_io(monkeypatch, tmp_path):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    api.CORPUS.invalidate()
+
+    _write(tmp_path / "profiles" / "cindy.json", {"keywords": ["email"]})
+    _write(tmp_path / "profiles" / "writer.json", {"keywords": ["writer"], "min_pay": 15})
+    registry = ProfileRegistry(tmp_path)
+    registry.reload()
+    monkeypatch.setattr(api, "PROFILES", registry.view("search"))
+    client = TestClient(api.app)
+
+    def no_io(*args, **kwargs):
+        raise AssertionError("profile file read on the request path")
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "read_text", no_io)
+        m.setattr("builtins.open", no_io)
+        first = client.get("/gigs", params={"profile": "writer", "limit": 3}).json()
+    assert first["profile_used"]["keywords"] == ["writer"]
+    assert first["profile_used"]["min_pay"] == 15
+
+    _write(tmp_path / "profiles" / "writer.json", {"keywords": ["designer"]}, bump=10**9)
+    registry.reload()
+    second = client.get("/gigs", params={"profile": "writer", "limit": 3}).json()
+    assert second["profile_used"]["keywords"] == ["designer"]
+
+    unknown = client.get("/gigs", params={"profile": "nobody", "limit": 3}).json()
+    assert unknown["profile_used"]["keywords"] == ["email"]
+    assert unknown["profile_used"]["preferred_roles"] == ["nobody"]
+
+
+def test_profiles_load_at_startup_and_a_bad_default_stops_it(monkeypatch, tmp_path):
+    import app.api as api
+
+    code = "import app.api, app.core.profiles as p; print(p._registry is None)"
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=60)
+    assert result.stdout.strip().endswith("True"), result.stderr[-2000:]
+
+    monkeypatch.setattr(get_settings(), "profile_poll_seconds", 0)
+    monkeypatch.setattr(api, "SCORER", api.ParallelScorer(workers=1))
+    _write(tmp_path / "profiles" / "cindy.json", {"keywords": "email"})  # not a list
+    registry = ProfileRegistry(tmp_path)
+    registry.reload()
+    monkeypatch.setattr(profiles, "_registry", registry)
+    with pytest.raises(RuntimeError, match="cindy.json is invalid"):
+        with TestClient(api.app):
+            pass
+
+    _write(tmp_path / "profiles" / "cindy.json", {"keywords": ["email"]}, bump=10**9)
+    registry.reload()
+    with TestClient(api.app):
+        assert [p.name for p in api.SCORER.plans] == ["cindy"]
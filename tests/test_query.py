@@ -0,0 +1,110 @@
+import json
+import random
+import re
+from pathlib import Path
+
+from app.core.index import CorpusIndex, tokenize
+from app.core.plan import gig_components
+from app.core.query import And, Not, Or, Term, parse_query
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _corpus():
+    return json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+
+def test_parser_builds_tree_and_tolerates_junk():
+    q = parse_query('title:design* OR (tag:"email marketing" AND NOT crypto) next.js')
+    # AND binds tighter than OR
+    assert q.root == Or(
+        (
+            Term("title", ("design",), prefix=True),
+            And(
+                (
+                    And((Term("tag", ("email", "marketing")), Not(Term(None, ("crypto",), substring=True)))),
+                    Term(None, ("next", "js")),
+                )
+            ),
+        )
+    )
+    assert parse_query("AND OR NOT )(").empty
+    assert parse_query("").empty
+    assert parse_query('"unterminated phrase').root == Term(None, ("unterminated", "phrase"))
+
+
+def _naive(node, gig, default):
+    """Per-gig reference evaluation of a parsed query tree."""
+    if isinstance(node, Or):
+        return any(_naive(i, gig, default) for i in node.items)
+    if isinstance(node, And):
+        return all(_naive(i, gig, default) for i in node.items)
+    if isinstance(node, Not):
+        return not _naive(node.item, gig, default)
+    parts = gig_components(gig)
+    fields = {"title": ("title",), "company": ("company",), "tag": ("tags",)}
+    for component in fields[node.field] if node.field else default:
+        text = parts[component]
+        if node.substring:
+            if node.tokens[0] in text:
+                return True
+            continue
+        body = r"[^a-z0-9\n]+".join(map(re.escape, node.tokens))
+        tail = "[a-z0-9]*" if node.prefix else ""
+        if re.search(rf"(?<![a-z0-9]){body}{tail}(?![a-z0-9])", text):
+            return True
+    return False
+
+
+def test_index_evaluation_matches_per_gig_reference():
+    gigs = _corpus()
+    index = CorpusIndex(gigs)
+    rng = random.Random(5)
+    words = sorted({t for g in gigs for t in tokenize(" ".join(gig_components(g).values()))})
+    words += ["market*", "des*", "zzz", '"email marketing"', '"full stack"', "tag:python", "company:brightwave"]
+
+    for _ in range(400):
+        parts = []
+        for _ in range(rng.randint(1, 5)):
+            w = rng.choice(words)
+            if rng.random() < 0.2:
+                w = f"{rng.choice(['title', 'tag', 'company'])}:{w}"
+            if rng.random() < 0.2:
+                w = f"NOT {w}"
+            parts.append(w)
+            parts.append(rng.choice(["", "AND", "OR"]))
+        text = " ".join(parts)
+        q = parse_query(text)
+        want = {i for i, g in enumerate(gigs) if q.root is None or _naive(q.root, g, q.default_components)}
+        assert q.search(index) == want, text
+
+
+def test_token_semantics_and_filter_modules():
+    from app.filters import apply_filters
+    from gig_agent.filters import filter_query_keywords
+
+    gigs = _corpus()
+    titles = lambda rows: {g.get("position") or g.get("title") for g in rows}
+
+    text = lambda g: " ".join(gig_components(g)[c] for c in ("title", "company", "description"))
+    assert titles(apply_filters(gigs, query="newsletter OR podcast")) == titles(
+        g for g in gigs if "newsletter" in text(g) or "podcast" in text(g)
+    )
+    # bare words match inside tokens, like the old keyword filter; quoted ones are whole tokens
+    assert titles(apply_filters(gigs, query="market")) == titles(g for g in gigs if "market" in text(g))
+    assert titles(apply_filters(gigs, query='"market"')) == titles(
+        g for g in gigs if re.search(r"(?<![a-z0-9])market(?![a-z0-9])", text(g))
+    )
+    assert len(apply_filters(gigs, query='"market"')) < len(apply_filters(gigs, query="market"))
+    assert titles(apply_filters(gigs, query='"email marketing" AND NOT title:manager')) == titles(
+        g
+        for g in gigs
+        if "email marketing" in (g["position"] if g.get("position") else g["title"]).lower()
+        + " " + (g.get("company") or "").lower() + " " + (g.get("description") or "").lower()
+        and "manager" not in (g.get("position") or g.get("title") or "").lower()
+    )
+    # OR is a real OR now
+    either = filter_query_keywords(gigs, "composer OR illustrator")
+    assert len(either) == len(filter_query_keywords(gigs, "composer")) + len(
+        filter_query_keywords(gigs, "illustrator")
+    ) > 0
@@ -0,0 +1,82 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.ranking import Ranking, decode_cursor, encode_cursor, rank_key, top_k
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _scored(n=200, seed=3):
+    rng = random.Random(seed)
+    return [{"id": f"g{i:03d}", "score": float(rng.randint(0, 9))} for i in range(n)]
+
+
+def test_top_k_matches_full_sort_with_id_ties():
+    gigs = _scored()
+    full = sorted(gigs, key=lambda g: (-g["score"], g["id"]))
+    assert top_k(gigs, 15) == full[:15]
+    assert top_k(gigs, 0) == []
+    assert top_k(gigs, 1000) == full
+
+
+def test_ranking_pages_cover_full_order():
+    gigs = _scored()
+    ranking = Ranking(gigs, key=rank_key)
+    pages = [ranking.page(offset, 7) for offset in range(0, len(gigs), 7)]
+    assert [g for page in pages for g in page] == sorted(gigs, key=rank_key)
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    cursor = encode_cursor("abc", "fp", 20)
+    assert decode_cursor(cursor) == ("abc", "fp", 20)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_gigs_endpoint_pages_from_cached_ranking(monkeypatch):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    calls = []
+
+    async def fake_remoteok(limit=50):
+        calls.append("remoteok")
+        return [g for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        calls.append("wwr")
+        return [g for g in corpus if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    first = client.get("/gigs", params={"profile": "developer", "limit": 10}).json()
+    assert len(calls) == 2 and first["next_cursor"]
+
+    second = client.get(
+        "/gigs", params={"profile": "developer", "limit": 10, "cursor": first["next_cursor"]}
+    ).json()
+    assert len(calls) == 2  # served from the cached ranking
+
+    seen = [g["id"] for g in first["gigs"] + second["gigs"]]
+    assert len(set(seen)) == 20
+
+    other = client.get(
+        "/gigs", params={"profile": "creative", "cursor": first["next_cursor"]}
+    )
+    assert other.status_code == 400
+
+    explained = client.get(
+        "/gigs",
+        params={"profile": "developer", "limit": 10, "cursor": first["next_cursor"], "explain": "true"},
+    ).json()
+    assert [g["id"] for g in explained["gigs"]] == [g["id"] for g in second["gigs"]]
+    for gig in explained["gigs"]:
+        assert gig["explain"]["score"] == gig["score"]
+    assert all("explain" not in g for g in second["gigs"])
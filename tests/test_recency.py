@@ -0,0 +1,49 @@
+import math
+
+from app.core.recency import SECONDS_PER_DAY, DecayTable, recency_scores
+
+NOW = 1_760_000_000.0
+
+
+def _reference(epoch, half_life):
+    if epoch is None or half_life <= 0:
+        return 0.0
+    age_days = max(0.0, (NOW - epoch) / 86400.0)
+    return math.pow(0.5, age_days / float(half_life))
+
+
+def test_vectorized_decay_matches_per_listing_formula():
+    epochs = [None, NOW + 3600] + [NOW - i * 37_000.0 for i in range(200)]
+    for half_life in (0, 7, 21):
+        got = recency_scores(epochs, NOW, half_life)
+        want = [_reference(e, half_life) for e in epochs]
+        assert all(math.isclose(a, b, rel_tol=1e-12, abs_tol=1e-15) for a, b in zip(got, want))
+
+
+def test_decay_buckets_are_exact_on_whole_days():
+    table = DecayTable(21, max_days=30)
+    epochs = [NOW - d * SECONDS_PER_DAY for d in range(0, 30)] + [NOW - 400 * SECONDS_PER_DAY, None]
+    got = table.scores(epochs, NOW)
+    assert got[:30] == table.buckets[:30]
+    assert got[10] == 0.5 ** (10 / 21)
+    assert got[-2:] == [0.0, 0.0]
+
+
+def test_gig_agent_scoring_ranks_newest_first_and_top_k_matches_full_sort(monkeypatch):
+    import time
+
+    from gig_agent.scoring import apply_scoring, apply_scoring_for_profile
+
+    monkeypatch.setenv("PREFERRED_KEYWORDS", "python")
+    now = int(time.time())
+    listings = [
+        {"id": str(i), "title": "Remote Python developer", "posted_epoch": now - i * SECONDS_PER_DAY}
+        for i in range(20)
+    ]
+    listings.append({"id": "undated", "title": "Python developer"})
+
+    ranked = apply_scoring(listings)
+    assert [g["id"] for g in ranked[:3]] == ["0", "1", "2"] and ranked[-1]["id"] == "undated"
+    assert apply_scoring(listings, limit=5) == ranked[:5]
+    mine = apply_scoring_for_profile(listings, {"skills": ["python"]}, limit=3)
+    assert [g["id"] for g in mine] == ["0", "1", "2"]
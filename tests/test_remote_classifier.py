@@ -0,0 +1,89 @@
+import itertools
+import json
+import time
+from pathlib import Path
+
+from app.sources import remoteok
+from app.sources.remoteok import classify_many, score_remote
+
+FIXTURES = Path(__file__).parent / "fixtures" / "gigs.json"
+
+SNIPPETS = [
+    "Remote",
+    "remote not available",
+    "Remote work is not offered",
+    "work from home",
+    "Work-From-Home",
+    "100% remote",
+    "telecommuting",
+    "telecommute",
+    "home-based",
+    "carefully remote, athome-based",
+    "distributed team",
+    "Hybrid",
+    "3 days in the office",
+    "12 days in office",
+    "on-site",
+    "On site only",
+    "in-office only",
+    "two days",
+    "4 days",
+    "no remote",
+    "must be on-site",
+    "relocation required",
+    "located in San Francisco office",
+    "located in NYC, NY office",
+    "located in Berlin campus",
+    "local candidates only",
+    "within 25 miles",
+    "within 40km",
+    "senior backend engineer",
+]
+
+
+def _reference(text):
+    """The original per-pattern classifier flags."""
+    normalized = " ".join(text.split())
+    count = lambda regexes: remoteok._count_matches(regexes, normalized)
+    return (
+        count(remoteok.POSITIVE_REMOTE_RE),
+        count(remoteok.HYBRID_HINTS_RE) > 0,
+        count(remoteok.NEGATIVE_REMOTE_RE) > 0,
+        count(remoteok.LOCAL_ONLY_RE) > 0,
+    )
+
+
+def _texts():
+    gigs = json.loads(FIXTURES.read_text(encoding="utf-8"))
+    for g in gigs:
+        yield " ".join(str(g.get(k) or "") for k in ("title", "position", "description", "location"))
+    for a, b in itertools.permutations(SNIPPETS, 2):
+        yield f"{a} and {b}."
+        yield f"{a}\n {b}"
+
+
+def test_fused_scan_matches_per_pattern_reference():
+    for text in _texts():
+        assert remoteok._scan(" ".join(text.split())) == _reference(text), text
+
+
+def test_classify_many_matches_score_remote_and_dedupes():
+    texts = ["Fully remote, distributed team", "On-site only", "Fully remote, distributed team"]
+    results = classify_many(texts)
+    assert [r.mode.value for r in results] == ["remote", "onsite", "remote"]
+    assert results[0] is results[2]
+    assert results[0].confidence == 0.9
+    assert score_remote(texts[1]).to_dict() == results[1].to_dict()
+
+
+def test_pathological_inputs_stay_fast():
+    texts = [
+        "on-site " * 20_000,
+        "located in " + "a " * 40_000 + "1 office",
+        ("located in " + "x" * 50 + " ") * 2_000 + " office",
+        "within " + "9" * 50_000,
+    ]
+    start = time.perf_counter()
+    for text in texts:
+        remoteok._classify(text)
+    assert time.perf_counter() - start < 2.0
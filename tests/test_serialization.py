@@ -0,0 +1,96 @@
+import json
+import threading
+from pathlib import Path
+
+from starlette.responses import JSONResponse
+
+from app.core.serialization import FragmentCache, Raw, json_array, json_object
+from app.models import ScoredGig
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _gigs():
+    return json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+
+def test_assembled_body_matches_json_response():
+    cache = FragmentCache()
+    gigs = [{**g, "score": 1.5, "tags": ["a", "ü"]} for g in _gigs()]
+    payload = {"profile_used": {"skills": ["x"]}, "gigs": gigs, "next_cursor": None}
+    body = json_object([
+        ("profile_used", payload["profile_used"]),
+        ("gigs", json_array(cache.fragment(g) for g in gigs)),
+        ("next_cursor", None),
+    ])
+    assert body == JSONResponse(payload).body
+
+    again = json_array(cache.fragment(dict(g)) for g in gigs)  # equal content, new dicts
+    assert cache.hits == len(gigs) and cache.misses == len(gigs)
+    assert isinstance(again, Raw) and json.loads(again) == gigs
+
+
+def test_equal_but_differently_typed_values_do_not_share_fragments():
+    cache = FragmentCache()
+    assert cache.fragment({"score": 1}) == b'{"score":1}'
+    assert cache.fragment({"score": 1.0}) == b'{"score":1.0}'
+    assert cache.fragment({"score": True}) == b'{"score":true}'
+    assert cache.fragment({"tags": ["a"]}) != cache.fragment({"tags": ("a", "b")})
+
+
+def test_models_serialize_like_model_dump_json():
+    cache = FragmentCache(max_entries=2)
+    gig = ScoredGig(id="1", title="Writer", url="https://example.com/j/1", source="wwr", score=2.0)
+    assert cache.fragment(gig) == gig.model_dump_json().encode()
+    trusted = ScoredGig.model_construct(**gig.__dict__)
+    assert cache.fragment(trusted) == cache.fragment(gig) and cache.misses == 1
+    for i in range(3):
+        cache.fragment({"i": i})
+    assert len(cache) == 2
+
+
+
+class _Gate:
+    """Hashable that can park a thread inside a cache lookup."""
+
+    def __init__(self):
+        self.hashes = None  # counting starts once armed
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def __hash__(self):
+        if self.hashes is not None:
+            self.hashes += 1
+            if self.hashes == 2:  # a hit: get(), then move_to_end()
+                self.paused.set()
+                self.resume.wait(timeout=0.5)
+        return 1
+
+    def __eq__(self, other):
+        return self is other
+
+
+def test_a_hit_survives_an_eviction_from_another_thread():
+    # streamed responses serialize from the threadpool while the loop does too
+    cache = FragmentCache(max_entries=1)
+    gate = _Gate()
+    cache.fragment(gate)
+    gate.hashes = 0
+    errors = []
+
+    def hit():
+        try:
+            cache.fragment(gate)
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=hit)
+    reader.start()
+    assert gate.paused.wait(timeout=5)
+    writer = threading.Thread(target=cache.fragment, args=({"other": 1},))
+    writer.start()
+    writer.join(timeout=0.2)  # would evict the gate's entry mid-hit
+    gate.resume.set()
+    reader.join()
+    writer.join()
+    assert errors == [] and len(cache) == 1 and cache.hits == 1
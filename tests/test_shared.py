@@ -0,0 +1,195 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.corpus import CorpusStore, UpstreamUnavailable
+from app.core.files import atomic_write
+from app.core.index import CorpusIndex
+from app.core.ranking import RankingCache
+from app.core.shared import MappedGigs, SharedCorpus, SharedResultCache, current_snapshot_name, publish_snapshot
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _corpus():
+    return json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+
+def test_publish_and_attach_round_trip(tmp_path):
+    gigs = _corpus()
+    reader = SharedCorpus(str(tmp_path))
+    assert not reader.published
+
+    version = CorpusIndex(gigs).version
+    path = publish_snapshot(str(tmp_path), gigs, version)
+    assert current_snapshot_name(str(tmp_path)) == path.name
+    loaded = reader.load()
+    assert isinstance(loaded, MappedGigs)
+    assert list(loaded) == gigs and CorpusIndex(loaded).version == version
+    assert loaded[-1] == gigs[-1] and loaded[1:3] == gigs[1:3]
+    assert CorpusIndex(loaded).gigs is loaded  # read through the mapping, not copied
+    assert reader.load() is loaded  # unchanged CURRENT: no re-parse
+
+    publish_snapshot(str(tmp_path), gigs, version)  # same version: no-op
+    assert reader.load() is loaded
+    for n in range(3):
+        publish_snapshot(str(tmp_path), gigs[n:], CorpusIndex(gigs[n:]).version)
+    assert len(list(tmp_path.glob("corpus-*.snap"))) == 2
+    assert list(reader.load()) == gigs[2:]
+
+
+def test_store_keeps_index_when_fetcher_reports_no_change():
+    gigs = _corpus()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return gigs
+
+    async def run():
+        store = CorpusStore(fetch, refresh_seconds=0)
+        first = await store.snapshot()
+        second = await store.snapshot()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(calls) == 2 and second.index is first.index
+
+
+def test_failed_fetch_keeps_the_previous_snapshot(monkeypatch):
+    import app.api as api
+
+    gigs = _corpus()
+
+    async def remoteok(limit=50):
+        return [dict(g) for g in gigs]
+
+    async def down(limit=50):
+        raise ConnectionError("board unreachable")
+
+    async def run():
+        monkeypatch.setattr(api, "fetch_remoteok_jobs", remoteok)
+        monkeypatch.setattr(api, "fetch_wwr_jobs", down)
+        store = CorpusStore(api.fetch_corpus, refresh_seconds=0, retry_seconds=0)
+        first = await store.snapshot()  # one board down still builds a corpus
+        monkeypatch.setattr(api, "fetch_remoteok_jobs", down)
+        second = await store.snapshot()
+        empty = CorpusStore(api.fetch_corpus)
+        with pytest.raises(UpstreamUnavailable):
+            await empty.snapshot()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.gigs and second.gigs is first.gigs and second.version == first.version
+
+    # with nothing cached yet the API answers 503 instead of an empty page
+    api.CORPUS.invalidate()
+    resp = TestClient(api.app).get("/gigs", params={"profile": "cindy"})
+    assert resp.status_code == 503 and resp.headers["retry-after"]
+
+
+def test_workers_read_published_corpus_and_share_pages(monkeypatch, tmp_path):
+    import app.api as api
+    from app import refresher
+
+    corpus = _corpus()
+    fetches = []
+
+    async def fake_remoteok(limit=50):
+        fetches.append("remoteok")
+        return [dict(g) for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    version = asyncio.run(refresher.refresh_once(str(tmp_path)))
+    assert fetches == ["remoteok"]
+
+    async def upstream_down(limit=50):
+        raise AssertionError("workers must not fetch upstream")
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", upstream_down)
+    monkeypatch.setattr(api, "SHARED", SharedCorpus(str(tmp_path)))
+    monkeypatch.setattr(api, "RESULTS", SharedResultCache(str(tmp_path)))
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    first = client.get("/gigs", params={"profile": "developer", "limit": 5})
+    assert first.status_code == 200
+    assert len(list((tmp_path / "results").glob(f"{version}-*.json"))) == 1
+
+    # a second worker: its own empty caches, same shared directory
+    async def no_scoring(*args, **kwargs):
+        raise AssertionError("page should come from the shared result cache")
+
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    monkeypatch.setattr(api.SCORER, "score_async", no_scoring)
+    api.CORPUS.invalidate()
+    second = client.get("/gigs", params={"profile": "developer", "limit": 5})
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+
+    assert SharedResultCache(str(tmp_path)).prune("other-version") == 1
+
+
+def test_shared_pages_are_per_profile_and_bounded(monkeypatch, tmp_path):
+    import app.api as api
+    from app import refresher
+
+    corpus = _corpus()
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in corpus]
+
+    async def no_wwr(limit=50):
+        return []
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", no_wwr)
+    version = asyncio.run(refresher.refresh_once(str(tmp_path)))
+    monkeypatch.setattr(api, "SHARED", SharedCorpus(str(tmp_path)))
+    monkeypatch.setattr(api, "RESULTS", SharedResultCache(str(tmp_path)))
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    # same ranking rules, different skills: the second user must not get
+    # the first one's profile back from the shared cache
+    first = client.post("/gigs/search", json={"keywords": ["email"], "skills": ["alice-only"]})
+    second = client.post("/gigs/search", json={"keywords": ["email"], "skills": ["bob-only"]})
+    assert first.status_code == second.status_code == 200
+    assert second.json()["profile_used"]["skills"] == ["bob-only"]
+    assert len(list((tmp_path / "results").glob(f"{version}-*.json"))) == 2
+
+    cache = SharedResultCache(str(tmp_path / "bounded"), max_entries=3)
+    for n in range(5):
+        cache.put("v", f'"tag{n}"', b"{}")
+    assert sorted(p.name for p in cache.root.iterdir()) == ["v-tag2.json", "v-tag3.json", "v-tag4.json"]
+
+    # the directory is only scanned every `trim_every` puts; trim() catches up
+    lazy = SharedResultCache(str(tmp_path / "lazy"), max_entries=3, trim_every=4)
+    for n in range(5):
+        lazy.put("v", f'"tag{n}"', b"{}")
+    assert len(list(lazy.root.iterdir())) == 4
+    assert lazy.trim() == 1
+    assert sorted(p.name for p in lazy.root.iterdir()) == ["v-tag2.json", "v-tag3.json", "v-tag4.json"]
+
+
+def test_failed_write_leaves_the_old_file_and_no_temporary(tmp_path):
+    target = tmp_path / "CURRENT"
+    atomic_write(target, [b"corpus-a.snap"])
+
+    def chunks():
+        yield b"corpus-b"
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        atomic_write(target, chunks())
+    assert target.read_bytes() == b"corpus-a.snap"
+    assert [p.name for p in tmp_path.iterdir()] == ["CURRENT"]
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _client(monkeypatch):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    api.CORPUS.invalidate()
+    return TestClient(api.app)
+
+
+def test_ndjson_stream_matches_json_payload(monkeypatch):
+    client = _client(monkeypatch)
+    params = {"profile": "developer", "limit": 5}
+    plain = client.get("/gigs", params=params).json()
+
+    for kwargs in (
+        {"params": {**params, "stream": 1}},
+        {"params": params, "headers": {"Accept": "application/x-ndjson"}},
+    ):
+        resp = client.get("/gigs", **kwargs)
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        header, gigs = lines[0], lines[1:]
+        assert header == {"profile_used": plain["profile_used"], "next_cursor": plain["next_cursor"]}
+        assert gigs == plain["gigs"]
+
+
+def test_post_search_streams_pages(monkeypatch):
+    client = _client(monkeypatch)
+    body = {"keywords": ["email"], "disqualifiers": []}
+    first = client.post("/gigs/search", params={"limit": 3, "stream": 1}, json=body).text.splitlines()
+    header = json.loads(first[0])
+    assert len(first) == 4 and header["next_cursor"]
+
+    rest = client.post(
+        "/gigs/search",
+        params={"limit": 100, "stream": 1, "cursor": header["next_cursor"]},
+        json=body,
+    ).text.splitlines()
+    assert json.loads(rest[0])["next_cursor"] is None
+    ids = [json.loads(line)["id"] for line in first[1:] + rest[1:]]
+    assert len(ids) == len(set(ids))
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Registry
+from app.core.ranking import RankingCache
+from app.core.timing import current_timer, request_timer, span
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_spans_add_up_per_request_and_feed_the_histogram():
+    stages = Registry().histogram("t_seconds", "Stage time", ["stage"])
+    with span("score", stages):
+        pass  # no request timer: only the histogram sees it
+    with request_timer() as timer:
+        for _ in range(3):
+            with span("score", stages):
+                pass
+        assert current_timer() is timer
+    assert current_timer() is None
+    assert stages.count(stage="score") == 4
+    assert list(timer.timings()) == ["score", "total"]
+    assert timer.header().startswith("score;dur=")
+
+
+def test_search_reports_server_timing_and_debug_timings(monkeypatch):
+    import app.api as api
+
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+
+    async def fake_remoteok(limit=50):
+        return [dict(g) for g in corpus if g["source"] == "remoteok"]
+
+    async def fake_wwr(limit=50):
+        return [dict(g) for g in corpus if g["source"] != "remoteok"]
+
+    monkeypatch.setattr(api, "fetch_remoteok_jobs", fake_remoteok)
+    monkeypatch.setattr(api, "fetch_wwr_jobs", fake_wwr)
+    monkeypatch.setattr(api, "RANKINGS", RankingCache())
+    api.CORPUS.invalidate()
+    client = TestClient(api.app)
+
+    plain = client.get("/gigs", params={"profile": "developer", "limit": 5})
+    names = [part.split(";")[0] for part in plain.headers["server-timing"].split(", ")]
+    for stage in ("snapshot", "fetch_remoteok", "fetch_wwr", "score", "filter", "sort", "serialize", "total"):
+        assert stage in names
+    assert "timings" not in plain.json() and "etag" in plain.headers
+
+    debug = client.get("/gigs", params={"profile": "developer", "limit": 5, "debug": 1})
+    body = debug.json()
+    assert body["gigs"] == plain.json()["gigs"]
+    assert set(body["timings"]) >= {"snapshot", "sort", "serialize", "total"}
+    assert "etag" not in debug.headers and debug.headers["cache-control"] == "no-store"
+
+    bad = client.get("/gigs", params={"profile": "developer", "cursor": "nope"})
+    assert bad.status_code == 400 and "total;dur=" in bad.headers["server-timing"]
@@ -0,0 +1,95 @@
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+
+import app.cli as cli
+from app.core.parallel import ParallelScorer
+from app.core.plan import compile_plan
+from app.core.seen import SeenSet, fingerprint
+from app.providers.remoteok_jobs import RemoteOKFeed
+from app.user_config import load_user_config
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_seen_set_persists_rotates_and_stays_fixed_size(tmp_path):
+    path = tmp_path / "seen.bloom"
+    seen = SeenSet.load(path, capacity=100)
+    assert seen.add("remoteok:1") and not seen.add("remoteok:1")
+    seen.save()
+    bound = 2 * seen.bits // 8 + 100  # two generations plus the header
+
+    again = SeenSet.load(path, capacity=100)
+    assert "remoteok:1" in again and "remoteok:2" not in again
+
+    for n in range(2, 150):  # past one generation: remembered in `previous`
+        again.add(f"remoteok:{n}")
+    assert "remoteok:1" in again and again.count == 49
+    for n in range(150, 260):  # two rotations later the first gig is forgotten
+        again.add(f"remoteok:{n}")
+    assert "remoteok:1" not in again and "remoteok:259" in again
+    assert path.stat().st_size < bound and again.save().stat().st_size < bound
+
+    assert "remoteok:1" not in SeenSet.load(path, capacity=500)  # resized: starts empty
+
+
+def test_feed_reuses_client_and_sends_conditional_gets():
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        jobs = [{"legal": "meta"}, {"id": 1, "position": "Email Marketer", "company": "Acme"}]
+        return httpx.Response(200, json=jobs, headers={"ETag": '"v1"'})
+
+    async def go():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with RemoteOKFeed(client=client) as feed:
+            first = await feed.fetch(limit=10)
+            assert not feed.not_modified
+            second = await feed.fetch(limit=10)
+            assert feed.not_modified and second == first and second[0] is not first[0]
+        assert client.is_closed
+        return first
+
+    first = asyncio.run(go())
+    assert seen_headers == [None, '"v1"']
+    assert first[0]["position"] == "Email Marketer"
+
+
+class FakeFeed:
+    def __init__(self, gigs):
+        self.gigs = gigs
+        self.not_modified = False
+
+    async def fetch(self, limit=25):
+        return [dict(g) for g in self.gigs]
+
+
+def test_watch_reports_each_high_scoring_gig_once(tmp_path, capsys):
+    corpus = json.loads((FIXTURES / "gigs.json").read_text(encoding="utf-8"))
+    args = cli.parse_args(["--watch", "--profile", "cindy", "--out-dir", str(tmp_path / "new")])
+    seen = SeenSet.load(tmp_path / "seen.bloom", capacity=1000)
+    feed = FakeFeed(corpus[:12])
+
+    async def poll(scorer):
+        return await cli.watch_once(feed, scorer, seen, args, min_score=1.0)
+
+    with ParallelScorer([compile_plan(load_user_config("cindy"))], workers=1) as scorer:
+        first = asyncio.run(poll(scorer))
+        assert first and all(g["score"] >= 1.0 for g in first)
+        assert asyncio.run(poll(scorer)) == []  # nothing new
+
+        feed.gigs = corpus  # the rest shows up later
+        later = asyncio.run(poll(scorer))
+        feed.not_modified = True
+        assert asyncio.run(poll(scorer)) == []
+
+    reported = {fingerprint(g) for g in first + later}
+    assert len(reported) == len(first) + len(later)
+    assert all(fingerprint(g) in SeenSet.load(tmp_path / "seen.bloom", capacity=1000) for g in corpus[:12])
+    assert "new gig(s)" in capsys.readouterr().out
+    assert len(list((tmp_path / "new").iterdir())) >= 1